@@ -0,0 +1,43 @@
+"""
+Schema introspection helpers shared by the migrations.
+
+alembic.ini puts this directory on sys.path (prepend_sys_path), so
+revision scripts import it as `migration_helpers`.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+def table_exists(table_name):
+    """Check if a table exists in the database."""
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_schema = current_schema() AND table_name = :t"
+        ),
+        {"t": table_name},
+    ).scalar() is not None
+
+
+def column_exists(table_name, column_name):
+    """Check if a column exists in a table."""
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema = current_schema() "
+            "AND table_name = :t AND column_name = :c"
+        ),
+        {"t": table_name, "c": column_name},
+    ).scalar() is not None
+
+
+def index_exists(table_name, index_name):
+    """Check if an index exists on a table."""
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_indexes "
+            "WHERE schemaname = current_schema() "
+            "AND tablename = :t AND indexname = :i"
+        ),
+        {"t": table_name, "i": index_name},
+    ).scalar() is not None
@@ -8,7 +8,8 @@ Create Date: 2024-12-26
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import inspect
+
+from migration_helpers import column_exists, table_exists
 
 
 # revision identifiers, used by Alembic.
@@ -18,21 +19,6 @@ branch_labels = None
 depends_on = None
 
 
-def column_exists(table_name, column_name):
-    """Check if a column exists in a table."""
-    bind = op.get_bind()
-    inspector = inspect(bind)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
-    return column_name in columns
-
-
-def table_exists(table_name):
-    """Check if a table exists in the database."""
-    bind = op.get_bind()
-    inspector = inspect(bind)
-    return table_name in inspector.get_table_names()
-
-
 def upgrade() -> None:
     # Add tracking_id to users table (if not exists)
     if not column_exists('users', 'tracking_id'):
@@ -7,7 +7,8 @@ Create Date: 2025-12-26
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import inspect
+
+from migration_helpers import column_exists
 
 # revision identifiers, used by Alembic.
 revision = '011_add_whitelist'
@@ -16,14 +17,6 @@ branch_labels = None
 depends_on = None
 
 
-def column_exists(table_name, column_name):
-    """Check if a column exists in a table."""
-    bind = op.get_bind()
-    inspector = inspect(bind)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
-    return column_name in columns
-
-
 def upgrade():
     # Add is_whitelisted column with default False (only if it doesn't exist)
     if not column_exists('users', 'is_whitelisted'):
@@ -13,9 +13,10 @@ Create Date: 2025-12-25
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy import inspect
 import uuid
 
+from migration_helpers import column_exists, table_exists
+
 # revision identifiers
 revision = '011_refonte_collectes'
 down_revision = '010d_merge_heads'
@@ -23,29 +24,6 @@ branch_labels = None
 depends_on = None
 
 
-def table_exists(table_name):
-    """Check if a table exists in the database."""
-    bind = op.get_bind()
-    inspector = inspect(bind)
-    return table_name in inspector.get_table_names()
-
-
-def index_exists(table_name, index_name):
-    """Check if an index exists on a table."""
-    bind = op.get_bind()
-    inspector = inspect(bind)
-    indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
-    return index_name in indexes
-
-
-def column_exists(table_name, column_name):
-    """Check if a column exists in a table."""
-    bind = op.get_bind()
-    inspector = inspect(bind)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
-    return column_name in columns
-
-
 def upgrade():
     # ================================================================
     # 1. TABLE COLLECTIONS - Historique des collectes
@@ -9,7 +9,8 @@ NOTE: All tables use Integer PKs/FKs to match the existing schema from migration
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
-from sqlalchemy import inspect
+
+from migration_helpers import table_exists
 
 # revision identifiers, used by Alembic.
 revision = '012_radar_features'
@@ -18,13 +19,6 @@ branch_labels = None
 depends_on = None
 
 
-def table_exists(table_name):
-    """Check if a table exists in the database."""
-    bind = op.get_bind()
-    inspector = inspect(bind)
-    return table_name in inspector.get_table_names()
-
-
 def enum_exists(enum_name):
     """Check if an enum type exists in the database."""
     bind = op.get_bind()
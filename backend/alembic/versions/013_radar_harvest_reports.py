@@ -7,7 +7,8 @@ Create Date: 2024-12-28
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import inspect
+
+from migration_helpers import table_exists
 
 # revision identifiers, used by Alembic.
 revision = '013_radar_harvest_reports'
@@ -16,13 +17,6 @@ branch_labels = None
 depends_on = None
 
 
-def table_exists(table_name):
-    """Check if a table exists in the database."""
-    bind = op.get_bind()
-    inspector = inspect(bind)
-    return table_name in inspector.get_table_names()
-
-
 def upgrade():
     # ========================================================================
     # RADAR HARVEST REPORTS TABLE
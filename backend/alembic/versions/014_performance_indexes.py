@@ -6,6 +6,8 @@ Revises: 013_radar_harvest_reports
 from alembic import op
 import sqlalchemy as sa
 
+from migration_helpers import index_exists, table_exists
+
 # revision identifiers
 revision = '014_performance_indexes'
 down_revision = '013_radar_harvest_reports'
@@ -14,22 +16,6 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Check and create indexes only if they don't exist
-    conn = op.get_bind()
-    inspector = sa.inspect(conn)
-    
-    # Helper function to check if index exists
-    def index_exists(table_name, index_name):
-        try:
-            indexes = inspector.get_indexes(table_name)
-            return any(idx['name'] == index_name for idx in indexes)
-        except Exception:
-            return True  # Skip if table doesn't exist
-    
-    # Helper function to check if table exists
-    def table_exists(table_name):
-        return table_name in inspector.get_table_names()
-    
     # Opportunities table indexes for common queries
     if table_exists('opportunities'):
         if not index_exists('opportunities', 'ix_opportunities_status_score'):
@@ -6,7 +6,8 @@ Create Date: 2024-12-29
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import inspect
+
+from migration_helpers import column_exists
 
 revision = '015_add_two_factor_columns'
 down_revision = '014_performance_indexes'
@@ -14,14 +15,6 @@ branch_labels = None
 depends_on = None
 
 
-def column_exists(table_name: str, column_name: str) -> bool:
-    """Check if a column exists in a table."""
-    bind = op.get_bind()
-    inspector = inspect(bind)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
-    return column_name in columns
-
-
 def upgrade():
     # Add two-factor authentication columns to users table
     if not column_exists('users', 'two_factor_enabled'):
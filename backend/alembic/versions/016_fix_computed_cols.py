@@ -9,7 +9,8 @@ Create Date: 2025-12-29
 """
 from alembic import op
 import sqlalchemy as sa
-from sqlalchemy import inspect
+
+from migration_helpers import column_exists
 
 # revision identifiers
 revision = '016_fix_computed_cols'
@@ -18,14 +19,6 @@ branch_labels = None
 depends_on = None
 
 
-def column_exists(table_name: str, column_name: str) -> bool:
-    """Check if column exists in table"""
-    bind = op.get_bind()
-    inspector = inspect(bind)
-    columns = [col['name'] for col in inspector.get_columns(table_name)]
-    return column_name in columns
-
-
 def upgrade() -> None:
     # Remove computed columns from lead_items if they exist
     # These are now @property in the model
@@ -0,0 +1,164 @@
+"""Partition activity_logs by month on created_at
+
+Activity log queries always filter on a recent created_at window, so the
+table is converted to a RANGE-partitioned table with one partition per
+month. The planner prunes partitions outside the window and retention
+becomes a DROP of old partitions instead of a DELETE.
+
+Partitions are created by the ensure_activity_log_partition() SQL function,
+called here for existing data and by the maintain_activity_log_partitions
+Celery task for upcoming months. An activity_logs_default partition takes
+the rows of a month whose partition is missing (e.g. beat did not run), so
+inserts never fail; ensure_activity_log_partition() moves them into the
+month's partition when it is created.
+
+Revision ID: 017_partition_activity_logs
+Revises: 016_fix_computed_cols
+Create Date: 2026-01-05
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import table_exists
+
+# revision identifiers
+revision = '017_partition_activity_logs'
+down_revision = '016_fix_computed_cols'
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = (
+    "id, user_id, user_tracking_id, action, resource_type, resource_id, "
+    "details, ip_address, user_agent, created_at"
+)
+
+ENSURE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION ensure_activity_log_partition(month_start date)
+RETURNS void AS $$
+DECLARE
+    start_date date := date_trunc('month', month_start)::date;
+    end_date date := (date_trunc('month', month_start) + interval '1 month')::date;
+    partition_name text := 'activity_logs_' || to_char(start_date, 'YYYY_MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN;
+    END IF;
+    -- Built detached, then attached: rows of this month that landed in the
+    -- default partition are moved first, otherwise the ATTACH would fail
+    EXECUTE format(
+        'CREATE TABLE %I (LIKE activity_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+        partition_name
+    );
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM activity_logs_default '
+        'WHERE created_at >= %L AND created_at < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        start_date, end_date, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE activity_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, start_date, end_date
+    );
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def is_partitioned(table_name):
+    """Check if a table is already a partitioned table."""
+    relkind = op.get_bind().execute(
+        sa.text("SELECT relkind FROM pg_class WHERE relname = :t"),
+        {"t": table_name},
+    ).scalar()
+    return relkind == 'p'
+
+
+def upgrade() -> None:
+    if not table_exists('activity_logs') or is_partitioned('activity_logs'):
+        return
+
+    # Move the current table out of the way (constraint/index names are kept
+    # by RENAME, so free them for the new table)
+    op.execute("ALTER TABLE activity_logs RENAME TO activity_logs_legacy")
+    op.execute("ALTER INDEX IF EXISTS activity_logs_pkey RENAME TO activity_logs_legacy_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_activity_logs_user_tracking_id")
+    op.execute("DROP INDEX IF EXISTS ix_activity_logs_action")
+    op.execute("DROP INDEX IF EXISTS ix_activity_logs_created_at")
+
+    # The partition key must be part of the primary key and cannot be NULL
+    op.execute("""
+        CREATE TABLE activity_logs (
+            id UUID NOT NULL,
+            user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+            user_tracking_id VARCHAR(10) NOT NULL,
+            action VARCHAR(100) NOT NULL,
+            resource_type VARCHAR(100),
+            resource_id VARCHAR(100),
+            details JSON,
+            ip_address VARCHAR(50),
+            user_agent TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE TABLE activity_logs_default PARTITION OF activity_logs DEFAULT")
+    op.execute(ENSURE_PARTITION_FUNCTION)
+
+    # One partition per month from the oldest row up to next month
+    op.execute("""
+        SELECT ensure_activity_log_partition(month::date)
+        FROM generate_series(
+            date_trunc('month', COALESCE((SELECT min(created_at) FROM activity_logs_legacy), now())),
+            date_trunc('month', now()) + interval '1 month',
+            interval '1 month'
+        ) AS month
+    """)
+
+    # Indexes on the parent are created on every partition
+    op.execute("CREATE INDEX ix_activity_logs_user_tracking_id ON activity_logs (user_tracking_id)")
+    op.execute("CREATE INDEX ix_activity_logs_action ON activity_logs (action)")
+    op.execute("CREATE INDEX ix_activity_logs_created_at ON activity_logs (created_at)")
+
+    op.execute(f"""
+        INSERT INTO activity_logs ({COLUMNS})
+        SELECT {COLUMNS.replace('created_at', 'COALESCE(created_at, now())')}
+        FROM activity_logs_legacy
+    """)
+    op.execute("DROP TABLE activity_logs_legacy")
+
+
+def downgrade() -> None:
+    if not table_exists('activity_logs') or not is_partitioned('activity_logs'):
+        return
+
+    op.execute("ALTER TABLE activity_logs RENAME TO activity_logs_partitioned")
+    op.execute("ALTER INDEX IF EXISTS activity_logs_pkey RENAME TO activity_logs_partitioned_pkey")
+    op.execute("DROP INDEX IF EXISTS ix_activity_logs_user_tracking_id")
+    op.execute("DROP INDEX IF EXISTS ix_activity_logs_action")
+    op.execute("DROP INDEX IF EXISTS ix_activity_logs_created_at")
+
+    op.execute("""
+        CREATE TABLE activity_logs (
+            id UUID PRIMARY KEY,
+            user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+            user_tracking_id VARCHAR(10) NOT NULL,
+            action VARCHAR(100) NOT NULL,
+            resource_type VARCHAR(100),
+            resource_id VARCHAR(100),
+            details JSON,
+            ip_address VARCHAR(50),
+            user_agent TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.execute("CREATE INDEX ix_activity_logs_user_tracking_id ON activity_logs (user_tracking_id)")
+    op.execute("CREATE INDEX ix_activity_logs_action ON activity_logs (action)")
+    op.execute("CREATE INDEX ix_activity_logs_created_at ON activity_logs (created_at)")
+
+    op.execute(f"""
+        INSERT INTO activity_logs ({COLUMNS})
+        SELECT {COLUMNS} FROM activity_logs_partitioned
+    """)
+    op.execute("DROP TABLE activity_logs_partitioned CASCADE")
+    op.execute("DROP FUNCTION IF EXISTS ensure_activity_log_partition(date)")
@@ -0,0 +1,29 @@
+"""Backfill users.tracking_id and make it NOT NULL
+
+Users created before 010_activity_logs have no tracking_id, which forced
+every reader to recompute the USR-XXXXXX fallback in Python.
+
+Revision ID: 018_backfill_user_tracking_id
+Revises: 017_partition_activity_logs
+Create Date: 2026-01-05
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '018_backfill_user_tracking_id'
+down_revision = '017_partition_activity_logs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "UPDATE users SET tracking_id = 'USR-' || UPPER(SUBSTRING(id::text, 1, 6)) "
+        "WHERE tracking_id IS NULL"
+    )
+    op.alter_column('users', 'tracking_id', existing_type=sa.String(15), nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('users', 'tracking_id', existing_type=sa.String(15), nullable=True)
@@ -0,0 +1,36 @@
+"""Add activity_log_hourly_rollup table
+
+Hourly pre-aggregated activity counts so /admin/logs/stats only scans the
+raw log table for the hours not yet rolled up.
+
+Revision ID: 019_activity_log_hourly_rollup
+Revises: 018_backfill_user_tracking_id
+Create Date: 2026-01-05
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import table_exists
+
+# revision identifiers
+revision = '019_activity_log_hourly_rollup'
+down_revision = '018_backfill_user_tracking_id'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not table_exists('activity_log_hourly_rollup'):
+        op.create_table(
+            'activity_log_hourly_rollup',
+            sa.Column('hour', sa.DateTime(), nullable=False),
+            sa.Column('action', sa.String(100), nullable=False),
+            sa.Column('user_tracking_id', sa.String(10), nullable=False),
+            sa.Column('event_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.PrimaryKeyConstraint('hour', 'action', 'user_tracking_id'),
+        )
+
+
+def downgrade() -> None:
+    if table_exists('activity_log_hourly_rollup'):
+        op.drop_table('activity_log_hourly_rollup')
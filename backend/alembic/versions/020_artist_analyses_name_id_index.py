@@ -0,0 +1,32 @@
+"""Add (artist_name, id DESC) index on artist_analyses
+
+Supports the latest-analysis-per-artist lookup in /artist-history/statistics.
+
+Revision ID: 020_artist_analyses_name_id
+Revises: 019_activity_log_hourly_rollup
+Create Date: 2026-01-05
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '020_artist_analyses_name_id'
+down_revision = '019_activity_log_hourly_rollup'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not index_exists('artist_analyses', 'ix_artist_analyses_name_id'):
+        op.create_index(
+            'ix_artist_analyses_name_id',
+            'artist_analyses',
+            ['artist_name', sa.text('id DESC')],
+        )
+
+
+def downgrade() -> None:
+    if index_exists('artist_analyses', 'ix_artist_analyses_name_id'):
+        op.drop_index('ix_artist_analyses_name_id', table_name='artist_analyses')
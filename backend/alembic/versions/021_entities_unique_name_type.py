@@ -0,0 +1,75 @@
+"""Make (normalized_name, entity_type) unique on entities
+
+Required for the INSERT ... ON CONFLICT entity upsert in /collect/advanced.
+Pre-existing duplicates are merged into the oldest entity first.
+
+Revision ID: 021_entities_unique_name_type
+Revises: 020_artist_analyses_name_id
+Create Date: 2026-01-06
+"""
+from alembic import op
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '021_entities_unique_name_type'
+down_revision = '020_artist_analyses_name_id'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if index_exists('entities', 'uq_entities_name_type'):
+        return
+
+    # Map every duplicate entity to the one we keep
+    op.execute("""
+        CREATE TEMP TABLE entity_duplicates ON COMMIT DROP AS
+        SELECT id, keep_id FROM (
+            SELECT id, first_value(id) OVER (
+                PARTITION BY normalized_name, entity_type
+                ORDER BY created_at, id
+            ) AS keep_id
+            FROM entities
+        ) ranked
+        WHERE id <> keep_id
+    """)
+    op.execute("""
+        UPDATE documents SET entity_id = d.keep_id
+        FROM entity_duplicates d WHERE documents.entity_id = d.id
+    """)
+    op.execute("""
+        UPDATE briefs SET entity_id = d.keep_id
+        FROM entity_duplicates d WHERE briefs.entity_id = d.id
+    """)
+    # Contacts are unique per (entity_id, contact_type, value)
+    op.execute("""
+        DELETE FROM contacts c USING entity_duplicates d
+        WHERE c.entity_id = d.id AND EXISTS (
+            SELECT 1 FROM contacts k
+            WHERE k.entity_id = d.keep_id
+              AND k.contact_type = c.contact_type
+              AND k.value = c.value
+        )
+    """)
+    op.execute("""
+        UPDATE contacts SET entity_id = d.keep_id
+        FROM entity_duplicates d WHERE contacts.entity_id = d.id
+    """)
+    op.execute("DELETE FROM entities WHERE id IN (SELECT id FROM entity_duplicates)")
+
+    if index_exists('entities', 'ix_entities_name_type'):
+        op.drop_index('ix_entities_name_type', table_name='entities')
+    op.create_index(
+        'uq_entities_name_type',
+        'entities',
+        ['normalized_name', 'entity_type'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    if index_exists('entities', 'uq_entities_name_type'):
+        op.drop_index('uq_entities_name_type', table_name='entities')
+    if not index_exists('entities', 'ix_entities_name_type'):
+        op.create_index('ix_entities_name_type', 'entities', ['normalized_name', 'entity_type'])
@@ -0,0 +1,43 @@
+"""Add partial (collection_id, url) index on source_documents_v2
+
+Lets the DISTINCT url lookup for "sources consultées" in
+GET /collections/{id} run as an index-only scan.
+
+Revision ID: 022_source_docs_collection_url
+Revises: 021_entities_unique_name_type
+Create Date: 2026-01-06
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '022_source_docs_collection_url'
+down_revision = '021_entities_unique_name_type'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if index_exists('source_documents_v2', 'ix_source_documents_v2_collection_url'):
+        return
+    # Built without locking writes from running collections
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_source_documents_v2_collection_url',
+            'source_documents_v2',
+            ['collection_id', 'url'],
+            postgresql_where=sa.text('url IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if index_exists('source_documents_v2', 'ix_source_documents_v2_collection_url'):
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                'ix_source_documents_v2_collection_url',
+                table_name='source_documents_v2',
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,44 @@
+"""Add keyset pagination indexes on collections and collection_logs
+
+GET /collections and GET /collections/{id}/logs accept a cursor and
+seek on (created_at, id) / (collection_id, ts, id) instead of OFFSET.
+
+Revision ID: 023_collections_keyset_indexes
+Revises: 022_source_docs_collection_url
+Create Date: 2026-01-07
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '023_collections_keyset_indexes'
+down_revision = '022_source_docs_collection_url'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_collections_created_at_id', 'collections', ['created_at DESC', 'id DESC']),
+    ('ix_collection_logs_collection_ts_id', 'collection_logs', ['collection_id', 'ts DESC', 'id DESC']),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if not index_exists(table, name):
+                op.create_index(
+                    name,
+                    table,
+                    [sa.text(c) for c in columns],
+                    postgresql_concurrently=True,
+                )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            if index_exists(table, name):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
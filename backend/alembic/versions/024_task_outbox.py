@@ -0,0 +1,46 @@
+"""Add task_outbox table
+
+Celery tasks started from the API are first written here, in the same
+transaction as the run they belong to, then sent to the broker.
+
+Revision ID: 024_task_outbox
+Revises: 023_collections_keyset_indexes
+Create Date: 2026-01-07
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migration_helpers import table_exists
+
+# revision identifiers
+revision = '024_task_outbox'
+down_revision = '023_collections_keyset_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if table_exists('task_outbox'):
+        return
+
+    op.create_table(
+        'task_outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('task_name', sa.String(255), nullable=False),
+        sa.Column('kwargs', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text("now()")),
+        sa.Column('dispatched_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        'ix_task_outbox_pending',
+        'task_outbox',
+        ['created_at'],
+        postgresql_where=sa.text('dispatched_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    if table_exists('task_outbox'):
+        op.drop_index('ix_task_outbox_pending', table_name='task_outbox')
+        op.drop_table('task_outbox')
@@ -0,0 +1,48 @@
+"""Add pg_trgm GIN indexes for dossier text search
+
+Unanchored ILIKE '%q%' filters in the dossier listings cannot use B-tree
+indexes; trigram GIN indexes serve them for patterns of 3+ characters.
+
+Revision ID: 025_trigram_search_indexes
+Revises: 024_task_outbox
+Create Date: 2026-01-08
+"""
+from alembic import op
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '025_trigram_search_indexes'
+down_revision = '024_task_outbox'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_opportunities_title_trgm', 'opportunities', 'title'),
+    ('ix_dossiers_summary_short_trgm', 'dossiers', 'summary_short'),
+    ('ix_dossiers_summary_long_trgm', 'dossiers', 'summary_long'),
+    ('ix_lead_items_title_trgm', 'lead_items', 'title'),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            if not index_exists(table, name):
+                op.create_index(
+                    name,
+                    table,
+                    [column],
+                    postgresql_using='gin',
+                    postgresql_ops={column: 'gin_trgm_ops'},
+                    postgresql_concurrently=True,
+                )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            if index_exists(table, name):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,35 @@
+"""Add trigram index on dossiers_v2.target_entities text
+
+GET /dossiers?entity_name= filters with target_entities::text ILIKE
+'%name%'; an expression GIN trigram index on the same cast serves it.
+
+Revision ID: 026_target_entities_trgm
+Revises: 025_trigram_search_indexes
+Create Date: 2026-01-08
+"""
+from alembic import op
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '026_target_entities_trgm'
+down_revision = '025_trigram_search_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # pg_trgm is created by 025_trigram_search_indexes
+    if index_exists('dossiers_v2', 'ix_dossiers_v2_target_entities_trgm'):
+        return
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_dossiers_v2_target_entities_trgm "
+            "ON dossiers_v2 USING gin ((target_entities::text) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    if index_exists('dossiers_v2', 'ix_dossiers_v2_target_entities_trgm'):
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY ix_dossiers_v2_target_entities_trgm")
@@ -0,0 +1,46 @@
+"""Add partial index for dossiers with missing fields
+
+Covers the has_missing_fields filter of GET /dossiers and the
+with_missing_fields counter of /dossiers/stats/overview. missing_fields is
+a JSON column that can hold JSON null, hence the json_typeof guard.
+
+Revision ID: 027_dossiers_has_missing
+Revises: 026_target_entities_trgm
+Create Date: 2026-01-08
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '027_dossiers_has_missing'
+down_revision = '026_target_entities_trgm'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if index_exists('dossiers', 'ix_dossiers_has_missing_fields'):
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_dossiers_has_missing_fields',
+            'dossiers',
+            ['state'],
+            postgresql_where=sa.text(
+                "CASE WHEN json_typeof(missing_fields) = 'array' "
+                "THEN json_array_length(missing_fields) ELSE 0 END > 0"
+            ),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if index_exists('dossiers', 'ix_dossiers_has_missing_fields'):
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                'ix_dossiers_has_missing_fields',
+                table_name='dossiers',
+                postgresql_concurrently=True,
+            )
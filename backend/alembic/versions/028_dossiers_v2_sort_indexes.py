@@ -0,0 +1,45 @@
+"""Add (state, updated_at DESC, id DESC) indexes on dossiers_v2
+
+GET /dossiers (dossiers_api) sorts by updated_at DESC by default, usually
+filtered by state; these indexes return the page in order without a sort.
+The legacy dossiers table already has ix_dossiers_state_score.
+
+Revision ID: 028_dossiers_v2_sort_indexes
+Revises: 027_dossiers_has_missing
+Create Date: 2026-01-08
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '028_dossiers_v2_sort_indexes'
+down_revision = '027_dossiers_has_missing'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_dossiers_v2_updated_id', ['updated_at DESC', 'id DESC']),
+    ('ix_dossiers_v2_state_updated_id', ['state', 'updated_at DESC', 'id DESC']),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            if not index_exists('dossiers_v2', name):
+                op.create_index(
+                    name,
+                    'dossiers_v2',
+                    [sa.text(c) for c in columns],
+                    postgresql_concurrently=True,
+                )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            if index_exists('dossiers_v2', name):
+                op.drop_index(name, table_name='dossiers_v2', postgresql_concurrently=True)
@@ -0,0 +1,67 @@
+"""Order the missing-fields partial index like the dossier list
+
+GET /dossiers sorts by (coalesce(score_final, 0) DESC, id DESC). The
+partial index from 027 only covered state, so a has_missing_fields page
+still sorted every matching row. It is replaced by (state,
+coalesce(score_final, 0) DESC, id DESC) with the same predicate, which also
+serves the keyset cursor.
+
+dossiers_v2 has no missing_fields column, so nothing is added there.
+
+Revision ID: 029_dossiers_missing_sorted
+Revises: 028_dossiers_v2_sort_indexes
+Create Date: 2026-01-09
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '029_dossiers_missing_sorted'
+down_revision = '028_dossiers_v2_sort_indexes'
+branch_labels = None
+depends_on = None
+
+
+# Same expression as MISSING_FIELDS_COUNT in app/api/dossiers.py
+HAS_MISSING_FIELDS = sa.text(
+    "CASE WHEN json_typeof(missing_fields) = 'array' "
+    "THEN json_array_length(missing_fields) ELSE 0 END > 0"
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        if not index_exists('dossiers', 'ix_dossiers_missing_state_score'):
+            op.create_index(
+                'ix_dossiers_missing_state_score',
+                'dossiers',
+                ['state', sa.text('coalesce(score_final, 0) DESC'), sa.text('id DESC')],
+                postgresql_where=HAS_MISSING_FIELDS,
+                postgresql_concurrently=True,
+            )
+        if index_exists('dossiers', 'ix_dossiers_has_missing_fields'):
+            op.drop_index(
+                'ix_dossiers_has_missing_fields',
+                table_name='dossiers',
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        if not index_exists('dossiers', 'ix_dossiers_has_missing_fields'):
+            op.create_index(
+                'ix_dossiers_has_missing_fields',
+                'dossiers',
+                ['state'],
+                postgresql_where=HAS_MISSING_FIELDS,
+                postgresql_concurrently=True,
+            )
+        if index_exists('dossiers', 'ix_dossiers_missing_state_score'):
+            op.drop_index(
+                'ix_dossiers_missing_state_score',
+                table_name='dossiers',
+                postgresql_concurrently=True,
+            )
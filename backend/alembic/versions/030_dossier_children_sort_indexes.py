@@ -0,0 +1,66 @@
+"""Add composite indexes for the per-dossier child listings
+
+The evidence, sources and enrichments endpoints filter on a parent id and
+sort on another column. Indexes in the same order let Postgres return the
+rows already sorted:
+
+- dossier_evidence (dossier_id, field_key, confidence DESC), replacing
+  (dossier_id, field_key), plus (dossier_id, confidence DESC)
+- source_documents (opportunity_id, created_at DESC)
+- web_enrichment_runs (dossier_id, started_at DESC)
+
+Revision ID: 030_dossier_children_sort
+Revises: 029_dossiers_missing_sorted
+Create Date: 2026-01-09
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '030_dossier_children_sort'
+down_revision = '029_dossiers_missing_sorted'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('dossier_evidence', 'ix_evidence_dossier_field_confidence', ['dossier_id', 'field_key', 'confidence DESC']),
+    ('dossier_evidence', 'ix_evidence_dossier_confidence', ['dossier_id', 'confidence DESC']),
+    ('source_documents', 'ix_source_docs_opp_created', ['opportunity_id', 'created_at DESC']),
+    ('web_enrichment_runs', 'ix_enrichment_runs_dossier_started', ['dossier_id', 'started_at DESC']),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, name, columns in INDEXES:
+            if not index_exists(table, name):
+                op.create_index(
+                    name,
+                    table,
+                    [sa.text(c) for c in columns],
+                    postgresql_concurrently=True,
+                )
+        # Prefix of ix_evidence_dossier_field_confidence
+        if index_exists('dossier_evidence', 'ix_evidence_dossier_field'):
+            op.drop_index(
+                'ix_evidence_dossier_field',
+                table_name='dossier_evidence',
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        if not index_exists('dossier_evidence', 'ix_evidence_dossier_field'):
+            op.create_index(
+                'ix_evidence_dossier_field',
+                'dossier_evidence',
+                ['dossier_id', 'field_key'],
+                postgresql_concurrently=True,
+            )
+        for table, name, _ in INDEXES:
+            if index_exists(table, name):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
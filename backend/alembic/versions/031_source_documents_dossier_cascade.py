@@ -0,0 +1,60 @@
+"""Cascade dossier deletes to source_documents_v2
+
+source_documents_v2.dossier_id was ON DELETE SET NULL, so DELETE
+/dossiers/{id} removed the documents itself before deleting the dossier.
+With ON DELETE CASCADE (as on evidence.dossier_id) the database removes
+both child tables while deleting the dossier row.
+
+Revision ID: 031_source_docs_dossier_cascade
+Revises: 030_dossier_children_sort
+Create Date: 2026-01-10
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '031_source_docs_dossier_cascade'
+down_revision = '030_dossier_children_sort'
+branch_labels = None
+depends_on = None
+
+
+def dossier_fk_name():
+    """Name of the source_documents_v2.dossier_id foreign key, if any.
+
+    Created as fk_source_documents_v2_dossier by 011, but tables built by
+    create_all carry the default Postgres name.
+    """
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT c.conname FROM pg_constraint c "
+            "JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY (c.conkey) "
+            "WHERE c.conrelid = 'source_documents_v2'::regclass "
+            "AND c.contype = 'f' AND a.attname = 'dossier_id'"
+        )
+    ).scalar()
+
+
+def replace_fk(on_delete: str) -> None:
+    name = dossier_fk_name()
+    drop = f"DROP CONSTRAINT {name}, " if name else ""
+    # NOT VALID: the swap only holds its ACCESS EXCLUSIVE lock briefly
+    op.execute(
+        f"ALTER TABLE source_documents_v2 {drop}"
+        "ADD CONSTRAINT fk_source_documents_v2_dossier FOREIGN KEY (dossier_id) "
+        f"REFERENCES dossiers_v2 (id) ON DELETE {on_delete} NOT VALID"
+    )
+    # Validated once the swap has committed, under SHARE UPDATE EXCLUSIVE,
+    # so existing rows are checked without blocking writes
+    with op.get_context().autocommit_block():
+        op.execute(
+            "ALTER TABLE source_documents_v2 VALIDATE CONSTRAINT fk_source_documents_v2_dossier"
+        )
+
+
+def upgrade() -> None:
+    replace_fk('CASCADE')
+
+
+def downgrade() -> None:
+    replace_fk('SET NULL')
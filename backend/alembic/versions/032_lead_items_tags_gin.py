@@ -0,0 +1,43 @@
+"""Add a GIN index on lead_items.tags for the tags filter
+
+GET /leads?tags=... filters with a single tags @> '[...]' containment.
+jsonb_path_ops only supports @> and is smaller and faster than the
+default jsonb_ops for it.
+
+Revision ID: 032_lead_items_tags_gin
+Revises: 031_source_docs_dossier_cascade
+Create Date: 2026-01-10
+"""
+from alembic import op
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '032_lead_items_tags_gin'
+down_revision = '031_source_docs_dossier_cascade'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if index_exists('lead_items', 'ix_lead_items_tags_gin'):
+        return
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_lead_items_tags_gin',
+            'lead_items',
+            ['tags'],
+            postgresql_using='gin',
+            postgresql_ops={'tags': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if index_exists('lead_items', 'ix_lead_items_tags_gin'):
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                'ix_lead_items_tags_gin',
+                table_name='lead_items',
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,47 @@
+"""Add pg_trgm GIN indexes for the lead search
+
+GET /leads?search=... matches ILIKE '%q%' on title, description and
+organization_name. title is indexed since 025; this adds the other two
+so the OR of the three can run as a BitmapOr of index scans.
+
+Revision ID: 033_lead_items_search_trgm
+Revises: 032_lead_items_tags_gin
+Create Date: 2026-01-10
+"""
+from alembic import op
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '033_lead_items_search_trgm'
+down_revision = '032_lead_items_tags_gin'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_lead_items_description_trgm', 'lead_items', 'description'),
+    ('ix_lead_items_organization_trgm', 'lead_items', 'organization_name'),
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            if not index_exists(table, name):
+                op.create_index(
+                    name,
+                    table,
+                    [column],
+                    postgresql_using='gin',
+                    postgresql_ops={column: 'gin_trgm_ops'},
+                    postgresql_concurrently=True,
+                )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            if index_exists(table, name):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,54 @@
+"""Add partial sort indexes for GET /leads
+
+list_opportunities always filters kind = 'OPPORTUNITY' and pages on
+(sort key, id), with score_base coalesced to 0 and deadline_at to a
+far-future sentinel (see _OPPORTUNITY_SORT_KEYS in app/api/leads.py).
+These partial indexes use the same expressions, so the default listing,
+its status/assignee filters and the deadline sort read the page in
+order without a sort. The tags filter is served by ix_lead_items_tags_gin.
+
+Revision ID: 034_lead_items_list_indexes
+Revises: 033_lead_items_search_trgm
+Create Date: 2026-01-11
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '034_lead_items_list_indexes'
+down_revision = '033_lead_items_search_trgm'
+branch_labels = None
+depends_on = None
+
+
+OPPORTUNITY = "kind = 'OPPORTUNITY'"
+
+INDEXES = (
+    ('ix_lead_items_opp_score_id', ['coalesce(score_base, 0) DESC', 'id DESC']),
+    ('ix_lead_items_opp_status_score_id', ['status', 'coalesce(score_base, 0) DESC', 'id DESC']),
+    ('ix_lead_items_opp_assigned_score_id', ['assigned_to', 'coalesce(score_base, 0) DESC', 'id DESC']),
+    ('ix_lead_items_opp_deadline_id', ["coalesce(deadline_at, '9999-12-31 00:00:00+00'::timestamptz)", 'id']),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            if not index_exists('lead_items', name):
+                op.create_index(
+                    name,
+                    'lead_items',
+                    [sa.text(c) for c in columns],
+                    postgresql_where=sa.text(OPPORTUNITY),
+                    postgresql_concurrently=True,
+                )
+    op.execute("ANALYZE lead_items")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            if index_exists('lead_items', name):
+                op.drop_index(name, table_name='lead_items', postgresql_concurrently=True)
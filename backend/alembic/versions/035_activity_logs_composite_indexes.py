@@ -0,0 +1,60 @@
+"""Replace activity_logs single-column indexes with (column, created_at DESC)
+
+The activity log views filter on one user_tracking_id or action and read
+the newest entries first. With single-column indexes Postgres either
+bitmap-ANDs with ix_activity_logs_created_at or filters one index and
+sorts. The composite indexes return the page in order, and they cover
+plain lookups on their leading column, so the single-column indexes they
+replace are dropped (one btree less to maintain per insert).
+
+activity_logs is partitioned: indexes on the parent cascade to every
+partition, but CREATE INDEX CONCURRENTLY is not supported on a
+partitioned table, so these are regular builds like in
+017_partition_activity_logs.
+
+Revision ID: 035_activity_logs_composite_indexes
+Revises: 034_lead_items_list_indexes
+Create Date: 2026-01-12
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import index_exists, table_exists
+
+# revision identifiers
+revision = '035_activity_logs_composite_indexes'
+down_revision = '034_lead_items_list_indexes'
+branch_labels = None
+depends_on = None
+
+
+# (new composite index, columns, single-column index it replaces)
+INDEXES = (
+    ('ix_activity_logs_user_tracking_id_created_at', ['user_tracking_id', 'created_at DESC'],
+     'ix_activity_logs_user_tracking_id', 'user_tracking_id'),
+    ('ix_activity_logs_action_created_at', ['action', 'created_at DESC'],
+     'ix_activity_logs_action', 'action'),
+)
+
+
+def upgrade() -> None:
+    if not table_exists('activity_logs'):
+        return
+
+    for name, columns, replaced, _ in INDEXES:
+        if not index_exists('activity_logs', name):
+            op.create_index(name, 'activity_logs', [sa.text(c) for c in columns])
+        if index_exists('activity_logs', replaced):
+            op.drop_index(replaced, table_name='activity_logs')
+    op.execute("ANALYZE activity_logs")
+
+
+def downgrade() -> None:
+    if not table_exists('activity_logs'):
+        return
+
+    for name, _, replaced, column in INDEXES:
+        if not index_exists('activity_logs', replaced):
+            op.create_index(replaced, 'activity_logs', [column])
+        if index_exists('activity_logs', name):
+            op.drop_index(name, table_name='activity_logs')
@@ -0,0 +1,37 @@
+"""Index dossiers on (coalesce(score_final, 0) DESC, id DESC)
+
+GET /dossiers sorts and pages on coalesce(score_final, 0) so dossiers
+without a score keep a valid keyset cursor. ix_dossiers_state_score is on
+the raw column and cannot return rows in that order.
+
+Revision ID: 036_dossiers_score_coalesce
+Revises: 035_activity_logs_composite_indexes
+Create Date: 2026-01-13
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import index_exists
+
+# revision identifiers
+revision = '036_dossiers_score_coalesce'
+down_revision = '035_activity_logs_composite_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        if not index_exists('dossiers', 'ix_dossiers_score_id'):
+            op.create_index(
+                'ix_dossiers_score_id',
+                'dossiers',
+                [sa.text('coalesce(score_final, 0) DESC'), sa.text('id DESC')],
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        if index_exists('dossiers', 'ix_dossiers_score_id'):
+            op.drop_index('ix_dossiers_score_id', table_name='dossiers', postgresql_concurrently=True)
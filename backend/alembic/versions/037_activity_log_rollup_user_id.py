@@ -0,0 +1,41 @@
+"""Add user_id to activity_log_hourly_rollup
+
+/admin/logs/stats counts active users by distinct user_id, like the raw
+activity_logs query it replaced: logs of deleted users (user_id set to
+NULL) are not counted.
+
+Revision ID: 037_activity_log_rollup_user_id
+Revises: 036_dossiers_score_coalesce
+Create Date: 2026-01-14
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from migration_helpers import column_exists
+
+# revision identifiers
+revision = '037_activity_log_rollup_user_id'
+down_revision = '036_dossiers_score_coalesce'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not column_exists('activity_log_hourly_rollup', 'user_id'):
+        op.add_column(
+            'activity_log_hourly_rollup',
+            sa.Column(
+                'user_id', sa.Integer(),
+                sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True,
+            ),
+        )
+        # tracking_id maps 1:1 to users; rows of deleted users stay NULL
+        op.execute(
+            "UPDATE activity_log_hourly_rollup r SET user_id = u.id "
+            "FROM users u WHERE u.tracking_id = r.user_tracking_id"
+        )
+
+
+def downgrade() -> None:
+    if column_exists('activity_log_hourly_rollup', 'user_id'):
+        op.drop_column('activity_log_hourly_rollup', 'user_id')
@@ -4,14 +4,14 @@ Real-time user activity tracking
 """
 from datetime import datetime, timedelta
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, or_, and_
 from pydantic import BaseModel
 from uuid import UUID
 
-from app.api.deps import get_db, get_current_user
-from app.db.models import User, ActivityLog
+from app.api.deps import get_db, require_superadmin
+from app.db.models import User, ActivityLog, ActivityLogHourlyRollup
 
 router = APIRouter()
 
@@ -35,7 +35,7 @@ class ActivityLogResponse(BaseModel):
 
 class UserWithTrackingId(BaseModel):
     """User with tracking ID for admin view"""
-    id: UUID
+    id: int
     tracking_id: str
     email: Optional[str]
     full_name: Optional[str]
@@ -57,8 +57,8 @@ async def get_activity_logs(
     action: Optional[str] = None,
     resource_type: Optional[str] = None,
     since_hours: Optional[int] = Query(None, ge=1, le=168),  # Max 7 days
+    current_user: User = Depends(require_superadmin),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
     """
     Get activity logs - Superadmin only
@@ -70,9 +70,6 @@ async def get_activity_logs(
     - **resource_type**: Filter by resource type
     - **since_hours**: Get logs from last N hours
     """
-    if not current_user.is_superuser:
-        raise HTTPException(status_code=403, detail="Superadmin access required")
-    
     query = db.query(ActivityLog).join(User, ActivityLog.user_id == User.id, isouter=True)
     
     if user_tracking_id:
@@ -114,16 +111,13 @@ async def get_activity_logs(
 async def get_logs_stream(
     since: Optional[datetime] = None,
     limit: int = Query(50, ge=1, le=100),
+    current_user: User = Depends(require_superadmin),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
     """
     Get recent logs since a timestamp (for polling)
     Returns logs newer than 'since' parameter
     """
-    if not current_user.is_superuser:
-        raise HTTPException(status_code=403, detail="Superadmin access required")
-    
     query = db.query(ActivityLog).join(User, ActivityLog.user_id == User.id, isouter=True)
     
     if since:
@@ -160,19 +154,27 @@ async def get_logs_stream(
 
 @router.get("/users/tracking", response_model=List[UserWithTrackingId])
 async def get_users_with_tracking(
+    current_user: User = Depends(require_superadmin),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
     """Get all users with their tracking IDs - Superadmin only"""
-    if not current_user.is_superuser:
-        raise HTTPException(status_code=403, detail="Superadmin access required")
-    
-    users = db.query(User).order_by(desc(User.created_at)).all()
+    # Column projection: lightweight rows instead of full User objects
+    users = db.query(
+        User.id,
+        User.tracking_id,
+        User.email,
+        User.full_name,
+        User.role,
+        User.is_active,
+        User.is_whitelisted,
+        User.last_login_at,
+        User.created_at,
+    ).order_by(desc(User.created_at)).all()
     
     return [
         UserWithTrackingId(
             id=u.id,
-            tracking_id=u.tracking_id or f"USR-{str(u.id)[:6].upper()}",
+            tracking_id=u.tracking_id,
             email=u.email,
             full_name=u.full_name,
             role=u.role.value if u.role else "viewer",
@@ -188,40 +190,58 @@ async def get_users_with_tracking(
 @router.get("/logs/stats")
 async def get_activity_stats(
     hours: int = Query(24, ge=1, le=168),
+    current_user: User = Depends(require_superadmin),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
     """Get activity statistics for the last N hours"""
-    if not current_user.is_superuser:
-        raise HTTPException(status_code=403, detail="Superadmin access required")
-    
     since_time = datetime.utcnow() - timedelta(hours=hours)
+    first_full_hour = since_time.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    
+    # Completed hours are read from the hourly rollup; only the partial first
+    # hour and the hours not rolled up yet are scanned in activity_logs. The
+    # last rolled hour is scanned too: rollup_activity_logs recomputes it on
+    # its next run to pick up late buffered writes, so it may be incomplete.
+    last_rolled_hour = db.query(func.max(ActivityLogHourlyRollup.hour)).scalar()
+    rolled_until = first_full_hour
+    if last_rolled_hour is not None:
+        rolled_until = max(last_rolled_hour, first_full_hour)
+    
+    rollup_events = db.query(
+        ActivityLogHourlyRollup.action.label("action"),
+        ActivityLogHourlyRollup.user_id.label("user_id"),
+        ActivityLogHourlyRollup.event_count.label("event_count"),
+    ).filter(
+        ActivityLogHourlyRollup.hour >= first_full_hour,
+        ActivityLogHourlyRollup.hour < rolled_until,
+    )
+    raw_events = db.query(
+        ActivityLog.action.label("action"),
+        ActivityLog.user_id.label("user_id"),
+        func.count(ActivityLog.id).label("event_count"),
+    ).filter(
+        or_(
+            and_(ActivityLog.created_at >= since_time, ActivityLog.created_at < first_full_hour),
+            ActivityLog.created_at >= rolled_until,
+        )
+    ).group_by(ActivityLog.action, ActivityLog.user_id)
+    events = rollup_events.union_all(raw_events).subquery()
     
     # Get counts by action
-    from sqlalchemy import func
-    
     action_counts = db.query(
-        ActivityLog.action,
-        func.count(ActivityLog.id).label('count')
-    ).filter(
-        ActivityLog.created_at >= since_time
-    ).group_by(ActivityLog.action).all()
+        events.c.action,
+        func.sum(events.c.event_count),
+    ).group_by(events.c.action).all()
     
     # Get active users
     active_users = db.query(
-        func.count(func.distinct(ActivityLog.user_id))
-    ).filter(
-        ActivityLog.created_at >= since_time
+        func.count(func.distinct(events.c.user_id))
     ).scalar()
     
-    # Get total logs
-    total_logs = db.query(func.count(ActivityLog.id)).filter(
-        ActivityLog.created_at >= since_time
-    ).scalar()
+    actions = {action: int(count) for action, count in action_counts}
     
     return {
         "period_hours": hours,
-        "total_logs": total_logs,
+        "total_logs": sum(actions.values()),
         "active_users": active_users,
-        "actions": {action: count for action, count in action_counts},
+        "actions": actions,
     }
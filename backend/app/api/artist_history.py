@@ -1,14 +1,17 @@
 """
 API endpoints for artist analysis history and suggestions
 """
+import json
+import random
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc, func, cast, Text
 from pydantic import BaseModel
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, require_admin
 from app.db.models.user import User
 from app.db.models.artist_analysis import ArtistAnalysis
 from app.intelligence.known_artists_db import (
@@ -17,6 +20,7 @@ from app.intelligence.known_artists_db import (
     get_budget_friendly_artists,
     get_genre_artists,
     KnownArtistData,
+    KNOWN_ARTISTS_DB,
 )
 
 router = APIRouter()
@@ -160,37 +164,21 @@ async def get_artist_statistics(
     total = db.query(ArtistAnalysis).count()
     unique = db.query(func.count(func.distinct(ArtistAnalysis.artist_name))).scalar()
     
-    # Calculate average fees based on UNIQUE artists (latest analysis per artist)
-    # Subquery to get the latest analysis ID for each artist
-    from sqlalchemy import and_
-    
+    # Calculate average/total fees based on UNIQUE artists (latest analysis per artist)
+    # DISTINCT ON is served by ix_artist_analyses_name_id (artist_name, id DESC)
     latest_per_artist = db.query(
+        ArtistAnalysis.fee_min,
+        ArtistAnalysis.fee_max,
+    ).distinct(ArtistAnalysis.artist_name).order_by(
         ArtistAnalysis.artist_name,
-        func.max(ArtistAnalysis.id).label('latest_id')
-    ).group_by(ArtistAnalysis.artist_name).subquery()
-    
-    # Get average fees from only the latest analysis of each unique artist
-    avg_fees = db.query(
-        func.avg(ArtistAnalysis.fee_min),
-        func.avg(ArtistAnalysis.fee_max)
-    ).join(
-        latest_per_artist,
-        and_(
-            ArtistAnalysis.artist_name == latest_per_artist.c.artist_name,
-            ArtistAnalysis.id == latest_per_artist.c.latest_id
-        )
-    ).first()
+        desc(ArtistAnalysis.id),
+    ).subquery()
     
-    # Also calculate total fees (sum) for display
-    total_fees = db.query(
-        func.sum(ArtistAnalysis.fee_min),
-        func.sum(ArtistAnalysis.fee_max)
-    ).join(
-        latest_per_artist,
-        and_(
-            ArtistAnalysis.artist_name == latest_per_artist.c.artist_name,
-            ArtistAnalysis.id == latest_per_artist.c.latest_id
-        )
+    fees = db.query(
+        func.avg(latest_per_artist.c.fee_min),
+        func.avg(latest_per_artist.c.fee_max),
+        func.sum(latest_per_artist.c.fee_min),
+        func.sum(latest_per_artist.c.fee_max),
     ).first()
     
     # Most searched artist
@@ -222,10 +210,10 @@ async def get_artist_statistics(
     return ArtistStatistics(
         total_analyses=total,
         unique_artists=unique or 0,
-        avg_fee_min=float(avg_fees[0] or 0),
-        avg_fee_max=float(avg_fees[1] or 0),
-        total_fee_min=float(total_fees[0] or 0),
-        total_fee_max=float(total_fees[1] or 0),
+        avg_fee_min=float(fees[0] or 0),
+        avg_fee_max=float(fees[1] or 0),
+        total_fee_min=float(fees[2] or 0),
+        total_fee_max=float(fees[3] or 0),
         most_searched_artist=most_searched[0] if most_searched else None,
         tier_distribution=tier_distribution,
         avg_ai_score=float(avg_ai_score) if avg_ai_score else None,
@@ -274,64 +262,91 @@ def artist_to_suggestion(artist: KnownArtistData, reason: str) -> ArtistSuggesti
     )
 
 
-@router.get("/suggestions/all", response_model=SuggestionsResponse)
-async def get_all_suggestions(
-    limit: int = Query(6, ge=1, le=20),
-    current_user: User = Depends(get_current_user),
-):
-    """Get all artist suggestions: emerging, rising, and budget-friendly"""
-    
-    # Artistes émergents avec fort potentiel
-    emerging_artists = get_emerging_artists(limit=limit)
-    emerging = [
-        artist_to_suggestion(
-            a, 
+# Suggestions are drawn from the static in-code artist database, so each
+# candidate is converted and JSON-encoded once; requests only sample the
+# pre-encoded fragments (keeping results random) and join them.
+
+def _encode_suggestion(artist: KnownArtistData, reason: str) -> bytes:
+    return json.dumps(
+        artist_to_suggestion(artist, reason).model_dump(),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _json_array(fragments) -> bytes:
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def _sample(pool: tuple, limit: int) -> list:
+    return random.sample(pool, min(limit, len(pool)))
+
+
+@lru_cache(maxsize=None)
+def _emerging_pool() -> tuple:
+    return tuple(
+        _encode_suggestion(
+            a,
             f"Fort potentiel: {a.spotify_monthly_listeners:,} auditeurs pour seulement {a.fee_min:,}€-{a.fee_max:,}€"
         )
-        for a in emerging_artists
-    ]
-    
-    # Artistes en progression
-    rising_artists = get_rising_artists(limit=limit)
-    rising = [
-        artist_to_suggestion(
+        for a in get_emerging_artists(limit=len(KNOWN_ARTISTS_DB))
+    )
+
+
+@lru_cache(maxsize=None)
+def _rising_pool(established_hint: bool = False) -> tuple:
+    suffix = ", bientôt établi" if established_hint else ""
+    return tuple(
+        _encode_suggestion(
             a,
-            f"En forte progression: {a.spotify_monthly_listeners:,} auditeurs Spotify, bientôt établi"
+            f"En forte progression: {a.spotify_monthly_listeners:,} auditeurs Spotify{suffix}"
         )
-        for a in rising_artists
-    ]
-    
-    # Meilleur rapport qualité/prix
-    budget_artists = get_budget_friendly_artists(max_budget=15000, limit=limit)
-    budget_friendly = [
-        artist_to_suggestion(
+        for a in get_rising_artists(limit=len(KNOWN_ARTISTS_DB))
+    )
+
+
+@lru_cache(maxsize=64)
+def _budget_pool(max_budget: int) -> tuple:
+    return tuple(
+        _encode_suggestion(
             a,
             f"Excellent rapport: {a.spotify_monthly_listeners:,} auditeurs dès {a.fee_min:,}€"
         )
-        for a in budget_artists
-    ]
-    
-    return SuggestionsResponse(
-        emerging=emerging,
-        rising=rising,
-        budget_friendly=budget_friendly,
+        for a in get_budget_friendly_artists(max_budget=max_budget, limit=len(KNOWN_ARTISTS_DB))
     )
 
 
+@lru_cache(maxsize=64)
+def _genre_payload(genre: str, limit: int) -> bytes:
+    return _json_array(
+        _encode_suggestion(a, f"Genre {a.genre}: {a.spotify_monthly_listeners:,} auditeurs")
+        for a in get_genre_artists(genre=genre, limit=limit)
+    )
+
+
+@router.get("/suggestions/all", response_model=SuggestionsResponse)
+async def get_all_suggestions(
+    limit: int = Query(6, ge=1, le=20),
+    current_user: User = Depends(get_current_user),
+):
+    """Get all artist suggestions: emerging, rising, and budget-friendly"""
+    content = (
+        b'{"emerging":' + _json_array(_sample(_emerging_pool(), limit))
+        + b',"rising":' + _json_array(_sample(_rising_pool(True), limit))
+        + b',"budget_friendly":' + _json_array(_sample(_budget_pool(15000), limit))
+        + b"}"
+    )
+    return Response(content=content, media_type="application/json")
+
+
 @router.get("/suggestions/emerging", response_model=List[ArtistSuggestion])
 async def get_emerging_suggestions(
     limit: int = Query(10, ge=1, le=50),
     current_user: User = Depends(get_current_user),
 ):
     """Get emerging artists with high potential"""
-    artists = get_emerging_artists(limit=limit)
-    return [
-        artist_to_suggestion(
-            a,
-            f"Fort potentiel: {a.spotify_monthly_listeners:,} auditeurs pour seulement {a.fee_min:,}€-{a.fee_max:,}€"
-        )
-        for a in artists
-    ]
+    content = _json_array(_sample(_emerging_pool(), limit))
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/suggestions/rising", response_model=List[ArtistSuggestion])
@@ -340,14 +355,8 @@ async def get_rising_suggestions(
     current_user: User = Depends(get_current_user),
 ):
     """Get rising artists close to becoming established"""
-    artists = get_rising_artists(limit=limit)
-    return [
-        artist_to_suggestion(
-            a,
-            f"En forte progression: {a.spotify_monthly_listeners:,} auditeurs Spotify"
-        )
-        for a in artists
-    ]
+    content = _json_array(_sample(_rising_pool(), limit))
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/suggestions/budget", response_model=List[ArtistSuggestion])
@@ -357,14 +366,8 @@ async def get_budget_suggestions(
     current_user: User = Depends(get_current_user),
 ):
     """Get best value artists for a given budget"""
-    artists = get_budget_friendly_artists(max_budget=max_budget, limit=limit)
-    return [
-        artist_to_suggestion(
-            a,
-            f"Excellent rapport: {a.spotify_monthly_listeners:,} auditeurs dès {a.fee_min:,}€"
-        )
-        for a in artists
-    ]
+    content = _json_array(_sample(_budget_pool(max_budget), limit))
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/suggestions/genre/{genre}", response_model=List[ArtistSuggestion])
@@ -374,14 +377,7 @@ async def get_genre_suggestions(
     current_user: User = Depends(get_current_user),
 ):
     """Get artists by genre"""
-    artists = get_genre_artists(genre=genre, limit=limit)
-    return [
-        artist_to_suggestion(
-            a,
-            f"Genre {a.genre}: {a.spotify_monthly_listeners:,} auditeurs"
-        )
-        for a in artists
-    ]
+    return Response(content=_genre_payload(genre, limit), media_type="application/json")
 
 
 # ===== DYNAMIC ROUTES (après les routes statiques) =====
@@ -406,22 +402,23 @@ async def get_artist_analysis_full(
     current_user: User = Depends(get_current_user),
 ):
     """Get full JSON data for an artist analysis"""
-    analysis = db.query(ArtistAnalysis).filter(ArtistAnalysis.id == analysis_id).first()
-    if not analysis:
+    # Fetch the JSON column as text and pass it through untouched
+    # (no ORM hydration, no Python-side decode/encode round-trip)
+    row = db.query(cast(ArtistAnalysis.full_data, Text)).filter(
+        ArtistAnalysis.id == analysis_id
+    ).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Analysis not found")
-    return analysis.full_data
+    return Response(content=row[0] or "null", media_type="application/json")
 
 
 @router.delete("/{analysis_id}")
 async def delete_artist_analysis(
     analysis_id: int,
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
     """Delete an artist analysis"""
-    if current_user.role not in ["admin", "manager"]:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
     analysis = db.query(ArtistAnalysis).filter(ArtistAnalysis.id == analysis_id).first()
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis not found")
@@ -434,13 +431,10 @@ async def delete_artist_analysis(
 
 @router.delete("/")
 async def clear_artist_history(
+    current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
     """Clear all artist analysis history (admin only)"""
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
     count = db.query(ArtistAnalysis).count()
     db.query(ArtistAnalysis).delete()
     db.commit()
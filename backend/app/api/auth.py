@@ -2,22 +2,24 @@
 Authentication endpoints
 """
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Callable, Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from sqlalchemy import exists, text
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 
 from app.db import get_db
 from app.db.models.user import User, Role
 from app.core.security import (
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     create_refresh_token,
     verify_token,
     get_password_hash,
 )
 from app.core.two_factor import two_factor_auth
-from app.core.activity_logger import ActivityLogger, Actions
+from app.core.cache import idempotency_begin, idempotency_complete, idempotency_release
+from app.core.activity_logger import ActivityLogger, Actions, activity_log_buffer
 from app.schemas.user import UserLogin, Token, UserResponse, LoginResponse
 from app.api.deps import get_current_user
 
@@ -27,7 +29,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 class SetupCheck(BaseModel):
     """Response for setup check"""
     needs_setup: bool
-    user_count: int
+    user_count: int  # 0 or 1 (EXISTS probe): only tells whether any user exists
 
 
 class InitialSetup(BaseModel):
@@ -37,25 +39,97 @@ class InitialSetup(BaseModel):
     full_name: str
 
 
+# Arbitrary key for the advisory lock serializing concurrent /setup calls
+SETUP_LOCK_KEY = 7_201_001
+
+
+def _any_user_exists(db: Session) -> bool:
+    """EXISTS probe - stops at the first row instead of counting the table"""
+    return db.query(exists().select_from(User)).scalar()
+
+
+def _idempotent(key: Optional[str], handler: Callable[[], Any], serialize: Callable[[Any], Any] = lambda r: r):
+    """
+    Run handler once per idempotency key (60s window).
+
+    Duplicates receive the stored response of the first call, or a 409
+    while it is still running. A failed call releases the key.
+    """
+    if not key:
+        return handler()
+    claimed, stored = idempotency_begin(key)
+    if not claimed:
+        if stored is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Request already in progress",
+            )
+        return stored
+    try:
+        result = handler()
+    except Exception:
+        idempotency_release(key)
+        raise
+    idempotency_complete(key, serialize(result))
+    return result
+
+
+def _consume_backup_code(db: Session, user: User, code: str) -> Optional[int]:
+    """
+    Remove a used backup code in the database and return how many are left.
+
+    The filter on the code makes this atomic: when two logins race on the
+    same code only one UPDATE matches, the other gets None.
+    """
+    remaining = db.execute(
+        text(
+            "UPDATE users SET backup_codes = COALESCE("
+            "(SELECT json_agg(c) FROM json_array_elements_text(backup_codes) AS c WHERE c <> :code), "
+            "'[]'::json) "
+            "WHERE id = :user_id AND backup_codes::jsonb @> jsonb_build_array(:code) "
+            "RETURNING json_array_length(backup_codes)"
+        ),
+        {"code": code, "user_id": user.id},
+    ).scalar()
+    db.commit()
+    db.expire(user, ["backup_codes"])
+    return remaining
+
+
 @router.get("/setup-check", response_model=SetupCheck)
 def check_needs_setup(db: Session = Depends(get_db)):
     """Check if initial setup is needed (no users exist)"""
-    user_count = db.query(User).count()
+    needs_setup = not _any_user_exists(db)
     return SetupCheck(
-        needs_setup=user_count == 0,
-        user_count=user_count
+        needs_setup=needs_setup,
+        user_count=0 if needs_setup else 1,
     )
 
 
 @router.post("/setup", response_model=UserResponse)
 def initial_setup(
     data: InitialSetup,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Create the first admin account (only works if no users exist)"""
+    # Double-submits carrying the same Idempotency-Key get the first answer
+    # from Redis without touching the database
+    idem_key = request.headers.get("Idempotency-Key")
+    return _idempotent(
+        f"setup:{idem_key}" if idem_key else None,
+        lambda: _create_initial_admin(data, db),
+        lambda admin: UserResponse.model_validate(admin).model_dump(mode="json"),
+    )
+
+
+def _create_initial_admin(data: InitialSetup, db: Session) -> User:
+    """Create the super admin (the session only connects from here on)"""
+    # Serialize concurrent setup requests until this transaction ends
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SETUP_LOCK_KEY})
+    
     # Check if any users exist
-    user_count = db.query(User).count()
-    if user_count > 0:
+    if _any_user_exists(db):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Setup already completed. Use login instead.",
@@ -94,13 +168,21 @@ def login(
     """Authenticate user and return tokens"""
     user = db.query(User).filter(User.email == credentials.email).first()
     
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    is_valid, new_hash = (
+        verify_and_update_password(credentials.password, user.hashed_password)
+        if user else (False, None)
+    )
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade bcrypt hashes to argon2id (committed with last_login_at below)
+    if new_hash:
+        user.hashed_password = new_hash
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -135,21 +217,13 @@ def login(
             if user.backup_codes:
                 # backup_codes is stored as JSON list
                 backup_codes = user.backup_codes if isinstance(user.backup_codes, list) else []
-                # Normalize input code for comparison
-                normalized_input = credentials.totp_code.upper().replace(" ", "").replace("-", "")
-                
-                matched_code = None
-                for code in backup_codes:
-                    if code.replace("-", "") == normalized_input:
-                        matched_code = code
-                        break
+                is_valid, matched_code = two_factor_auth.verify_backup_code(
+                    credentials.totp_code,
+                    backup_codes,
+                )
                 
-                if matched_code:
-                    # Valid backup code - remove it
-                    backup_codes.remove(matched_code)
-                    user.backup_codes = backup_codes
-                    db.commit()
-                else:
+                # Remove the matched code (None if another login used it first)
+                if not is_valid or _consume_backup_code(db, user, matched_code) is None:
                     raise HTTPException(
                         status_code=status.HTTP_401_UNAUTHORIZED,
                         detail="Code 2FA invalide",
@@ -160,8 +234,8 @@ def login(
                     detail="Code 2FA invalide",
                 )
     
-    # Log successful login
-    ActivityLogger.log(
+    # Log successful login (batched write)
+    ActivityLogger.enqueue(
         db=db,
         user=user,
         action=Actions.LOGIN,
@@ -169,9 +243,11 @@ def login(
         request=request,
     )
     
-    # Update last login
-    user.last_login_at = datetime.utcnow()
-    db.commit()
+    # Update last login (batched write; inline when a rehash must be saved)
+    now = datetime.utcnow()
+    if new_hash or not activity_log_buffer.push_last_login(user.id, now):
+        user.last_login_at = now
+        db.commit()
     
     # Create tokens
     access_token = create_access_token(data={"sub": str(user.id)})
@@ -293,21 +369,30 @@ def enable_2fa(
     """
     Enable 2FA after verifying the first code from authenticator app.
     """
-    if not current_user.two_factor_secret:
+    # A double-tap submits the same code twice: replay the first result
+    return _idempotent(
+        f"2fa-enable:{current_user.id}:{data.code}",
+        lambda: _enable_2fa(data, current_user, db),
+    )
+
+
+def _enable_2fa(data: TwoFactorEnableRequest, user: User, db: Session) -> dict:
+    """Verify the first authenticator code and turn 2FA on"""
+    if not user.two_factor_secret:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="2FA setup not initiated. Call /2fa/setup first."
         )
     
     # Verify the code
-    if not two_factor_auth.verify_code(current_user.two_factor_secret, data.code):
+    if not two_factor_auth.verify_code(user.two_factor_secret, data.code):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid verification code"
         )
     
     # Enable 2FA
-    current_user.two_factor_enabled = True
+    user.two_factor_enabled = True
     db.commit()
     
     return {"status": "success", "message": "2FA enabled successfully"}
@@ -372,14 +457,14 @@ def verify_2fa_code(
         )
         if is_valid and used_code:
             # Remove used backup code
-            user.backup_codes = [c for c in user.backup_codes if c != used_code]
-            db.commit()
-            return {
-                "status": "success", 
-                "verified": True,
-                "backup_code_used": True,
-                "remaining_backup_codes": len(user.backup_codes)
-            }
+            remaining = _consume_backup_code(db, user, used_code)
+            if remaining is not None:
+                return {
+                    "status": "success", 
+                    "verified": True,
+                    "backup_code_used": True,
+                    "remaining_backup_codes": remaining
+                }
     
     raise HTTPException(
         status_code=status.HTTP_400_BAD_REQUEST,
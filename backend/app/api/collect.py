@@ -10,9 +10,11 @@ from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, validator
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.db import get_db
 from app.db.models.user import User
@@ -22,6 +24,7 @@ from app.db.models.entity import Entity, EntityType, CollectionRun, ObjectiveTyp
 from app.api.deps import get_current_user
 from app.workers.tasks import run_ingestion_task
 from app.workers.ai_collection import run_ai_collection_task
+from app.workers.outbox import enqueue_task, dispatch_after_commit
 
 router = APIRouter(prefix="/collect", tags=["Collection"])
 
@@ -50,7 +53,12 @@ class StandardCollectResponse(BaseModel):
 class EntityInput(BaseModel):
     """Entity input for advanced collection"""
     name: str
-    type: str = "ORGANIZATION"  # PERSON, ORGANIZATION, TOPIC
+    type: EntityType = EntityType.ORGANIZATION  # PERSON, ORGANIZATION, TOPIC
+
+    @validator('type', pre=True)
+    def default_unknown_type(cls, v):
+        """Unknown entity types fall back to ORGANIZATION"""
+        return v if v in EntityType.__members__ else EntityType.ORGANIZATION
 
 
 class AdvancedCollectRequest(BaseModel):
@@ -104,15 +112,15 @@ def start_standard_collection(
     This triggers ingestion from all active sources (or specific ones if source_ids provided)
     with optional filters for keywords, location, and budget.
     """
-    # Get sources to process
-    query = db.query(SourceConfig).filter(SourceConfig.is_active == True)
+    # Get sources to process (only the ids are needed to dispatch)
+    query = db.query(SourceConfig.id).filter(SourceConfig.is_active == True)
     
     if request.source_ids:
         query = query.filter(SourceConfig.id.in_(request.source_ids))
     
-    sources = query.all()
+    source_ids = [source_id for (source_id,) in query.all()]
     
-    if not sources:
+    if not source_ids:
         raise HTTPException(
             status_code=400,
             detail="Aucune source active. Configurez des sources dans l'onglet Sources."
@@ -131,19 +139,23 @@ def start_standard_collection(
     if request.budget_max is not None:
         search_params['budget_max'] = request.budget_max
     
-    # Trigger ingestion tasks for each source
-    run_ids = []
-    for source in sources:
-        task = run_ingestion_task.delay(
-            source_id=str(source.id),
-            search_params=search_params if search_params else None
+    # Record one ingestion task per source, then send them in one batch
+    run_ids = [
+        enqueue_task(
+            db,
+            run_ingestion_task,
+            source_id=str(source_id),
+            search_params=search_params if search_params else None,
         )
-        run_ids.append(task.id)
+        for source_id in source_ids
+    ]
+    db.commit()
+    dispatch_after_commit(db, run_ids)
     
     return StandardCollectResponse(
         run_ids=run_ids,
-        source_count=len(sources),
-        message=f"Collecte standard lancée sur {len(sources)} source(s)"
+        source_count=len(source_ids),
+        message=f"Collecte standard lancée sur {len(source_ids)} source(s)"
     )
 
 
@@ -164,48 +176,49 @@ def start_advanced_collection(
     This uses OpenAI to intelligently search for opportunities, contacts,
     and relevant information based on the objective and entities provided.
     """
-    # Validate objective
-    valid_objectives = ["SPONSOR", "BOOKING", "PRESS", "VENUE", "SUPPLIER", "GRANT"]
-    if request.objective not in valid_objectives:
+    # Validate objective (enum lookup; the message is only built on error)
+    try:
+        objective = DBObjectiveType(request.objective)
+    except ValueError:
         raise HTTPException(
             status_code=400,
-            detail=f"Objectif invalide. Valeurs possibles: {', '.join(valid_objectives)}"
+            detail=f"Objectif invalide. Valeurs possibles: {', '.join(DBObjectiveType.__members__)}"
         )
     
     # Create or get entities
-    entity_ids = []
+    entity_keys = []
+    values = {}
     for entity_input in request.entities:
         normalized_name = entity_input.name.lower().strip()
+        entity_type = entity_input.type
         
-        # Map entity type
-        try:
-            entity_type = EntityType[entity_input.type]
-        except KeyError:
-            entity_type = EntityType.ORGANIZATION
-        
-        # Check if entity exists
-        entity = db.query(Entity).filter(
-            Entity.normalized_name == normalized_name,
-            Entity.entity_type == entity_type
-        ).first()
-        
-        if not entity:
-            entity = Entity(
-                name=entity_input.name.strip(),
-                normalized_name=normalized_name,
-                entity_type=entity_type,
-            )
-            db.add(entity)
-            db.flush()
-        
-        entity_ids.append(entity.id)
+        key = (normalized_name, entity_type)
+        entity_keys.append(key)
+        values.setdefault(key, {
+            "name": entity_input.name.strip(),
+            "normalized_name": normalized_name,
+            "entity_type": entity_type,
+        })
+    
+    # Single upsert for all entities; the no-op DO UPDATE makes RETURNING
+    # include rows that already existed (their name is left untouched)
+    stmt = pg_insert(Entity).values(list(values.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Entity.normalized_name, Entity.entity_type],
+        set_={"normalized_name": stmt.excluded.normalized_name},
+    ).returning(Entity.id, Entity.normalized_name, Entity.entity_type)
+    ids_by_key = {
+        (row.normalized_name, row.entity_type): row.id
+        for row in db.execute(stmt)
+    }
+    entity_ids = [ids_by_key[key] for key in entity_keys]
     
     # Create collection run
     collection_run = CollectionRun(
-        objective=DBObjectiveType[request.objective],
+        objective=objective,
         entities_requested=[
-            {"id": str(eid), "name": e.name, "type": e.type} 
-            for eid, e in zip(entity_ids, request.entities)
+            {"id": eid, "name": e.name, "type": e.type}
+            for eid, e in zip(entity_ids, request.entities, strict=True)
         ],
         secondary_keywords=request.secondary_keywords or [],
         timeframe_days=request.timeframe_days,
@@ -218,13 +231,15 @@ def start_advanced_collection(
         status="RUNNING",
     )
     db.add(collection_run)
-    db.commit()
+    db.flush()
     
-    # Trigger AI collection task
-    run_ai_collection_task.delay(
+    # Trigger AI collection task (committed together with the run)
+    task_id = enqueue_task(
+        db,
+        run_ai_collection_task,
         run_id=str(collection_run.id),
         entity_ids=[str(eid) for eid in entity_ids],
-        objective=request.objective,
+        objective=objective.value,
         secondary_keywords=request.secondary_keywords or [],
         timeframe_days=request.timeframe_days,
         require_contact=request.require_contact,
@@ -235,6 +250,8 @@ def start_advanced_collection(
             "city": request.city,
         }
     )
+    db.commit()
+    dispatch_after_commit(db, [task_id])
     
     return AdvancedCollectResponse(
         run_id=str(collection_run.id),
@@ -247,32 +264,47 @@ def start_advanced_collection(
 # Collection Status
 # =====================
 
-@router.get("/standard/status", response_model=List[CollectionStatusResponse])
+@router.get(
+    "/standard/status",
+    response_class=ORJSONResponse,
+    responses={200: {"model": List[CollectionStatusResponse]}},
+)
 def get_standard_collection_status(
     limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get recent standard collection runs status"""
-    runs = db.query(IngestionRun).order_by(
+    # Only the columns the response needs, first error extracted in SQL
+    rows = db.query(
+        IngestionRun.id,
+        IngestionRun.status,
+        IngestionRun.started_at,
+        IngestionRun.completed_at,
+        IngestionRun.items_fetched,
+        IngestionRun.items_new,
+        IngestionRun.errors[0].as_string(),
+    ).order_by(
         desc(IngestionRun.started_at)
     ).limit(limit).all()
     
-    return [
-        CollectionStatusResponse(
-            id=str(run.id),
-            type="standard",
-            status=run.status.value,
-            started_at=run.started_at,
-            finished_at=run.completed_at,  # IngestionRun uses completed_at
-            items_found=run.items_fetched or 0,
-            items_new=run.items_new or 0,
-            contacts_found=0,
-            error_message=run.errors[0] if run.errors else None,  # First error from list
-            brief_id=None,
-        )
-        for run in runs
-    ]
+    # Same shape as CollectionStatusResponse, encoded without re-validation
+    return ORJSONResponse([
+        {
+            "id": str(run_id),
+            "type": "standard",
+            "status": run_status.value,
+            "started_at": started_at,
+            "finished_at": completed_at,  # IngestionRun uses completed_at
+            "items_found": items_fetched or 0,
+            "items_new": items_new or 0,
+            "contacts_found": 0,
+            "error_message": first_error,  # First error from list
+            "brief_id": None,
+        }
+        for (run_id, run_status, started_at, completed_at,
+             items_fetched, items_new, first_error) in rows
+    ])
 
 
 @router.get("/advanced/status/{run_id}", response_model=CollectionStatusResponse)
@@ -282,13 +314,22 @@ def get_advanced_collection_status(
     current_user: User = Depends(get_current_user),
 ):
     """Get advanced collection run status"""
-    run = db.query(CollectionRun).filter(CollectionRun.id == run_id).first()
+    run = db.query(
+        CollectionRun.status,
+        CollectionRun.started_at,
+        CollectionRun.finished_at,
+        CollectionRun.documents_new,
+        CollectionRun.documents_updated,
+        CollectionRun.contacts_found,
+        CollectionRun.error_summary,
+        CollectionRun.brief_id,
+    ).filter(CollectionRun.id == run_id).first()
     
     if not run:
         raise HTTPException(status_code=404, detail="Collection run not found")
     
     return CollectionStatusResponse(
-        id=str(run.id),
+        id=str(run_id),
         type="advanced",
         status=run.status,
         started_at=run.started_at,
@@ -10,23 +10,25 @@ GET /collections/{id}/results - Résultats d'une collecte
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
-import math
 
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import desc, distinct, func, select
 
 from app.db import get_db
 from app.db.models.user import User
 from app.db.models.collections import (
-    CollectionV2, CollectionLog, CollectionResult, LeadItem,
+    CollectionV2, CollectionLog, CollectionResult, LeadItem, SourceDocumentV2,
     CollectionType, CollectionStatus
 )
 from app.api.deps import get_current_user
+from app.api.pagination import paginate
+from app.api.serializers import dossier_lead_ids, lead_item_to_response
 from app.schemas.collections import (
     CreateCollectionRequest, CollectionResponse, CollectionDetailResponse,
-    CollectionListResponse, CollectionLogSchema, CollectionStatsSchema,
-    CollectionTypeEnum, OpportunityResponse
+    CollectionListResponse, CollectionStatsSchema,
+    CollectionTypeEnum, CollectionLogPage, OpportunityPage
 )
 from app.workers.collection_pipeline import (
     run_standard_collection,
@@ -88,11 +90,12 @@ def create_collection(
 # GET /collections - Liste paginée
 # ================================================================
 
-@router.get("", response_model=CollectionListResponse)
-@router.get("/", response_model=CollectionListResponse)
+@router.get("", responses={200: {"model": CollectionListResponse}}, response_class=ORJSONResponse)
+@router.get("/", responses={200: {"model": CollectionListResponse}}, response_class=ORJSONResponse)
 def list_collections(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor de la page précédente (pagination keyset)"),
     type: Optional[CollectionTypeEnum] = None,
     status: Optional[str] = None,
     db: Session = Depends(get_db),
@@ -107,70 +110,69 @@ def list_collections(
     if status:
         query = query.filter(CollectionV2.status == status)
 
-    # Compte total
-    total = query.count()
+    # Pagination (page + total, ou keyset si un curseur est fourni)
+    collections, meta = paginate(query, _COLLECTION_KEYS, page, page_size, cursor)
+    counts = _results_counts(db, collections)
 
-    # Pagination
-    query = query.order_by(desc(CollectionV2.created_at))
-    query = query.offset((page - 1) * page_size).limit(page_size)
-    
-    collections = query.all()
-
-    return CollectionListResponse(
-        items=[_collection_to_response(c, db) for c in collections],
-        total=total,
-        page=page,
-        page_size=page_size,
-        pages=math.ceil(total / page_size) if total > 0 else 0,
-    )
+    # Rows come from the DB: skip response_model re-validation and encode directly
+    return ORJSONResponse({
+        "items": [
+            _collection_to_response(c, db, counts.get(c.id, 0)).model_dump()
+            for c in collections
+        ],
+        **meta,
+    })
 
 
 # ================================================================
 # GET /collections/{id} - Détail
 # ================================================================
 
-@router.get("/{collection_id}", response_model=CollectionDetailResponse)
+@router.get("/{collection_id}", responses={200: {"model": CollectionDetailResponse}}, response_class=ORJSONResponse)
 def get_collection(
     collection_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Détail complet d'une collecte avec logs et stats"""
-    collection = db.query(CollectionV2).filter(CollectionV2.id == collection_id).first()
+    # Sources consultées (depuis les documents) en sous-requête de la
+    # même requête que la collecte
+    sources = select(
+        func.array_agg(distinct(SourceDocumentV2.url))
+    ).where(
+        SourceDocumentV2.collection_id == collection_id,
+        SourceDocumentV2.url.isnot(None)
+    ).scalar_subquery()
+
+    row = db.query(CollectionV2, sources).filter(CollectionV2.id == collection_id).first()
     
-    if not collection:
+    if not row:
         raise HTTPException(status_code=404, detail="Collecte non trouvée")
+    collection, source_urls = row
 
     # Logs récents (100 derniers)
     logs = db.query(CollectionLog).filter(
         CollectionLog.collection_id == collection_id
     ).order_by(desc(CollectionLog.ts)).limit(100).all()
 
-    # Sources consultées (depuis les documents)
-    from app.db.models.collections import SourceDocumentV2
-    sources = db.query(SourceDocumentV2.url).filter(
-        SourceDocumentV2.collection_id == collection_id,
-        SourceDocumentV2.url.isnot(None)
-    ).distinct().all()
-
-    response = _collection_to_response(collection, db)
-    
-    return CollectionDetailResponse(
-        **response.dict(),
-        logs=[CollectionLogSchema.from_orm(log) for log in logs],
-        sources_consulted=[s[0] for s in sources if s[0]],
-    )
+    # Same shape as CollectionDetailResponse, encoded without re-validation
+    return ORJSONResponse({
+        **_collection_to_response(collection, db).model_dump(),
+        "logs": [_log_to_dict(log) for log in logs],
+        "sources_consulted": [url for url in source_urls or [] if url],
+    })
 
 
 # ================================================================
 # GET /collections/{id}/logs - Logs paginés
 # ================================================================
 
-@router.get("/{collection_id}/logs")
+@router.get("/{collection_id}/logs", responses={200: {"model": CollectionLogPage}}, response_class=ORJSONResponse)
 def get_collection_logs(
     collection_id: UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor de la page précédente (pagination keyset)"),
     level: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -185,30 +187,24 @@ def get_collection_logs(
     if level:
         query = query.filter(CollectionLog.level == level.upper())
 
-    total = query.count()
-    
-    logs = query.order_by(desc(CollectionLog.ts)).offset(
-        (page - 1) * page_size
-    ).limit(page_size).all()
+    logs, meta = paginate(query, _LOG_KEYS, page, page_size, cursor)
 
-    return {
-        "items": [CollectionLogSchema.from_orm(log) for log in logs],
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "pages": math.ceil(total / page_size) if total > 0 else 0,
-    }
+    return ORJSONResponse({
+        "items": [_log_to_dict(log) for log in logs],
+        **meta,
+    })
 
 
 # ================================================================
 # GET /collections/{id}/results - Résultats (lead_items)
 # ================================================================
 
-@router.get("/{collection_id}/results")
+@router.get("/{collection_id}/results", responses={200: {"model": OpportunityPage}}, response_class=ORJSONResponse)
 def get_collection_results(
     collection_id: UUID,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor de la page précédente (pagination keyset)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -221,39 +217,60 @@ def get_collection_results(
         CollectionResult.collection_id == collection_id
     )
 
-    total = query.count()
-    
-    items = query.order_by(desc(LeadItem.score_base)).offset(
-        (page - 1) * page_size
-    ).limit(page_size).all()
+    items, meta = paginate(query, _RESULT_KEYS, page, page_size, cursor)
+    with_dossier = dossier_lead_ids(db, items)
 
-    return {
-        "items": [_lead_item_to_response(item, db) for item in items],
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-        "pages": math.ceil(total / page_size) if total > 0 else 0,
-    }
+    return ORJSONResponse({
+        "items": [
+            lead_item_to_response(item, db, item.id in with_dossier).model_dump()
+            for item in items
+        ],
+        **meta,
+    })
 
 
 # ================================================================
 # HELPERS
 # ================================================================
 
-def _collection_to_response(collection: CollectionV2, db: Session) -> CollectionResponse:
-    """Convertit un modèle Collection en réponse API"""
+# Clés de tri (décroissantes) pour la pagination keyset :
+# (expression SQL, conversion depuis le curseur)
+_COLLECTION_KEYS = ((CollectionV2.created_at, datetime.fromisoformat), (CollectionV2.id, UUID))
+_LOG_KEYS = ((CollectionLog.ts, datetime.fromisoformat), (CollectionLog.id, UUID))
+_RESULT_KEYS = ((func.coalesce(LeadItem.score_base, 0), int), (LeadItem.id, UUID))
+
+
+def _results_counts(db: Session, collections: List[CollectionV2]) -> dict:
+    """Nombre de résultats par collecte, en une seule requête GROUP BY"""
+    if not collections:
+        return {}
+    return dict(
+        db.query(CollectionResult.collection_id, func.count(CollectionResult.id)).filter(
+            CollectionResult.collection_id.in_([c.id for c in collections])
+        ).group_by(CollectionResult.collection_id).all()
+    )
+
+
+def _collection_to_response(
+    collection: CollectionV2,
+    db: Session,
+    results_count: Optional[int] = None,
+) -> CollectionResponse:
+    """Convertit un modèle Collection en réponse API (results_count compté si non fourni)"""
     # Compter les résultats
-    results_count = db.query(CollectionResult).filter(
-        CollectionResult.collection_id == collection.id
-    ).count()
+    if results_count is None:
+        results_count = db.query(CollectionResult).filter(
+            CollectionResult.collection_id == collection.id
+        ).count()
 
     # Stats
     stats = None
     if collection.stats:
         stats = CollectionStatsSchema(**collection.stats)
 
-    return CollectionResponse(
-        id=collection.id,
+    # model_construct: trusted DB values, no validation pass
+    return CollectionResponse.model_construct(
+        id=str(collection.id),
         type=collection.type,
         status=collection.status,
         name=collection.name,
@@ -268,41 +285,12 @@ def _collection_to_response(collection: CollectionV2, db: Session) -> Collection
     )
 
 
-def _lead_item_to_response(item: LeadItem, db: Session) -> OpportunityResponse:
-    """Convertit un LeadItem en réponse"""
-    from app.db.models.collections import DossierV2
-    
-    has_dossier = db.query(DossierV2).filter(
-        DossierV2.lead_item_id == item.id
-    ).first() is not None
-
-    return OpportunityResponse(
-        id=item.id,
-        title=item.title,
-        description=item.description,
-        organization_name=item.organization_name,
-        url_primary=item.url_primary,
-        source_name=item.source_name,
-        source_type=item.source_type,
-        published_at=item.published_at,
-        deadline_at=item.deadline_at,
-        location_city=item.location_city,
-        location_region=item.location_region,
-        budget_min=item.budget_min,
-        budget_max=item.budget_max,
-        budget_display=item.budget_display,
-        contact_email=item.contact_email,
-        contact_phone=item.contact_phone,
-        contact_url=item.contact_url,
-        contact_name=item.contact_name,
-        has_contact=item.has_contact,
-        has_deadline=item.has_deadline,
-        score_base=item.score_base or 0,
-        score_breakdown=item.score_breakdown,
-        status=item.status,
-        tags=item.tags,
-        assigned_to=item.assigned_to,
-        has_dossier=has_dossier,
-        created_at=item.created_at,
-        updated_at=item.updated_at,
-    )
+def _log_to_dict(log: CollectionLog) -> dict:
+    """Serialise un log (équivalent CollectionLogSchema)"""
+    return {
+        "id": str(log.id),
+        "ts": log.ts,
+        "level": log.level,
+        "message": log.message,
+        "context": log.context,
+    }
@@ -90,3 +90,20 @@ def get_current_admin_user(
             detail="Admin access required",
         )
     return current_user
+
+
+def require_superadmin(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    """
+    Get current user only if superuser.
+
+    The user lookup already opens the request's get_db session (cached, so
+    the endpoint reuses it); the 403 is raised before the endpoint body runs.
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Superadmin access required",
+        )
+    return current_user
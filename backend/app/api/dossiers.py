@@ -1,15 +1,21 @@
 """
 Dossier API endpoints
 """
+import hashlib
+from operator import attrgetter
 from typing import Optional, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import case, func, or_
 
 from app.api.deps import get_db, get_current_user
+from app.api.pagination import encode_cursor, keyset_filter
+from app.core.cache import cache_get, cache_set
 from app.db.models.user import User
 from app.db.models.opportunity import Opportunity
 from app.db.models.dossier import (
@@ -26,6 +32,25 @@ from app.workers.dossier_tasks import (
 
 router = APIRouter()
 
+# /stats/overview is polled by dashboards: serve it from Redis for a few seconds
+STATS_CACHE_KEY = "dossiers:stats"
+STATS_CACHE_TTL = 10
+
+# Number of missing fields, 0 when the JSON value is null/not an array
+# (json_array_length raises on scalars). Matches the predicate of the
+# ix_dossiers_missing_state_score partial index.
+MISSING_FIELDS_COUNT = case(
+    (func.json_typeof(Dossier.missing_fields) == 'array', func.json_array_length(Dossier.missing_fields)),
+    else_=0,
+)
+
+# score_final is nullable: NULL sorts and pages as 0 (as in the leads and
+# collections listings), matching ix_dossiers_score_id
+SCORE_FINAL = func.coalesce(Dossier.score_final, 0)
+
+# Keyset pagination keys of list_dossiers (column, parser for the cursor)
+DOSSIER_KEYS = ((SCORE_FINAL, int), (Dossier.id, UUID))
+
 
 # ============================================================================
 # SCHEMAS
@@ -156,11 +181,55 @@ class TaskResponse(BaseModel):
     message: str
 
 
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+# Columns copied as-is into DossierDetail. Datetimes are left to orjson, which
+# writes the same ISO 8601 string as isoformat() without a Python call per field.
+_DETAIL_FIELDS = (
+    "id", "opportunity_id", "summary_short", "summary_long", "gpt_model_used",
+    "processed_at", "enriched_at",
+)
+_get_detail_fields = attrgetter(*_DETAIL_FIELDS)
+
+
+def _detail_query(db: Session):
+    """Dossier query with its opportunity joined (read by _dossier_detail)"""
+    return db.query(Dossier).options(joinedload(Dossier.opportunity))
+
+
+def _dossier_detail(dossier: Dossier) -> dict:
+    """Serialize a dossier with its opportunity (same shape as DossierDetail)"""
+    opp = dossier.opportunity
+    detail = dict(zip(_DETAIL_FIELDS, _get_detail_fields(dossier)))
+    detail.update({
+        "state": dossier.state.value,
+        "key_points": dossier.key_points or [],
+        "action_checklist": dossier.action_checklist or [],
+        "extracted_fields": dossier.extracted_fields or {},
+        "confidence_plus": dossier.confidence_plus or 0,
+        "score_final": dossier.score_final or 0,
+        "quality_flags": dossier.quality_flags or [],
+        "missing_fields": dossier.missing_fields or [],
+        "sources_used": dossier.sources_used or [],
+        "tokens_used": dossier.tokens_used or 0,
+        "processing_time_ms": dossier.processing_time_ms or 0,
+        "created_at": dossier.created_at or "",
+        "updated_at": dossier.updated_at or "",
+        "opportunity_title": opp.title if opp else "Unknown",
+        "opportunity_url": opp.url_primary if opp else None,
+        "opportunity_organization": opp.organization if opp else None,
+        "opportunity_score_base": opp.score if opp else 0,
+    })
+    return detail
+
+
 # ============================================================================
 # DOSSIER ENDPOINTS
 # ============================================================================
 
-@router.get("/", response_model=List[DossierSummary])
+@router.get("/", responses={200: {"model": List[DossierSummary]}})
 async def list_dossiers(
     state: Optional[str] = Query(None, description="Filter by state"),
     q: Optional[str] = Query(None, description="Search in title/summary"),
@@ -168,10 +237,16 @@ async def list_dossiers(
     has_missing_fields: Optional[bool] = Query(None, description="Only with missing fields"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page (keyset pagination)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """List dossiers with filters"""
+    """
+    List dossiers with filters.
+
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the
+    next page without OFFSET; `skip` is kept for random access.
+    """
     query = db.query(Dossier).join(Opportunity)
     
     # Filter by state
@@ -199,122 +274,92 @@ async def list_dossiers(
     
     # Missing fields filter
     if has_missing_fields is True:
-        # JSON array not empty check varies by DB, using cast for postgres
-        query = query.filter(Dossier.missing_fields != [])
+        # Same expression as the ix_dossiers_missing_state_score partial index
+        query = query.filter(MISSING_FIELDS_COUNT > 0)
     elif has_missing_fields is False:
-        query = query.filter(Dossier.missing_fields == [])
-    
-    # Order by score_final desc
-    query = query.order_by(Dossier.score_final.desc())
-    
-    # Pagination
-    dossiers = query.offset(skip).limit(limit).all()
-    
-    return [
-        DossierSummary(
-            id=d.id,
-            opportunity_id=d.opportunity_id,
-            opportunity_title=d.opportunity.title if d.opportunity else "Unknown",
-            state=d.state.value,
-            summary_short=d.summary_short,
-            confidence_plus=d.confidence_plus or 0,
-            score_final=d.score_final or 0,
-            quality_flags=d.quality_flags or [],
-            missing_fields=d.missing_fields or [],
-            created_at=d.created_at.isoformat() if d.created_at else "",
-            updated_at=d.updated_at.isoformat() if d.updated_at else "",
-        )
+        query = query.filter(MISSING_FIELDS_COUNT == 0)
+    
+    # Order by score_final desc, id breaks ties so the cursor is stable
+    query = query.order_by(SCORE_FINAL.desc(), Dossier.id.desc())
+    
+    # Pagination: keyset when a cursor is given, OFFSET otherwise
+    if cursor:
+        query = query.filter(keyset_filter(DOSSIER_KEYS, cursor))
+    else:
+        query = query.offset(skip)
+    
+    # Only the DossierSummary columns, as plain rows (no ORM hydration)
+    dossiers = query.with_entities(
+        Dossier.id,
+        Dossier.opportunity_id,
+        Opportunity.title.label("opportunity_title"),
+        Dossier.state,
+        Dossier.summary_short,
+        Dossier.confidence_plus,
+        SCORE_FINAL.label("score_final"),
+        Dossier.quality_flags,
+        Dossier.missing_fields,
+        Dossier.created_at,
+        Dossier.updated_at,
+    ).limit(limit + 1).all()
+    
+    headers = {}
+    if len(dossiers) > limit:
+        dossiers = dossiers[:limit]
+        headers["X-Next-Cursor"] = encode_cursor((dossiers[-1].score_final, dossiers[-1].id))
+    
+    # Same shape as DossierSummary, encoded by orjson without re-validation
+    return ORJSONResponse([
+        {
+            "id": d.id,
+            "opportunity_id": d.opportunity_id,
+            "opportunity_title": d.opportunity_title or "Unknown",
+            "state": d.state.value,
+            "summary_short": d.summary_short,
+            "confidence_plus": d.confidence_plus or 0,
+            "score_final": d.score_final,
+            "quality_flags": d.quality_flags or [],
+            "missing_fields": d.missing_fields or [],
+            "created_at": d.created_at or "",
+            "updated_at": d.updated_at or "",
+        }
         for d in dossiers
-    ]
+    ], headers=headers)
 
 
-@router.get("/{dossier_id}", response_model=DossierDetail)
+@router.get("/{dossier_id}", responses={200: {"model": DossierDetail}})
 async def get_dossier(
     dossier_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get full dossier details"""
-    dossier = db.query(Dossier).filter(Dossier.id == dossier_id).first()
+    dossier = _detail_query(db).filter(Dossier.id == dossier_id).first()
     
     if not dossier:
         raise HTTPException(404, "Dossier not found")
     
-    opp = dossier.opportunity
-    
-    return DossierDetail(
-        id=dossier.id,
-        opportunity_id=dossier.opportunity_id,
-        state=dossier.state.value,
-        summary_short=dossier.summary_short,
-        summary_long=dossier.summary_long,
-        key_points=dossier.key_points or [],
-        action_checklist=dossier.action_checklist or [],
-        extracted_fields=dossier.extracted_fields or {},
-        confidence_plus=dossier.confidence_plus or 0,
-        score_final=dossier.score_final or 0,
-        quality_flags=dossier.quality_flags or [],
-        missing_fields=dossier.missing_fields or [],
-        sources_used=dossier.sources_used or [],
-        gpt_model_used=dossier.gpt_model_used,
-        tokens_used=dossier.tokens_used or 0,
-        processing_time_ms=dossier.processing_time_ms or 0,
-        created_at=dossier.created_at.isoformat() if dossier.created_at else "",
-        updated_at=dossier.updated_at.isoformat() if dossier.updated_at else "",
-        processed_at=dossier.processed_at.isoformat() if dossier.processed_at else None,
-        enriched_at=dossier.enriched_at.isoformat() if dossier.enriched_at else None,
-        opportunity_title=opp.title if opp else "Unknown",
-        opportunity_url=opp.url_primary if opp else None,
-        opportunity_organization=opp.organization if opp else None,
-        opportunity_score_base=opp.score if opp else 0,
-    )
+    return ORJSONResponse(_dossier_detail(dossier))
 
 
-@router.get("/by-opportunity/{opportunity_id}", response_model=DossierDetail)
+@router.get("/by-opportunity/{opportunity_id}", responses={200: {"model": DossierDetail}})
 async def get_dossier_by_opportunity(
     opportunity_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get dossier for a specific opportunity"""
-    dossier = db.query(Dossier).filter(
+    dossier = _detail_query(db).filter(
         Dossier.opportunity_id == opportunity_id
     ).first()
     
     if not dossier:
         raise HTTPException(404, "No dossier found for this opportunity")
     
-    opp = dossier.opportunity
-    
-    return DossierDetail(
-        id=dossier.id,
-        opportunity_id=dossier.opportunity_id,
-        state=dossier.state.value,
-        summary_short=dossier.summary_short,
-        summary_long=dossier.summary_long,
-        key_points=dossier.key_points or [],
-        action_checklist=dossier.action_checklist or [],
-        extracted_fields=dossier.extracted_fields or {},
-        confidence_plus=dossier.confidence_plus or 0,
-        score_final=dossier.score_final or 0,
-        quality_flags=dossier.quality_flags or [],
-        missing_fields=dossier.missing_fields or [],
-        sources_used=dossier.sources_used or [],
-        gpt_model_used=dossier.gpt_model_used,
-        tokens_used=dossier.tokens_used or 0,
-        processing_time_ms=dossier.processing_time_ms or 0,
-        created_at=dossier.created_at.isoformat() if dossier.created_at else "",
-        updated_at=dossier.updated_at.isoformat() if dossier.updated_at else "",
-        processed_at=dossier.processed_at.isoformat() if dossier.processed_at else None,
-        enriched_at=dossier.enriched_at.isoformat() if dossier.enriched_at else None,
-        opportunity_title=opp.title if opp else "Unknown",
-        opportunity_url=opp.url_primary if opp else None,
-        opportunity_organization=opp.organization if opp else None,
-        opportunity_score_base=opp.score if opp else 0,
-    )
+    return ORJSONResponse(_dossier_detail(dossier))
 
 
-@router.get("/{dossier_id}/evidence", response_model=List[EvidenceItem])
+@router.get("/{dossier_id}/evidence", responses={200: {"model": List[EvidenceItem]}})
 async def get_dossier_evidence(
     dossier_id: UUID,
     field_key: Optional[str] = Query(None, description="Filter by field"),
@@ -331,56 +376,66 @@ async def get_dossier_evidence(
     
     evidence = query.order_by(DossierEvidence.confidence.desc()).all()
     
-    return [
-        EvidenceItem(
-            id=e.id,
-            field_key=e.field_key,
-            value=e.value,
-            provenance=e.provenance.value if e.provenance else "UNKNOWN",
-            evidence_type=e.evidence_type.value if e.evidence_type else "UNKNOWN",
-            evidence_ref=e.evidence_ref,
-            evidence_snippet=e.evidence_snippet,
-            confidence=e.confidence or 0,
-            source_url=e.source_url,
-            retrieved_at=e.retrieved_at.isoformat() if e.retrieved_at else None,
-            retrieval_method=e.retrieval_method,
-            created_at=e.created_at.isoformat() if e.created_at else "",
-        )
+    # Same shape as EvidenceItem, encoded by orjson without re-validation
+    return ORJSONResponse([
+        {
+            "id": e.id,
+            "field_key": e.field_key,
+            "value": e.value,
+            "provenance": e.provenance.value if e.provenance else "UNKNOWN",
+            "evidence_type": e.evidence_type.value if e.evidence_type else "UNKNOWN",
+            "evidence_ref": e.evidence_ref,
+            "evidence_snippet": e.evidence_snippet,
+            "confidence": e.confidence or 0,
+            "source_url": e.source_url,
+            "retrieved_at": e.retrieved_at,
+            "retrieval_method": e.retrieval_method,
+            "created_at": e.created_at or "",
+        }
         for e in evidence
-    ]
+    ])
 
 
-@router.get("/{dossier_id}/sources", response_model=List[SourceDocumentItem])
+@router.get("/{dossier_id}/sources", responses={200: {"model": List[SourceDocumentItem]}})
 async def get_dossier_sources(
     dossier_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get source documents used for a dossier"""
-    dossier = db.query(Dossier).filter(Dossier.id == dossier_id).first()
+    opportunity_id = db.query(Dossier.opportunity_id).filter(Dossier.id == dossier_id).scalar()
     
-    if not dossier:
+    if opportunity_id is None:
         raise HTTPException(404, "Dossier not found")
     
-    # Get source documents for the opportunity
-    docs = db.query(SourceDocument).filter(
-        SourceDocument.opportunity_id == dossier.opportunity_id
+    # Get source documents for the opportunity; the preview is cut by
+    # Postgres so the full raw_text never leaves the database
+    docs = db.query(
+        SourceDocument.id,
+        SourceDocument.doc_type,
+        SourceDocument.source_url,
+        SourceDocument.fetched_at,
+        SourceDocument.created_at,
+        func.nullif(func.left(SourceDocument.raw_text, 500), "").label("raw_text_preview"),
+    ).filter(
+        SourceDocument.opportunity_id == opportunity_id
     ).order_by(SourceDocument.created_at.desc()).all()
     
-    return [
-        SourceDocumentItem(
-            id=d.id,
-            doc_type=d.doc_type.value if d.doc_type else "UNKNOWN",
-            source_url=d.source_url,
-            fetched_at=d.fetched_at.isoformat() if d.fetched_at else None,
-            created_at=d.created_at.isoformat() if d.created_at else "",
-            raw_text_preview=d.raw_text[:500] if d.raw_text else None,
-        )
+    # Same shape as SourceDocumentItem, encoded by orjson without re-validation
+    return ORJSONResponse([
+        {
+            "id": d.id,
+            "doc_type": d.doc_type.value if d.doc_type else "UNKNOWN",
+            "source_url": d.source_url,
+            "fetched_at": d.fetched_at,
+            "created_at": d.created_at or "",
+            "raw_text_preview": d.raw_text_preview,
+        }
         for d in docs
-    ]
+    ])
 
 
-@router.get("/{dossier_id}/enrichments", response_model=List[EnrichmentRunItem])
+@router.get("/{dossier_id}/enrichments", responses={200: {"model": List[EnrichmentRunItem]}})
 async def get_dossier_enrichments(
     dossier_id: UUID,
     db: Session = Depends(get_db),
@@ -391,21 +446,22 @@ async def get_dossier_enrichments(
         WebEnrichmentRun.dossier_id == dossier_id
     ).order_by(WebEnrichmentRun.started_at.desc()).all()
     
-    return [
-        EnrichmentRunItem(
-            id=r.id,
-            status=r.status,
-            target_fields=r.target_fields or [],
-            fields_found=r.fields_found or [],
-            fields_not_found=r.fields_not_found or [],
-            urls_consulted=r.urls_consulted or [],
-            started_at=r.started_at.isoformat() if r.started_at else "",
-            completed_at=r.completed_at.isoformat() if r.completed_at else None,
-            duration_ms=r.duration_ms,
-            errors=r.errors or [],
-        )
+    # Same shape as EnrichmentRunItem, encoded by orjson without re-validation
+    return ORJSONResponse([
+        {
+            "id": r.id,
+            "status": r.status,
+            "target_fields": r.target_fields or [],
+            "fields_found": r.fields_found or [],
+            "fields_not_found": r.fields_not_found or [],
+            "urls_consulted": r.urls_consulted or [],
+            "started_at": r.started_at or "",
+            "completed_at": r.completed_at,
+            "duration_ms": r.duration_ms,
+            "errors": r.errors or [],
+        }
         for r in runs
-    ]
+    ])
 
 
 @router.delete("/{dossier_id}")
@@ -510,48 +566,21 @@ async def full_pipeline_opportunity(
     )
 
 
-@router.get("/opportunities/{opportunity_id}/dossier", response_model=DossierDetail)
+@router.get("/opportunities/{opportunity_id}/dossier", responses={200: {"model": DossierDetail}})
 async def get_opportunity_dossier(
     opportunity_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get dossier for an opportunity"""
-    dossier = db.query(Dossier).filter(
+    dossier = _detail_query(db).filter(
         Dossier.opportunity_id == opportunity_id
     ).first()
     
     if not dossier:
         raise HTTPException(404, "Dossier not found for this opportunity")
     
-    opp = dossier.opportunity
-    
-    return DossierDetail(
-        id=dossier.id,
-        opportunity_id=dossier.opportunity_id,
-        state=dossier.state.value,
-        summary_short=dossier.summary_short,
-        summary_long=dossier.summary_long,
-        key_points=dossier.key_points or [],
-        action_checklist=dossier.action_checklist or [],
-        extracted_fields=dossier.extracted_fields or {},
-        confidence_plus=dossier.confidence_plus or 0,
-        score_final=dossier.score_final or 0,
-        quality_flags=dossier.quality_flags or [],
-        missing_fields=dossier.missing_fields or [],
-        sources_used=dossier.sources_used or [],
-        gpt_model_used=dossier.gpt_model_used,
-        tokens_used=dossier.tokens_used or 0,
-        processing_time_ms=dossier.processing_time_ms or 0,
-        created_at=dossier.created_at.isoformat() if dossier.created_at else "",
-        updated_at=dossier.updated_at.isoformat() if dossier.updated_at else "",
-        processed_at=dossier.processed_at.isoformat() if dossier.processed_at else None,
-        enriched_at=dossier.enriched_at.isoformat() if dossier.enriched_at else None,
-        opportunity_title=opp.title if opp else "Unknown",
-        opportunity_url=opp.url_primary if opp else None,
-        opportunity_organization=opp.organization if opp else None,
-        opportunity_score_base=opp.score if opp else 0,
-    )
+    return ORJSONResponse(_dossier_detail(dossier))
 
 
 # ============================================================================
@@ -565,7 +594,16 @@ async def batch_build_dossiers(
     current_user: User = Depends(get_current_user),
 ):
     """Build dossiers for multiple opportunities"""
-    # Validate opportunities exist
+    # Validate opportunities exist (one IN query for the whole batch)
+    existing = {
+        oid for (oid,) in db.query(Opportunity.id).filter(
+            Opportunity.id.in_(request.opportunity_ids)
+        ).all()
+    }
+    missing = [str(oid) for oid in request.opportunity_ids if oid not in existing]
+    if missing:
+        raise HTTPException(400, {"unknown_ids": missing})
+    
     opp_ids = [str(oid) for oid in request.opportunity_ids]
     
     task = batch_build_dossiers_task.delay(
@@ -586,29 +624,42 @@ async def batch_build_dossiers(
 
 @router.get("/stats/overview")
 async def get_dossier_stats(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get dossier statistics"""
-    from sqlalchemy import func, cast, Text
-    
-    total = db.query(Dossier).count()
-    ready = db.query(Dossier).filter(Dossier.state == DossierState.READY).count()
-    processing = db.query(Dossier).filter(Dossier.state == DossierState.PROCESSING).count()
-    failed = db.query(Dossier).filter(Dossier.state == DossierState.FAILED).count()
-    
-    # Count with missing fields (cast JSON to text for comparison)
-    with_missing = db.query(Dossier).filter(
-        Dossier.state == DossierState.READY,
-        cast(Dossier.missing_fields, Text) != '[]',
-        cast(Dossier.missing_fields, Text) != 'null',
-        Dossier.missing_fields.isnot(None)
-    ).count()
-    
-    # Average confidence
-    avg_confidence = db.query(func.avg(Dossier.confidence_plus)).filter(
-        Dossier.state == DossierState.READY
-    ).scalar() or 0
+    """Get dossier statistics (cached a few seconds, dashboards poll it)"""
+    stats = cache_get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = _compute_dossier_stats(db)
+        cache_set(STATS_CACHE_KEY, stats, STATS_CACHE_TTL)
+    
+    # Same stats -> same ETag, so browser revalidation gets an empty 304
+    etag = '"%s"' % hashlib.md5(orjson.dumps(stats, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={STATS_CACHE_TTL}, stale-while-revalidate=30",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(stats, headers=headers)
+
+
+def _compute_dossier_stats(db: Session) -> dict:
+    """Dossier counters, all from one aggregate query"""
+    ready_filter = Dossier.state == DossierState.READY
+    
+    # All counters in one pass over dossiers (conditional aggregation)
+    total, ready, processing, failed, with_missing, avg_confidence = db.query(
+        func.count(Dossier.id),
+        func.count(Dossier.id).filter(ready_filter),
+        func.count(Dossier.id).filter(Dossier.state == DossierState.PROCESSING),
+        func.count(Dossier.id).filter(Dossier.state == DossierState.FAILED),
+        # Ready with missing fields
+        func.count(Dossier.id).filter(ready_filter, MISSING_FIELDS_COUNT > 0),
+        func.avg(Dossier.confidence_plus).filter(ready_filter),
+    ).one()
+    avg_confidence = float(avg_confidence or 0)
     
     return {
         "total": total,
@@ -12,11 +12,12 @@ GET /dossiers/{id}/evidence - Liste des evidence d'un dossier
 from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
-import math
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, func
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.db import get_db
 from app.db.models.user import User
@@ -24,12 +25,15 @@ from app.db.models.collections import (
     DossierV2, LeadItem, LeadItemKind, Evidence, SourceDocumentV2, DossierState
 )
 from app.api.deps import get_current_user
+from app.api.pagination import paginate
+from app.api.serializers import DOCUMENT_JSON, EVIDENCE_JSON
 from app.schemas.collections import (
     DossierResponse, DossierDetailResponse, DossierListResponse,
     CreateDossierRequest, DossierUpdateRequest,
-    EvidenceSchema, SourceDocumentSchema, DossierStateEnum, DossierObjectiveEnum
+    EvidenceSchema, DossierStateEnum, DossierObjectiveEnum
 )
 from app.workers.collection_pipeline import run_dossier_builder_task
+from app.workers.outbox import dispatch_in_background, enqueue_task
 
 router = APIRouter(prefix="/dossiers", tags=["Dossiers"])
 
@@ -38,12 +42,13 @@ router = APIRouter(prefix="/dossiers", tags=["Dossiers"])
 # GET /dossiers - Liste des dossiers
 # ================================================================
 
-@router.get("", response_model=DossierListResponse)
-@router.get("/", response_model=DossierListResponse)
+@router.get("", responses={200: {"model": DossierListResponse}})
+@router.get("/", responses={200: {"model": DossierListResponse}})
 def list_dossiers(
     # Pagination
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor de la page précédente (pagination keyset)"),
     # Tri
     sort_by: str = Query("updated_at", regex="^(updated_at|created_at|quality_score)$"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
@@ -80,9 +85,9 @@ def list_dossiers(
 
     # Recherche texte (via lead_item)
     if search:
-        search_term = f"%{search.lower()}%"
+        # ILIKE sur la colonne brute : servi par l'index trigram (pas lower())
         lead_ids = db.query(LeadItem.id).filter(
-            func.lower(LeadItem.title).like(search_term)
+            LeadItem.title.ilike(f"%{search}%")
         ).subquery()
         query = query.filter(DossierV2.lead_item_id.in_(lead_ids))
 
@@ -92,71 +97,74 @@ def list_dossiers(
 
     # Entity name (JSONB search)
     if entity_name:
-        # Recherche dans target_entities JSONB - cast en texte pour recherche
-        from sqlalchemy.dialects.postgresql import TEXT
+        # Recherche dans target_entities JSONB - cast en texte, même expression
+        # que l'index trigram ix_dossiers_v2_target_entities_trgm
         query = query.filter(
-            func.cast(DossierV2.target_entities, TEXT).ilike(f'%{entity_name}%')
+            cast(DossierV2.target_entities, Text).ilike(f'%{entity_name}%')
         )
 
-    # ===== COMPTE TOTAL =====
-    total = query.count()
-
-    # ===== TRI =====
-    sort_column = getattr(DossierV2, sort_by, DossierV2.updated_at)
-    if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
-    else:
-        query = query.order_by(asc(sort_column))
-
-    # ===== PAGINATION =====
-    dossiers = query.offset((page - 1) * page_size).limit(page_size).all()
-
-    # Convert to response
-    items = []
-    for dossier in dossiers:
-        lead_item = db.query(LeadItem).filter(LeadItem.id == dossier.lead_item_id).first()
-        items.append(_dossier_to_response(dossier, lead_item, db))
-
-    return DossierListResponse(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        pages=math.ceil(total / page_size) if total > 0 else 0,
+    # ===== TRI + PAGINATION =====
+    # Keyset sur (tri, id) quand un curseur est fourni, sinon page + COUNT(*) OVER()
+    dossiers, meta = paginate(
+        query.options(selectinload(DossierV2.lead_item)),  # lead items en une requête IN (...)
+        _DOSSIER_SORT_KEYS[sort_by], page, page_size, cursor,
+        descending=sort_order == "desc",
     )
 
+    # Nombre d'evidence par dossier en une seule requête GROUP BY
+    evidence_counts = dict(
+        db.query(Evidence.dossier_id, func.count(Evidence.id)).filter(
+            Evidence.dossier_id.in_([d.id for d in dossiers])
+        ).group_by(Evidence.dossier_id).all()
+    ) if dossiers else {}
+
+    # Rows come from the DB: skip response_model re-validation and encode directly
+    return ORJSONResponse({
+        "items": [
+            _dossier_to_response(
+                dossier, dossier.lead_item, db,
+                evidence_count=evidence_counts.get(dossier.id, 0),
+            ).model_dump()
+            for dossier in dossiers
+        ],
+        **meta,
+    })
+
 
 # ================================================================
 # GET /dossiers/{id} - Détail d'un dossier
 # ================================================================
 
-@router.get("/{dossier_id}", response_model=DossierDetailResponse)
+@router.get("/{dossier_id}", responses={200: {"model": DossierDetailResponse}})
 def get_dossier(
     dossier_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Détail complet d'un dossier avec evidence et sections"""
-    dossier = db.query(DossierV2).filter(DossierV2.id == dossier_id).first()
-
-    if not dossier:
-        raise HTTPException(status_code=404, detail="Dossier non trouvé")
+    # Lead item joint, evidence et documents agrégés en JSON par sous-requête :
+    # tout le détail arrive en un seul aller-retour vers la base
+    evidence = select(func.json_agg(EVIDENCE_JSON)).where(
+        Evidence.dossier_id == dossier_id
+    ).scalar_subquery()
+    documents = select(func.json_agg(DOCUMENT_JSON)).where(
+        SourceDocumentV2.dossier_id == dossier_id
+    ).scalar_subquery()
 
-    lead_item = db.query(LeadItem).filter(LeadItem.id == dossier.lead_item_id).first()
+    row = db.query(DossierV2, evidence, documents).options(
+        joinedload(DossierV2.lead_item)
+    ).filter(DossierV2.id == dossier_id).first()
 
-    # Evidence
-    evidence = db.query(Evidence).filter(
-        Evidence.dossier_id == dossier_id
-    ).all()
+    if not row:
+        raise HTTPException(status_code=404, detail="Dossier non trouvé")
+    dossier, evidence, documents = row
 
-    # Documents sources
-    documents = db.query(SourceDocumentV2).filter(
-        SourceDocumentV2.dossier_id == dossier_id
-    ).all()
+    lead_item = dossier.lead_item
 
-    return DossierDetailResponse(
-        id=dossier.id,
-        lead_item_id=dossier.lead_item_id,
+    # model_construct: trusted DB values, no validation pass
+    return ORJSONResponse(DossierDetailResponse.model_construct(
+        id=str(dossier.id),
+        lead_item_id=str(dossier.lead_item_id),
         lead_item_title=lead_item.title if lead_item else None,
         lead_item_url=lead_item.url_primary if lead_item else None,
         objective=dossier.objective,
@@ -174,9 +182,10 @@ def get_dossier(
         error_message=dossier.error_message,
         created_at=dossier.created_at,
         updated_at=dossier.updated_at,
-        evidence=[EvidenceSchema.from_orm(e) for e in evidence],
-        source_documents=[SourceDocumentSchema.from_orm(d) for d in documents],
-    )
+    ).model_dump() | {
+        "evidence": evidence or [],
+        "source_documents": documents or [],
+    })
 
 
 # ================================================================
@@ -187,6 +196,7 @@ def get_dossier(
 @router.post("/", response_model=DossierResponse)
 def create_dossier(
     request: CreateDossierRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -199,6 +209,7 @@ def create_dossier(
     - Depuis un texte brut (crée un lead_item temporaire)
     """
     lead_item_id = request.lead_item_id
+    lead_item = None
 
     # Si pas de lead_item_id, créer un lead_item temporaire
     if not lead_item_id:
@@ -221,32 +232,34 @@ def create_dossier(
         db.flush()
         lead_item_id = lead_item.id
 
-    # Vérifier si dossier existe déjà
-    existing = db.query(DossierV2).filter(
-        DossierV2.lead_item_id == lead_item_id
-    ).first()
+    # Créer le dossier : l'unicité de lead_item_id est vérifiée par la base,
+    # RETURNING vide = un dossier existe déjà (un seul aller-retour, sans course)
+    entities = [{"name": e, "type": "ORGANIZATION"} for e in (request.target_entities or [])]
 
-    if existing:
+    dossier = db.scalars(
+        pg_insert(DossierV2).values(
+            lead_item_id=lead_item_id,
+            objective=request.objective.value,
+            target_entities=entities,
+            state=DossierState.PENDING.value,
+        ).on_conflict_do_nothing(
+            index_elements=[DossierV2.lead_item_id]
+        ).returning(DossierV2)
+    ).one_or_none()
+
+    if dossier is None:
         raise HTTPException(status_code=400, detail="Un dossier existe déjà pour ce lead_item")
 
-    # Créer le dossier
-    entities = [{"name": e, "type": "ORGANIZATION"} for e in (request.target_entities or [])]
-
-    dossier = DossierV2(
-        lead_item_id=lead_item_id,
-        objective=request.objective.value,
-        target_entities=entities,
-        state=DossierState.PENDING.value,
-    )
-    db.add(dossier)
+    # Tâche d'enrichissement enregistrée avec le dossier, envoyée au broker
+    # après la réponse
+    task_id = enqueue_task(db, run_dossier_builder_task, dossier_id=str(dossier.id))
     db.commit()
-    db.refresh(dossier)
-
-    # Lancer la tâche d'enrichissement
-    run_dossier_builder_task.delay(str(dossier.id))
+    background_tasks.add_task(dispatch_in_background, [task_id])
 
-    lead_item = db.query(LeadItem).filter(LeadItem.id == lead_item_id).first()
-    return _dossier_to_response(dossier, lead_item, db)
+    # Lead item temporaire : déjà chargé. Lead item existant : un SELECT par clé
+    if lead_item is None:
+        lead_item = db.get(LeadItem, lead_item_id)
+    return _dossier_to_response(dossier, lead_item, db, evidence_count=0)
 
 
 # ================================================================
@@ -261,10 +274,17 @@ def update_dossier(
     current_user: User = Depends(get_current_user),
 ):
     """Mettre à jour un dossier (sections, target_entities)"""
-    dossier = db.query(DossierV2).filter(DossierV2.id == dossier_id).first()
-
-    if not dossier:
+    # Dossier, lead item et nombre d'evidence en une seule requête
+    evidence_count = select(func.count(Evidence.id)).where(
+        Evidence.dossier_id == DossierV2.id
+    ).scalar_subquery()
+    row = db.query(DossierV2, evidence_count).options(
+        joinedload(DossierV2.lead_item)
+    ).filter(DossierV2.id == dossier_id).first()
+
+    if not row:
         raise HTTPException(status_code=404, detail="Dossier non trouvé")
+    dossier, evidence_count = row
 
     if request.target_entities is not None:
         entities = [{"name": e, "type": "ORGANIZATION"} for e in request.target_entities]
@@ -283,10 +303,8 @@ def update_dossier(
         dossier.recommendations = request.recommendations
 
     db.commit()
-    db.refresh(dossier)
 
-    lead_item = db.query(LeadItem).filter(LeadItem.id == dossier.lead_item_id).first()
-    return _dossier_to_response(dossier, lead_item, db)
+    return _dossier_to_response(dossier, dossier.lead_item, db, evidence_count=evidence_count)
 
 
 # ================================================================
@@ -300,19 +318,13 @@ def delete_dossier(
     current_user: User = Depends(get_current_user),
 ):
     """Supprimer un dossier et son evidence"""
-    dossier = db.query(DossierV2).filter(DossierV2.id == dossier_id).first()
+    # Un seul DELETE : evidence et documents suivent par ON DELETE CASCADE
+    deleted = db.query(DossierV2).filter(
+        DossierV2.id == dossier_id
+    ).delete(synchronize_session=False)
 
-    if not dossier:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Dossier non trouvé")
-
-    # Supprimer evidence
-    db.query(Evidence).filter(Evidence.dossier_id == dossier_id).delete()
-
-    # Supprimer documents
-    db.query(SourceDocumentV2).filter(SourceDocumentV2.dossier_id == dossier_id).delete()
-
-    # Supprimer dossier
-    db.delete(dossier)
     db.commit()
 
     return {"message": "Dossier supprimé"}
@@ -325,6 +337,7 @@ def delete_dossier(
 @router.post("/{dossier_id}/regenerate")
 def regenerate_dossier(
     dossier_id: UUID,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -348,10 +361,10 @@ def regenerate_dossier(
     # Supprimer ancienne evidence
     db.query(Evidence).filter(Evidence.dossier_id == dossier_id).delete()
 
+    # Relancer la tâche (envoyée au broker après la réponse)
+    task_id = enqueue_task(db, run_dossier_builder_task, dossier_id=str(dossier_id))
     db.commit()
-
-    # Relancer la tâche
-    run_dossier_builder_task.delay(str(dossier_id))
+    background_tasks.add_task(dispatch_in_background, [task_id])
 
     return {"message": "Régénération lancée", "dossier_id": str(dossier_id)}
 
@@ -360,7 +373,7 @@ def regenerate_dossier(
 # GET /dossiers/{id}/evidence - Evidence d'un dossier
 # ================================================================
 
-@router.get("/{dossier_id}/evidence", response_model=List[EvidenceSchema])
+@router.get("/{dossier_id}/evidence", responses={200: {"model": List[EvidenceSchema]}})
 def get_dossier_evidence(
     dossier_id: UUID,
     db: Session = Depends(get_db),
@@ -376,22 +389,38 @@ def get_dossier_evidence(
         Evidence.dossier_id == dossier_id
     ).all()
 
-    return [EvidenceSchema.from_orm(e) for e in evidence]
+    return ORJSONResponse([_evidence_to_schema(e).model_dump() for e in evidence])
 
 
 # ================================================================
 # HELPERS
 # ================================================================
 
-def _dossier_to_response(dossier: DossierV2, lead_item: Optional[LeadItem], db: Session) -> DossierResponse:
-    """Convertit un DossierV2 en réponse"""
-    evidence_count = db.query(func.count(Evidence.id)).filter(
-        Evidence.dossier_id == dossier.id
-    ).scalar() or 0
-
-    return DossierResponse(
-        id=dossier.id,
-        lead_item_id=dossier.lead_item_id,
+# Clés de tri pour la pagination (expression SQL, conversion depuis le curseur),
+# id en dernier pour départager les égalités
+_DOSSIER_SORT_KEYS = {
+    "updated_at": ((DossierV2.updated_at, datetime.fromisoformat), (DossierV2.id, UUID)),
+    "created_at": ((DossierV2.created_at, datetime.fromisoformat), (DossierV2.id, UUID)),
+    "quality_score": ((func.coalesce(DossierV2.quality_score, 0), int), (DossierV2.id, UUID)),
+}
+
+
+def _dossier_to_response(
+    dossier: DossierV2,
+    lead_item: Optional[LeadItem],
+    db: Session,
+    evidence_count: Optional[int] = None,
+) -> DossierResponse:
+    """Convertit un DossierV2 en réponse (evidence_count compté si non fourni)"""
+    if evidence_count is None:
+        evidence_count = db.query(func.count(Evidence.id)).filter(
+            Evidence.dossier_id == dossier.id
+        ).scalar() or 0
+
+    # model_construct: trusted DB values, no validation pass
+    return DossierResponse.model_construct(
+        id=str(dossier.id),
+        lead_item_id=str(dossier.lead_item_id),
         lead_item_title=lead_item.title if lead_item else None,
         lead_item_url=lead_item.url_primary if lead_item else None,
         objective=dossier.objective,
@@ -403,3 +432,15 @@ def _dossier_to_response(dossier: DossierV2, lead_item: Optional[LeadItem], db:
         created_at=dossier.created_at,
         updated_at=dossier.updated_at,
     )
+
+
+def _evidence_to_schema(evidence: Evidence) -> EvidenceSchema:
+    """Evidence -> EvidenceSchema (confiance 0-1 ramenée en pourcentage)"""
+    return EvidenceSchema.model_construct(
+        field_key=evidence.field_name,
+        value=evidence.value,
+        source_url=evidence.url,
+        snippet=evidence.quote,
+        confidence=round(evidence.confidence * 100) if evidence.confidence is not None else 100,
+        provenance=evidence.provenance,
+    )
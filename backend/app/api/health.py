@@ -1,8 +1,13 @@
 # /api/health endpoint for monitoring and deployment checks
 from fastapi import APIRouter
-from datetime import datetime
+from datetime import datetime, timezone
 import os
 
+from sqlalchemy import text
+
+from app.core.cache import redis_client
+from app.db.session import SessionLocal
+
 router = APIRouter()
 
 @router.get("/health")
@@ -17,25 +22,22 @@ async def health_check():
     """
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "version": os.getenv("APP_VERSION", "1.0.0"),
         "environment": os.getenv("ENVIRONMENT", "production")
     }
 
 @router.get("/health/detailed")
-async def detailed_health_check():
+def detailed_health_check():
     """
     Detailed health check with service status.
     Used for debugging and monitoring dashboards.
+    Sync: the DB and Redis checks block, so it runs in the threadpool.
     """
-    from app.db.session import SessionLocal
-    from sqlalchemy import text
-    import redis
-    
     checks = {
         "database": False,
         "redis": False,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
     
     # Database check
@@ -47,11 +49,9 @@ async def detailed_health_check():
     except Exception as e:
         checks["database_error"] = str(e)
     
-    # Redis check
+    # Redis check (shared pooled client: no new connection per probe)
     try:
-        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        r = redis.from_url(redis_url)
-        r.ping()
+        redis_client.ping()
         checks["redis"] = True
     except Exception as e:
         checks["redis_error"] = str(e)
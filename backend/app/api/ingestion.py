@@ -236,20 +236,24 @@ def get_task_status(
     current_user: User = Depends(get_current_user),
 ):
     """Get the status and result of an async task (intelligent search, artist analysis, etc.)"""
+    from celery import states
     from app.workers.celery_app import celery_app
     
-    result = celery_app.AsyncResult(task_id)
+    # Single read of the result backend (see radar.get_harvest_status)
+    meta = celery_app.backend.get_task_meta(task_id)
+    status = meta["status"]
+    ready = status in states.READY_STATES
     
     response = {
         "task_id": task_id,
-        "status": result.status,
-        "ready": result.ready(),
+        "status": status,
+        "ready": ready,
     }
     
-    if result.ready():
-        if result.successful():
-            response["result"] = result.result
-        elif result.failed():
-            response["error"] = str(result.result)
+    if ready:
+        if status == states.SUCCESS:
+            response["result"] = meta["result"]
+        elif status == states.FAILURE:
+            response["error"] = str(meta["result"])
     
     return response
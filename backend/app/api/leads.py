@@ -11,14 +11,14 @@ POST /leads/bulk-update - Bulk update
 POST /leads/{id}/create-dossier - Create dossier from lead
 GET /leads/stats - Statistics for filters
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List
 from uuid import UUID
-import math
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, func, or_, and_
+from sqlalchemy import Text, and_, cast, exists, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, insert as pg_insert
 
 from app.db import get_db
 from app.db.models.user import User
@@ -27,16 +27,25 @@ from app.db.models.collections import (
     SourceDocumentV2, Evidence, DossierObjective, DossierState
 )
 from app.api.deps import get_current_user
+from app.api.pagination import paginate
+from app.api.serializers import (
+    DOCUMENT_JSON, EVIDENCE_JSON, dossier_lead_ids, lead_item_to_response
+)
+from app.core.cache import LEAD_STATS_CACHE_KEY, cache_delete, cache_get, cache_set
 from app.schemas.collections import (
     OpportunityResponse, OpportunityDetailResponse, OpportunityListResponse,
     UpdateOpportunityRequest, BulkUpdateOpportunitiesRequest,
-    EvidenceSchema, SourceDocumentSchema, CreateDossierRequest,
+    CreateDossierRequest,
     LeadItemStatusEnum, DossierObjectiveEnum
 )
 from app.workers.collection_pipeline import run_dossier_builder_task
+from app.workers.outbox import dispatch_in_background, enqueue_task
 
 router = APIRouter(prefix="/leads", tags=["Leads"])
 
+# Stats des filtres : identiques pour tous, invalidées à chaque écriture
+FILTER_STATS_CACHE_TTL = 90
+
 
 # ================================================================
 # GET /opportunities - Liste paginée avec filtres serveur
@@ -48,6 +57,7 @@ def list_opportunities(
     # Pagination
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor de la page précédente (pagination keyset)"),
     # Tri
     sort_by: str = Query("score_base", regex="^(score_base|created_at|deadline_at|budget_max|title)$"),
     sort_order: str = Query("desc", regex="^(asc|desc)$"),
@@ -88,13 +98,14 @@ def list_opportunities(
     # ===== FILTRES =====
     
     # Recherche texte
+    # ILIKE sur les colonnes brutes : servi par les index trigram (pas lower())
     if search:
-        search_term = f"%{search.lower()}%"
+        search_term = f"%{search}%"
         query = query.filter(
             or_(
-                func.lower(LeadItem.title).like(search_term),
-                func.lower(LeadItem.description).like(search_term),
-                func.lower(LeadItem.organization_name).like(search_term),
+                LeadItem.title.ilike(search_term),
+                LeadItem.description.ilike(search_term),
+                LeadItem.organization_name.ilike(search_term),
             )
         )
 
@@ -135,11 +146,11 @@ def list_opportunities(
     if region:
         query = query.filter(func.lower(LeadItem.location_region) == region.lower())
     if city:
-        query = query.filter(func.lower(LeadItem.location_city).like(f"%{city.lower()}%"))
+        query = query.filter(LeadItem.location_city.ilike(f"%{city}%"))
 
     # Source
     if source_name:
-        query = query.filter(func.lower(LeadItem.source_name).like(f"%{source_name.lower()}%"))
+        query = query.filter(LeadItem.source_name.ilike(f"%{source_name}%"))
 
     # Has contact
     if has_contact is not None:
@@ -175,37 +186,33 @@ def list_opportunities(
         else:
             query = query.filter(~LeadItem.id.in_(dossier_ids))
 
-    # Tags (JSONB contains)
+    # Tags (JSONB contains) : un seul @> pour tous les tags demandés
     if tags:
-        for tag in tags:
-            query = query.filter(LeadItem.tags.contains([tag]))
+        query = query.filter(LeadItem.tags.contains(tags))
 
     # Assignation
     if assigned_to:
         query = query.filter(LeadItem.assigned_to == assigned_to)
 
-    # ===== COMPTE TOTAL =====
-    total = query.count()
+    # ===== TRI + PAGINATION =====
+    # Keyset sur (tri, id) quand un curseur est fourni, sinon page + COUNT(*) OVER()
+    items, meta = paginate(
+        query, _OPPORTUNITY_SORT_KEYS[sort_by], page, page_size, cursor,
+        descending=sort_order == "desc",
+    )
 
-    # ===== TRI =====
-    sort_column = getattr(LeadItem, sort_by, LeadItem.score_base)
-    if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
+    # Le filtre has_dossier fixe déjà la réponse : pas de requête IN (...)
+    if has_dossier is None:
+        with_dossier = dossier_lead_ids(db, items)
     else:
-        query = query.order_by(asc(sort_column))
-
-    # ===== PAGINATION =====
-    items = query.offset((page - 1) * page_size).limit(page_size).all()
+        with_dossier = {item.id for item in items} if has_dossier else set()
 
     # ===== STATS POUR FILTRES =====
-    stats = _compute_filter_stats(db)
+    stats = _filter_stats(db)
 
     return OpportunityListResponse(
-        items=[_lead_item_to_response(item, db) for item in items],
-        total=total,
-        page=page,
-        page_size=page_size,
-        pages=math.ceil(total / page_size) if total > 0 else 0,
+        items=[lead_item_to_response(item, db, item.id in with_dossier) for item in items],
+        **meta,
         score_distribution=stats.get("score_distribution"),
         budget_distribution=stats.get("budget_distribution"),
         status_counts=stats.get("status_counts"),
@@ -223,28 +230,24 @@ def get_opportunity(
     current_user: User = Depends(get_current_user),
 ):
     """Détail complet d'une opportunité avec evidence et documents"""
-    item = db.query(LeadItem).filter(
+    # Evidence et documents agrégés en JSON par Postgres (mêmes objets que le
+    # détail d'un dossier), has_dossier en EXISTS : un seul aller-retour
+    evidence = select(func.json_agg(EVIDENCE_JSON)).where(
+        Evidence.lead_item_id == opportunity_id
+    ).scalar_subquery()
+    documents = select(func.json_agg(DOCUMENT_JSON)).where(
+        SourceDocumentV2.lead_item_id == opportunity_id
+    ).scalar_subquery()
+    has_dossier = exists().where(DossierV2.lead_item_id == opportunity_id)
+
+    row = db.query(LeadItem, evidence, documents, has_dossier).filter(
         LeadItem.id == opportunity_id,
         LeadItem.kind == LeadItemKind.OPPORTUNITY.value
     ).first()
 
-    if not item:
+    if not row:
         raise HTTPException(status_code=404, detail="Opportunité non trouvée")
-
-    # Evidence
-    evidence = db.query(Evidence).filter(
-        Evidence.lead_item_id == opportunity_id
-    ).all()
-
-    # Documents sources
-    documents = db.query(SourceDocumentV2).filter(
-        SourceDocumentV2.lead_item_id == opportunity_id
-    ).all()
-
-    # Has dossier
-    has_dossier = db.query(DossierV2).filter(
-        DossierV2.lead_item_id == opportunity_id
-    ).first() is not None
+    item, evidence, documents, has_dossier = row
 
     return OpportunityDetailResponse(
         id=item.id,
@@ -275,9 +278,9 @@ def get_opportunity(
         has_dossier=has_dossier,
         created_at=item.created_at,
         updated_at=item.updated_at,
-        evidence=[EvidenceSchema.from_orm(e) for e in evidence],
-        source_documents=[SourceDocumentSchema.from_orm(d) for d in documents],
-        metadata=item.metadata,
+        evidence=evidence or [],
+        source_documents=documents or [],
+        metadata=item.extra_data,
     )
 
 
@@ -309,9 +312,9 @@ def update_opportunity(
         item.assigned_to = request.assigned_to
 
     db.commit()
-    db.refresh(item)
+    cache_delete(LEAD_STATS_CACHE_KEY)
 
-    return _lead_item_to_response(item, db)
+    return lead_item_to_response(item, db)
 
 
 # ================================================================
@@ -325,29 +328,39 @@ def bulk_update_opportunities(
     current_user: User = Depends(get_current_user),
 ):
     """Mise à jour en masse des opportunités"""
-    items = db.query(LeadItem).filter(
+    query = db.query(LeadItem).filter(
         LeadItem.id.in_(request.ids),
         LeadItem.kind == LeadItemKind.OPPORTUNITY.value
-    ).all()
-
-    if not items:
-        raise HTTPException(status_code=404, detail="Aucune opportunité trouvée")
+    )
 
-    updated_count = 0
-    for item in items:
-        if request.status:
-            item.status = request.status.value
-        if request.assigned_to is not None:
-            item.assigned_to = request.assigned_to
+    values = {}
+    if request.status:
+        values[LeadItem.status] = request.status.value
+    if request.assigned_to is not None:
+        values[LeadItem.assigned_to] = request.assigned_to
+    if request.tags_add or request.tags_remove:
+        # Tags modifiés par Postgres (jsonb - text[] retire les éléments) :
+        # ajout sans doublon = retirer puis concaténer
+        tags = func.coalesce(LeadItem.tags, cast([], JSONB))
         if request.tags_add:
-            current_tags = item.tags or []
-            item.tags = list(set(current_tags + request.tags_add))
+            tags_add = list(dict.fromkeys(request.tags_add))
+            tags = tags.op("-", return_type=JSONB)(literal(tags_add, ARRAY(Text)))
+            tags = tags.op("||", return_type=JSONB)(literal(tags_add, JSONB))
         if request.tags_remove:
-            current_tags = item.tags or []
-            item.tags = [t for t in current_tags if t not in request.tags_remove]
-        updated_count += 1
+            tags = tags.op("-", return_type=JSONB)(literal(request.tags_remove, ARRAY(Text)))
+        values[LeadItem.tags] = tags
+
+    # Un seul UPDATE pour toutes les lignes (COUNT si rien à modifier)
+    if values:
+        updated_count = query.update(values, synchronize_session=False)
+    else:
+        updated_count = query.count()
+
+    if not updated_count:
+        raise HTTPException(status_code=404, detail="Aucune opportunité trouvée")
 
     db.commit()
+    cache_delete(LEAD_STATS_CACHE_KEY)
 
     return {"updated": updated_count, "message": f"{updated_count} opportunité(s) mise(s) à jour"}
 
@@ -359,6 +372,7 @@ def bulk_update_opportunities(
 @router.post("/{opportunity_id}/create-dossier")
 def create_dossier_from_opportunity(
     opportunity_id: UUID,
+    background_tasks: BackgroundTasks,
     objective: DossierObjectiveEnum = Query(...),
     target_entities: Optional[List[str]] = Query(None),
     db: Session = Depends(get_db),
@@ -373,34 +387,34 @@ def create_dossier_from_opportunity(
     if not item:
         raise HTTPException(status_code=404, detail="Opportunité non trouvée")
 
-    # Vérifier si dossier existe déjà
-    existing = db.query(DossierV2).filter(
-        DossierV2.lead_item_id == opportunity_id
-    ).first()
-
-    if existing:
-        raise HTTPException(status_code=400, detail="Un dossier existe déjà pour cette opportunité")
-
-    # Créer le dossier
+    # Créer le dossier : l'unicité de lead_item_id est vérifiée par la base,
+    # RETURNING vide = un dossier existe déjà (un seul aller-retour, sans course)
     entities = [{"name": e, "type": "ORGANIZATION"} for e in (target_entities or [])]
     if not entities and item.organization_name:
         entities = [{"name": item.organization_name, "type": "ORGANIZATION"}]
 
-    dossier = DossierV2(
-        lead_item_id=opportunity_id,
-        objective=objective.value,
-        target_entities=entities,
-        state=DossierState.PROCESSING.value,
-    )
-    db.add(dossier)
-    db.commit()
-    db.refresh(dossier)
+    dossier_id = db.execute(
+        pg_insert(DossierV2).values(
+            lead_item_id=opportunity_id,
+            objective=objective.value,
+            target_entities=entities,
+            state=DossierState.PROCESSING.value,
+        ).on_conflict_do_nothing(
+            index_elements=[DossierV2.lead_item_id]
+        ).returning(DossierV2.id)
+    ).scalar_one_or_none()
+
+    if dossier_id is None:
+        raise HTTPException(status_code=400, detail="Un dossier existe déjà pour cette opportunité")
 
-    # Lancer la tâche d'enrichissement
-    run_dossier_builder_task.delay(str(dossier.id))
+    # Tâche d'enrichissement enregistrée avec le dossier, envoyée au broker
+    # après la réponse
+    task_id = enqueue_task(db, run_dossier_builder_task, dossier_id=str(dossier_id))
+    db.commit()
+    background_tasks.add_task(dispatch_in_background, [task_id])
 
     return {
-        "dossier_id": str(dossier.id),
+        "dossier_id": str(dossier_id),
         "message": "Dossier en cours de création"
     }
 
@@ -415,89 +429,69 @@ def get_opportunities_stats(
     current_user: User = Depends(get_current_user),
 ):
     """Statistiques pour les filtres UI (distributions)"""
-    return _compute_filter_stats(db)
+    return _filter_stats(db)
 
 
 # ================================================================
 # HELPERS
 # ================================================================
 
-def _lead_item_to_response(item: LeadItem, db: Session) -> OpportunityResponse:
-    """Convertit un LeadItem en réponse"""
-    has_dossier = db.query(DossierV2).filter(
-        DossierV2.lead_item_id == item.id
-    ).first() is not None
-
-    return OpportunityResponse(
-        id=item.id,
-        title=item.title,
-        description=item.description,
-        organization_name=item.organization_name,
-        url_primary=item.url_primary,
-        source_name=item.source_name,
-        source_type=item.source_type,
-        published_at=item.published_at,
-        deadline_at=item.deadline_at,
-        location_city=item.location_city,
-        location_region=item.location_region,
-        budget_min=item.budget_min,
-        budget_max=item.budget_max,
-        budget_display=item.budget_display,
-        contact_email=item.contact_email,
-        contact_phone=item.contact_phone,
-        contact_url=item.contact_url,
-        contact_name=item.contact_name,
-        has_contact=item.has_contact,
-        has_deadline=item.has_deadline,
-        score_base=item.score_base or 0,
-        score_breakdown=item.score_breakdown,
-        status=item.status,
-        tags=item.tags,
-        assigned_to=item.assigned_to,
-        has_dossier=has_dossier,
-        created_at=item.created_at,
-        updated_at=item.updated_at,
-    )
+# Clés de tri pour la pagination (expression SQL, conversion depuis le curseur),
+# id en dernier pour départager les égalités. Les NULL sont remplacés par une
+# valeur haute (même position que l'ordre Postgres par défaut) car la
+# comparaison de tuples du keyset ne les gère pas ; score_base vaut 0 comme
+# dans les réponses.
+_NO_DEADLINE = datetime(9999, 12, 31, tzinfo=timezone.utc)
+_OPPORTUNITY_SORT_KEYS = {
+    "score_base": ((func.coalesce(LeadItem.score_base, 0), int), (LeadItem.id, UUID)),
+    "created_at": ((LeadItem.created_at, datetime.fromisoformat), (LeadItem.id, UUID)),
+    "deadline_at": ((func.coalesce(LeadItem.deadline_at, _NO_DEADLINE), datetime.fromisoformat), (LeadItem.id, UUID)),
+    "budget_max": ((func.coalesce(LeadItem.budget_max, float("inf")), float), (LeadItem.id, UUID)),
+    "title": ((LeadItem.title, str), (LeadItem.id, UUID)),
+}
+
+
+# Tranches des distributions : (label, borne basse incluse, borne haute exclue)
+_SCORE_BUCKETS = [(f"{start}-{start + 20}", start, start + 20) for start in range(0, 100, 20)]
+_BUDGET_BUCKETS = [
+    ("0-5k", 0, 5000),
+    ("5k-15k", 5000, 15000),
+    ("15k-50k", 15000, 50000),
+    ("50k-100k", 50000, 100000),
+    ("100k+", 100000, None),
+]
+
+
+def _filter_stats(db: Session) -> dict:
+    """Stats des filtres, servies depuis Redis tant qu'aucune écriture ne les invalide"""
+    stats = cache_get(LEAD_STATS_CACHE_KEY)
+    if stats is None:
+        stats = _compute_filter_stats(db)
+        cache_set(LEAD_STATS_CACHE_KEY, stats, FILTER_STATS_CACHE_TTL)
+    return stats
 
 
 def _compute_filter_stats(db: Session) -> dict:
-    """Calcule les stats pour les filtres UI"""
-    base_query = db.query(LeadItem).filter(LeadItem.kind == LeadItemKind.OPPORTUNITY.value)
-
-    # Distribution des scores
-    score_dist = {}
-    for bucket_start in range(0, 100, 20):
-        bucket_end = bucket_start + 20
-        count = base_query.filter(
-            LeadItem.score_base >= bucket_start,
-            LeadItem.score_base < bucket_end
-        ).count()
-        score_dist[f"{bucket_start}-{bucket_end}"] = count
-
-    # Distribution des budgets
-    budget_ranges = [
-        (0, 5000, "0-5k"),
-        (5000, 15000, "5k-15k"),
-        (15000, 50000, "15k-50k"),
-        (50000, 100000, "50k-100k"),
-        (100000, None, "100k+"),
-    ]
-    budget_dist = {}
-    for min_val, max_val, label in budget_ranges:
-        query = base_query.filter(LeadItem.budget_max >= min_val)
-        if max_val:
-            query = query.filter(LeadItem.budget_max < max_val)
-        budget_dist[label] = query.count()
-
-    # Comptage par statut
-    status_counts = {}
-    for status in LeadItemStatus:
-        count = base_query.filter(LeadItem.status == status.value).count()
-        status_counts[status.value] = count
+    """Calcule les stats pour les filtres UI (une seule requête agrégée)"""
+    def bucket_count(column, low, high):
+        conditions = [column >= low]
+        if high is not None:
+            conditions.append(column < high)
+        return func.count().filter(*conditions)
+
+    aggregates = (
+        [bucket_count(LeadItem.score_base, low, high) for _, low, high in _SCORE_BUCKETS]
+        + [bucket_count(LeadItem.budget_max, low, high) for _, low, high in _BUDGET_BUCKETS]
+        + [func.count().filter(LeadItem.status == status.value) for status in LeadItemStatus]
+        + [func.count()]
+    )
+    row = iter(db.query(*aggregates).filter(
+        LeadItem.kind == LeadItemKind.OPPORTUNITY.value
+    ).one())
 
     return {
-        "score_distribution": score_dist,
-        "budget_distribution": budget_dist,
-        "status_counts": status_counts,
-        "total": base_query.count(),
+        "score_distribution": {label: next(row) for label, _, _ in _SCORE_BUCKETS},
+        "budget_distribution": {label: next(row) for label, _, _ in _BUDGET_BUCKETS},
+        "status_counts": {status.value: next(row) for status in LeadItemStatus},
+        "total": next(row),
     }
@@ -0,0 +1,80 @@
+"""
+Pagination des listes : par numéro de page ou keyset (curseur).
+
+Les clés de tri sont des tuples (expression SQL, conversion depuis le
+curseur) ; la dernière clé doit être unique (id) pour départager les
+égalités.
+"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import asc, desc, func, tuple_
+
+
+def encode_cursor(values) -> str:
+    return "|".join(v.isoformat() if isinstance(v, datetime) else str(v) for v in values)
+
+
+def decode_cursor(cursor: str, keys) -> list:
+    """Décode un curseur produit par encode_cursor (400 si invalide)"""
+    # Seule la première clé peut être du texte libre (titre) : découpe par la droite
+    raw_values = cursor.rsplit("|", len(keys) - 1)
+    if len(raw_values) != len(keys):
+        raise HTTPException(status_code=400, detail="Curseur invalide")
+    try:
+        return [parse(raw) for (_, parse), raw in zip(keys, raw_values)]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Curseur invalide")
+
+
+def keyset_filter(keys, cursor: str, descending: bool = True):
+    """Condition WHERE (k1, k2) < curseur (ou > en ordre croissant)"""
+    columns = tuple_(*[expr for expr, _ in keys])
+    values = tuple_(*decode_cursor(cursor, keys))
+    return columns < values if descending else columns > values
+
+
+def paginate(query, keys, page: int, page_size: int, cursor: Optional[str] = None,
+             descending: bool = True):
+    """
+    Pagine une requête triée par `keys`.
+
+    - Sans curseur : pagination par numéro de page, avec le total compté
+      dans la même requête (COUNT(*) OVER()).
+    - Avec curseur : pagination keyset (WHERE (k1, k2) < curseur), sans
+      OFFSET ni total ; le coût ne dépend plus du numéro de page.
+
+    Retourne (items, meta) où meta contient total/page/pages/next_cursor.
+    """
+    columns = [expr for expr, _ in keys]
+    direction = desc if descending else asc
+    query = query.order_by(*[direction(expr) for expr in columns])
+
+    if cursor:
+        rows = query.add_columns(*columns).filter(
+            keyset_filter(keys, cursor, descending)
+        ).limit(page_size + 1).all()
+        total = None
+    else:
+        rows = query.add_columns(*columns, func.count().over()).offset(
+            (page - 1) * page_size
+        ).limit(page_size + 1).all()
+        if rows:
+            total = rows[0][-1]
+        else:
+            # Page hors limites : pas de ligne pour porter le total
+            total = query.count() if page > 1 else 0
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1][1:len(keys) + 1])
+
+    return [row[0] for row in rows], {
+        "total": total,
+        "page": None if cursor else page,
+        "page_size": page_size,
+        "pages": None if cursor else -(-total // page_size),
+        "next_cursor": next_cursor,
+    }
@@ -5,13 +5,13 @@ Ce module fournit un endpoint SSE (Server-Sent Events) qui écoute
 le canal Redis et transmet les mises à jour au frontend.
 """
 import asyncio
-import json
 import logging
-from typing import AsyncGenerator, Optional, Set
+from typing import AsyncGenerator, Optional, Set, Union
 
 from fastapi import APIRouter, Query, Request, HTTPException
-from fastapi.responses import StreamingResponse
-from sse_starlette.sse import EventSourceResponse
+from fastapi.responses import Response, StreamingResponse
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
+import orjson
 import redis.asyncio as aioredis
 
 from app.core.config import settings
@@ -23,98 +23,195 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/progress", tags=["Progress"])
 
 
-# Store active subscribers per task_id
+# Intervalle des pings SSE (commentaires ": ping" envoyés par EventSourceResponse)
+HEARTBEAT_INTERVAL = 15.0
+
+# Nombre max de messages déjà en file envoyés en une seule écriture
+MAX_BATCH = 64
+
+# Nombre max de tâches par appel à /tasks
+MAX_TASK_IDS = 100
+
+# Taille max de la file d'un flux : un client lent perd les plus anciens
+# messages au lieu de retenir une mémoire sans limite
+QUEUE_MAXSIZE = 256
+
+# Store active subscribers per task_id (ALL_TASKS : flux sans filtre)
+ALL_TASKS = "*"
 active_subscribers: dict[str, Set[asyncio.Queue]] = {}
 
+# Abonnement Redis unique du processus, partagé par tous les flux SSE
+_listener: Optional[asyncio.Task] = None
+
+# Client Redis partagé (pool de connexions), créé au premier appel
+_redis: Optional[aioredis.Redis] = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Client Redis du module : les connexions sont réutilisées entre requêtes"""
+    global _redis
+    if _redis is None:
+        _redis = aioredis.from_url(settings.redis_url)
+    return _redis
+
+
+async def close_redis() -> None:
+    """Arrête l'abonnement partagé et ferme le pool (arrêt de l'application)"""
+    global _redis, _listener
+    if _listener is not None:
+        _listener.cancel()
+        await asyncio.gather(_listener, return_exceptions=True)
+        _listener = None
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+async def _fan_out() -> None:
+    """
+    Écoute PROGRESS_CHANNEL sur une seule connexion et distribue chaque
+    message (décodé une fois) aux files des abonnés de sa tâche.
+    """
+    pubsub = get_redis().pubsub()
+    try:
+        await pubsub.subscribe(PROGRESS_CHANNEL)
+        logger.info(f"Subscribed to {PROGRESS_CHANNEL}")
+        # Bloqué sur la socket tant que rien n'est publié : pas de polling
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            # Un message invalide est ignoré : il ne doit pas couper le flux
+            # de tous les clients connectés
+            try:
+                data = orjson.loads(message["data"])
+            except orjson.JSONDecodeError as e:
+                logger.warning(f"Ignoring malformed progress message: {e}")
+                continue
+            if not isinstance(data, dict):
+                logger.warning(f"Ignoring non-object progress message: {data!r}")
+                continue
+            task_id = data.get("task_id")
+            keys = (task_id, ALL_TASKS) if isinstance(task_id, str) else (ALL_TASKS,)
+            for key in keys:
+                for queue in active_subscribers.get(key, ()):
+                    _deliver(queue, data)
+    except Exception as e:
+        logger.error(f"Redis subscription error: {e}")
+        error = {"type": "error", "message": str(e)}
+        for queues in active_subscribers.values():
+            for queue in queues:
+                _deliver(queue, error)
+    finally:
+        # Rend la connexion au pool partagé
+        await pubsub.aclose()
+        logger.info("Closed Redis subscription")
+
+
+def _deliver(queue: asyncio.Queue, item: dict) -> None:
+    """put_nowait sur une file bornée : la plus ancienne entrée cède sa place"""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+def _ensure_listener() -> None:
+    """Démarre l'abonnement partagé (ou le relance s'il s'est arrêté)"""
+    global _listener
+    if _listener is None or _listener.done():
+        _listener = asyncio.create_task(_fan_out())
+
 
 async def subscribe_to_task_progress(
     task_ids: list[str],
     timeout: float = 120.0
-) -> AsyncGenerator[dict, None]:
+) -> AsyncGenerator[list[dict], None]:
     """
-    Générateur async qui écoute Redis et yield les messages de progression.
+    Générateur async qui yield les messages de progression des tâches,
+    reçus via l'abonnement Redis partagé. Les messages arrivés pendant
+    l'envoi précédent sont regroupés (jusqu'à MAX_BATCH par lot).
     
     Args:
         task_ids: Liste des task_ids à surveiller
         timeout: Timeout en secondes pour la connexion SSE
     """
-    redis_client = aioredis.from_url(settings.redis_url)
-    pubsub = redis_client.pubsub()
-    
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+    keys = task_ids or [ALL_TASKS]
+    for key in keys:
+        active_subscribers.setdefault(key, set()).add(queue)
+    _ensure_listener()
+
     try:
-        await pubsub.subscribe(PROGRESS_CHANNEL)
-        logger.info(f"Subscribed to {PROGRESS_CHANNEL} for tasks: {task_ids}")
-        
-        start_time = asyncio.get_event_loop().time()
-        
+        deadline = asyncio.get_running_loop().time() + timeout
+
         while True:
-            # Check timeout
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed > timeout:
-                logger.info(f"SSE timeout after {elapsed}s")
-                break
-            
+            # La connexion est maintenue par les pings d'EventSourceResponse.
+            # Le délai n'entoure que l'attente : un yield dans le bloc
+            # exposerait le consommateur à l'annulation.
             try:
-                message = await asyncio.wait_for(
-                    pubsub.get_message(ignore_subscribe_messages=True),
-                    timeout=1.0
-                )
-                
-                if message and message.get("type") == "message":
-                    data = json.loads(message["data"])
-                    
-                    # Filtrer par task_ids si spécifiés
-                    if not task_ids or data.get("task_id") in task_ids:
-                        yield data
-                        
-                        # Arrêter si la tâche est terminée
-                        if data.get("type") in ("completed", "failed"):
-                            logger.info(f"Task {data.get('task_id')} finished, closing stream")
-                            break
-                            
-            except asyncio.TimeoutError:
-                # Send heartbeat
-                yield {"type": "heartbeat", "timestamp": asyncio.get_event_loop().time()}
-                
-    except Exception as e:
-        logger.error(f"Redis subscription error: {e}")
-        yield {"type": "error", "message": str(e)}
+                async with asyncio.timeout_at(deadline):
+                    data = await queue.get()
+            except TimeoutError:
+                logger.info(f"SSE timeout after {timeout}s")
+                break
+
+            batch = [data]
+            done = False
+            while True:
+                # Arrêter si la tâche est terminée (ou l'abonnement en erreur)
+                if data.get("type") == "error":
+                    done = True
+                elif data.get("type") in ("completed", "failed"):
+                    logger.info(f"Task {data.get('task_id')} finished, closing stream")
+                    done = True
+                if done or len(batch) >= MAX_BATCH or queue.empty():
+                    break
+                data = queue.get_nowait()
+                batch.append(data)
+
+            yield batch
+            if done:
+                break
     finally:
-        await pubsub.unsubscribe(PROGRESS_CHANNEL)
-        await redis_client.close()
-        logger.info("Closed Redis subscription")
+        for key in keys:
+            queues = active_subscribers.get(key)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del active_subscribers[key]
 
 
 async def event_generator(
     task_ids: list[str],
     token: str
-) -> AsyncGenerator[dict, None]:
+) -> AsyncGenerator[Union[dict, bytes], None]:
     """Génère les événements SSE"""
     # Verify token
     user_id = verify_token(token, "access")
     if not user_id:
         yield {
             "event": "error",
-            "data": json.dumps({"error": "Invalid or expired token"})
+            "data": orjson.dumps({"error": "Invalid or expired token"}).decode()
         }
         return
     
     # Send initial connection event
     yield {
         "event": "connected",
-        "data": json.dumps({
+        "data": orjson.dumps({
             "message": "Connected to progress stream",
             "task_ids": task_ids
-        })
+        }).decode()
     }
     
-    # Stream progress updates
-    async for update in subscribe_to_task_progress(task_ids):
-        event_type = update.get("type", "progress")
-        yield {
-            "event": event_type,
-            "data": json.dumps(update)
-        }
+    # Stream progress updates: un lot = un seul envoi sur la socket
+    async for batch in subscribe_to_task_progress(task_ids):
+        yield b"".join(
+            ServerSentEvent(
+                orjson.dumps(update).decode(),
+                event=update.get("type", "progress")
+            ).encode()
+            for update in batch
+        )
 
 
 @router.get("/stream")
@@ -148,7 +245,8 @@ async def stream_progress(
     
     return EventSourceResponse(
         event_generator(task_id_list, token),
-        media_type="text/event-stream"
+        media_type="text/event-stream",
+        ping=HEARTBEAT_INTERVAL
     )
 
 
@@ -168,22 +266,56 @@ async def get_task_progress(
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
     try:
-        redis_client = aioredis.from_url(settings.redis_url)
-        
-        # Try to get stored progress
-        stored_progress = await redis_client.get(f"task_progress:{task_id}")
-        await redis_client.close()
-        
-        if stored_progress:
-            return json.loads(stored_progress)
-        
-        return {
+        (progress,) = await _stored_progress([task_id])
+    except Exception as e:
+        logger.error(f"Error getting task progress: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return Response(content=progress, media_type="application/json")
+
+
+@router.get("/tasks")
+async def get_tasks_progress(
+    task_ids: str = Query(..., description="Comma-separated task IDs"),
+    token: str = Query(..., description="JWT token for authentication")
+):
+    """
+    Dernière progression connue de plusieurs tâches, en un seul MGET.
+
+    Retourne une liste dans l'ordre de task_ids, sans doublons ni ids vides
+    (même format que /task/{task_id}). 400 au-delà de MAX_TASK_IDS tâches.
+    """
+    user_id = verify_token(token, "access")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+
+    ids = list(dict.fromkeys(filter(None, (t.strip() for t in task_ids.split(",")))))
+    if not ids:
+        raise HTTPException(status_code=400, detail="No task_ids given")
+    if len(ids) > MAX_TASK_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_TASK_IDS} task_ids per request")
+
+    try:
+        progress = await _stored_progress(ids)
+    except Exception as e:
+        logger.error(f"Error getting tasks progress: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return Response(content=b"[" + b",".join(progress) + b"]", media_type="application/json")
+
+
+async def _stored_progress(task_ids: list[str]) -> list[bytes]:
+    """
+    Progression stockée de chaque tâche (JSON brut, renvoyé sans décodage),
+    lue en un seul aller-retour Redis
+    """
+    values = await get_redis().mget([f"task_progress:{task_id}" for task_id in task_ids])
+    return [
+        value if value else orjson.dumps({
             "task_id": task_id,
             "type": "unknown",
             "message": "No progress data available",
             "progress": 0
-        }
-        
-    except Exception as e:
-        logger.error(f"Error getting task progress: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        })
+        for task_id, value in zip(task_ids, values)
+    ]
@@ -5,15 +5,20 @@ from typing import List, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 
 from app.api.deps import get_current_user, get_db
+from app.core.cache import RADAR_CACHE_PREFIX, cache_get, cache_set
 from app.db.models.user import User
 
 
 router = APIRouter()
 
+# Les rapports ne changent qu'à la fin d'une récolte (qui invalide le cache)
+RADAR_CACHE_TTL = 300
+
 
 class HarvestReport(BaseModel):
     id: str
@@ -41,8 +46,8 @@ class HarvestTriggerResponse(BaseModel):
     task_id: str
 
 
-@router.get("/reports", response_model=List[HarvestReport])
-async def get_harvest_reports(
+@router.get("/reports", responses={200: {"model": List[HarvestReport]}})
+def get_harvest_reports(
     limit: int = 20,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -52,16 +57,28 @@ async def get_harvest_reports(
     """
     from app.workers.auto_radar_task import RadarHarvestReport
     
-    reports = db.query(RadarHarvestReport)\
+    cache_key = f"{RADAR_CACHE_PREFIX}:reports:{limit}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return ORJSONResponse(cached)
+    
+    # Seules les colonnes de HarvestReport (pas de details JSON ni d'entités ORM)
+    columns = [getattr(RadarHarvestReport, name) for name in HarvestReport.model_fields]
+    rows = db.query(*columns)\
         .order_by(RadarHarvestReport.harvest_time.desc())\
         .limit(limit)\
         .all()
     
-    return reports
+    # model_construct: trusted DB values, no validation pass
+    reports = [
+        HarvestReport.model_construct(**row._mapping).model_dump(mode="json") for row in rows
+    ]
+    cache_set(cache_key, reports, RADAR_CACHE_TTL)
+    return ORJSONResponse(reports)
 
 
 @router.post("/trigger", response_model=HarvestTriggerResponse)
-async def trigger_harvest(
+def trigger_harvest(
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -79,35 +96,40 @@ async def trigger_harvest(
 
 
 @router.get("/status/{task_id}")
-async def get_harvest_status(
+def get_harvest_status(
     task_id: str,
     current_user: User = Depends(get_current_user)
 ):
     """
     Récupérer le statut d'une tâche de récolte
     """
-    from celery.result import AsyncResult
+    from celery import states
     from app.workers.celery_app import celery_app
     
-    result = AsyncResult(task_id, app=celery_app)
+    # Un seul GET sur le backend de résultats (AsyncResult relit les
+    # métadonnées à chaque accès .status/.ready()/.result tant que la
+    # tâche n'est pas terminée)
+    meta = celery_app.backend.get_task_meta(task_id)
+    status = meta["status"]
+    ready = status in states.READY_STATES
     
     response = {
         "task_id": task_id,
-        "status": result.status,
-        "ready": result.ready(),
+        "status": status,
+        "ready": ready,
     }
     
-    if result.ready():
-        if result.successful():
-            response["result"] = result.result
+    if ready:
+        if status == states.SUCCESS:
+            response["result"] = meta["result"]
         else:
-            response["error"] = str(result.result)
+            response["error"] = str(meta["result"])
     
     return response
 
 
 @router.get("/stats")
-async def get_radar_stats(
+def get_radar_stats(
     days: int = 7,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -117,11 +139,23 @@ async def get_radar_stats(
     """
     from app.workers.auto_radar_task import RadarHarvestReport
     from datetime import timedelta
-    from sqlalchemy import func
+    from sqlalchemy import func, select
+    
+    cache_key = f"{RADAR_CACHE_PREFIX}:stats:{days}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached
     
     since = datetime.utcnow() - timedelta(days=days)
     
-    # Agrégations
+    # Dernière récolte (toutes statuts), en objet JSON dans la même requête
+    last_harvest = select(func.json_build_object(
+        "time", RadarHarvestReport.harvest_time,
+        "status", RadarHarvestReport.status,
+        "opportunities_created", RadarHarvestReport.opportunities_created,
+    )).order_by(RadarHarvestReport.harvest_time.desc()).limit(1).correlate(None).scalar_subquery()
+    
+    # Agrégations + dernière récolte : un seul aller-retour
     stats = db.query(
         func.count(RadarHarvestReport.id).label("total_harvests"),
         func.sum(RadarHarvestReport.sources_scanned).label("total_sources_scanned"),
@@ -131,17 +165,13 @@ async def get_radar_stats(
         func.sum(RadarHarvestReport.opportunities_good).label("total_good"),
         func.sum(RadarHarvestReport.notifications_sent).label("total_notifications"),
         func.avg(RadarHarvestReport.duration_seconds).label("avg_duration"),
+        last_harvest.label("last_harvest"),
     ).filter(
         RadarHarvestReport.harvest_time >= since,
         RadarHarvestReport.status == "success"
-    ).first()
+    ).one()
     
-    # Dernière récolte
-    last_harvest = db.query(RadarHarvestReport)\
-        .order_by(RadarHarvestReport.harvest_time.desc())\
-        .first()
-    
-    return {
+    response = {
         "period_days": days,
         "total_harvests": stats.total_harvests or 0,
         "total_sources_scanned": stats.total_sources_scanned or 0,
@@ -151,9 +181,7 @@ async def get_radar_stats(
         "total_good": stats.total_good or 0,
         "total_notifications": stats.total_notifications or 0,
         "avg_duration_seconds": round(stats.avg_duration or 0, 2),
-        "last_harvest": {
-            "time": last_harvest.harvest_time.isoformat() if last_harvest and last_harvest.harvest_time else None,
-            "status": last_harvest.status if last_harvest else None,
-            "opportunities_created": last_harvest.opportunities_created if last_harvest else 0,
-        } if last_harvest else None
+        "last_harvest": stats.last_harvest,
     }
+    cache_set(cache_key, response, RADAR_CACHE_TTL)
+    return response
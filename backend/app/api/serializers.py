@@ -0,0 +1,83 @@
+"""
+Sérialisation partagée entre les routers (leads, collections, dossiers)
+"""
+from typing import List, Optional
+
+from sqlalchemy import Integer, cast, exists, func
+from sqlalchemy.orm import Session
+
+from app.db.models.collections import LeadItem, DossierV2, Evidence, SourceDocumentV2
+from app.schemas.collections import OpportunityResponse
+
+
+# Objets JSON construits par Postgres pour le détail d'un dossier ou d'une
+# opportunité (mêmes clés que EvidenceSchema / SourceDocumentSchema)
+EVIDENCE_JSON = func.json_build_object(
+    "field_key", Evidence.field_name,
+    "value", Evidence.value,
+    "source_url", Evidence.url,
+    "snippet", Evidence.quote,
+    "confidence", func.coalesce(cast(func.round(Evidence.confidence * 100), Integer), 100),
+    "provenance", Evidence.provenance,
+)
+DOCUMENT_JSON = func.json_build_object(
+    "id", SourceDocumentV2.id,
+    "doc_type", SourceDocumentV2.doc_type,
+    "source_url", SourceDocumentV2.url,
+    "metadata", SourceDocumentV2.extra_data,
+    "created_at", SourceDocumentV2.created_at,
+)
+
+
+def dossier_lead_ids(db: Session, items: List[LeadItem]) -> set:
+    """IDs des lead_items de la liste qui ont un dossier (une seule requête)"""
+    if not items:
+        return set()
+    return {
+        lead_item_id for (lead_item_id,) in db.query(DossierV2.lead_item_id).filter(
+            DossierV2.lead_item_id.in_([item.id for item in items])
+        )
+    }
+
+
+def lead_item_to_response(
+    item: LeadItem,
+    db: Session,
+    has_dossier: Optional[bool] = None,
+) -> OpportunityResponse:
+    """Convertit un LeadItem en réponse (has_dossier vérifié si non fourni)"""
+    if has_dossier is None:
+        has_dossier = db.query(exists().where(
+            DossierV2.lead_item_id == item.id
+        )).scalar()
+
+    return OpportunityResponse.model_construct(
+        id=str(item.id),
+        title=item.title,
+        description=item.description,
+        organization_name=item.organization_name,
+        url_primary=item.url_primary,
+        source_name=item.source_name,
+        source_type=item.source_type,
+        published_at=item.published_at,
+        deadline_at=item.deadline_at,
+        location_city=item.location_city,
+        location_region=item.location_region,
+        budget_min=item.budget_min,
+        budget_max=item.budget_max,
+        budget_display=item.budget_display,
+        contact_email=item.contact_email,
+        contact_phone=item.contact_phone,
+        contact_url=item.contact_url,
+        contact_name=item.contact_name,
+        has_contact=item.has_contact,
+        has_deadline=item.has_deadline,
+        score_base=item.score_base or 0,
+        score_breakdown=item.score_breakdown,
+        status=item.status,
+        tags=item.tags,
+        assigned_to=item.assigned_to,
+        has_dossier=has_dossier,
+        created_at=item.created_at,
+        updated_at=item.updated_at,
+    )
@@ -1,12 +1,146 @@
 """
 Activity logging service for tracking user actions
 """
+import asyncio
+import logging
+import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, List
+from sqlalchemy import DateTime, Integer, column, insert, update, values
 from sqlalchemy.orm import Session
 from fastapi import Request
+from starlette.concurrency import run_in_threadpool
 
 from app.db.models import ActivityLog, User
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogBuffer:
+    """
+    In-process write buffer for activity logs.
+
+    Endpoints push rows onto an asyncio queue; a background task drains it
+    every FLUSH_INTERVAL seconds and writes up to BATCH_SIZE rows per INSERT
+    in a single transaction, instead of one commit per logged action.
+
+    Login timestamps (users.last_login_at) go through the same flusher,
+    coalesced per user and written as one UPDATE ... FROM (VALUES ...).
+    """
+
+    FLUSH_INTERVAL = 0.2  # seconds
+    BATCH_SIZE = 100
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_logins: Dict[int, datetime] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the flusher on the running event loop (FastAPI startup)"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flusher and write whatever is still buffered"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+
+    def push(self, row: dict) -> bool:
+        """
+        Queue a row for insertion. Safe to call from sync endpoints running
+        in the threadpool. Returns False when the flusher is not running.
+        """
+        if not self.running:
+            return False
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, row)
+        return True
+
+    def push_last_login(self, user_id: int, at: datetime) -> bool:
+        """
+        Queue a last_login_at update. Same contract as push(); only the
+        latest timestamp per user is written.
+        """
+        if not self.running:
+            return False
+        self._loop.call_soon_threadsafe(self._last_logins.__setitem__, user_id, at)
+        return True
+
+    async def flush(self):
+        """Drain the queue in batches of BATCH_SIZE"""
+        if self._queue is None:
+            return
+        if self._last_logins:
+            last_logins, self._last_logins = self._last_logins, {}
+            try:
+                await run_in_threadpool(self._write_last_logins, last_logins)
+            except Exception as e:
+                logger.error(f"Failed to update last login of {len(last_logins)} users: {e}")
+        while not self._queue.empty():
+            rows = []
+            while len(rows) < self.BATCH_SIZE and not self._queue.empty():
+                rows.append(self._queue.get_nowait())
+            try:
+                await run_in_threadpool(self._write_batch, rows)
+            except Exception as e:
+                logger.error(f"Failed to write {len(rows)} activity logs: {e}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            await self.flush()
+
+    @staticmethod
+    def _write_batch(rows: List[dict]):
+        """Insert a batch of rows in one transaction (executemany)"""
+        db = SessionLocal()
+        try:
+            db.execute(insert(ActivityLog), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def _write_last_logins(last_logins: Dict[int, datetime]):
+        """Update users.last_login_at for all buffered users in one statement"""
+        logins = values(
+            column("user_id", Integer), column("at", DateTime), name="logins"
+        ).data(list(last_logins.items()))
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(User)
+                .where(User.id == logins.c.user_id)
+                .values(last_login_at=logins.c.at)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+activity_log_buffer = ActivityLogBuffer()
 
 
 class ActivityLogger:
@@ -34,29 +168,10 @@ class ActivityLogger:
             details: Additional context
             request: FastAPI request for IP and user agent
         """
-        # Get IP and user agent from request if available
-        ip_address = None
-        user_agent = None
-        if request:
-            ip_address = request.client.host if request.client else None
-            user_agent = request.headers.get("user-agent")
-        
-        log_entry = ActivityLog(
-            user_id=user.id,
-            user_tracking_id=user.tracking_id or f"USR-{str(user.id)[:6].upper()}",
-            action=action,
-            resource_type=resource_type,
-            resource_id=str(resource_id) if resource_id else None,
-            details=details,
-            ip_address=ip_address,
-            user_agent=user_agent,
+        row = ActivityLogger._row(
+            user, action, resource_type, resource_id, details, *_client_info(request)
         )
-        
-        db.add(log_entry)
-        db.commit()
-        db.refresh(log_entry)
-        
-        return log_entry
+        return ActivityLogger._insert(db, row)
     
     @staticmethod
     def log_async(
@@ -70,22 +185,76 @@ class ActivityLogger:
         user_agent: Optional[str] = None,
     ) -> ActivityLog:
         """Log activity without request object (for background tasks)"""
-        log_entry = ActivityLog(
-            user_id=user.id,
-            user_tracking_id=user.tracking_id or f"USR-{str(user.id)[:6].upper()}",
-            action=action,
-            resource_type=resource_type,
-            resource_id=str(resource_id) if resource_id else None,
-            details=details,
-            ip_address=ip_address,
-            user_agent=user_agent,
+        row = ActivityLogger._row(
+            user, action, resource_type, resource_id, details, ip_address, user_agent
         )
-        
-        db.add(log_entry)
+        return ActivityLogger._insert(db, row)
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        user: User,
+        action: str,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        details: Optional[dict] = None,
+        request: Optional[Request] = None,
+    ) -> None:
+        """
+        Log a user activity through the batched write buffer.
+
+        Falls back to a direct insert when the buffer is not running
+        (Celery workers, scripts, tests).
+        """
+        row = ActivityLogger._row(
+            user, action, resource_type, resource_id, details, *_client_info(request)
+        )
+        if not activity_log_buffer.push(row):
+            ActivityLogger._insert(db, row)
+
+    @staticmethod
+    def _row(
+        user: User,
+        action: str,
+        resource_type: Optional[str],
+        resource_id: Optional[str],
+        details: Optional[dict],
+        ip_address: Optional[str],
+        user_agent: Optional[str],
+    ) -> dict:
+        """Column values of one log row (id and created_at generated here)"""
+        return {
+            "id": uuid.uuid4(),
+            "user_id": user.id,
+            "user_tracking_id": user.tracking_id,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": str(resource_id) if resource_id else None,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "created_at": datetime.utcnow(),
+        }
+
+    @staticmethod
+    def _insert(db: Session, row: dict) -> ActivityLog:
+        """
+        Insert one row and commit. Every column is set client-side, so there
+        is nothing to read back (no RETURNING, no refresh).
+        """
+        db.execute(insert(ActivityLog), row)
         db.commit()
-        db.refresh(log_entry)
-        
-        return log_entry
+        return ActivityLog(**row)
+
+
+def _client_info(request: Optional[Request]) -> tuple:
+    """(ip_address, user_agent) of a request, (None, None) without one"""
+    if request is None:
+        return None, None
+    return (
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+    )
 
 
 # Actions constants for consistency
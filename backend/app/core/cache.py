@@ -95,3 +95,53 @@ def cache_delete(key: str):
         redis_client.delete(f"cache:{key}")
     except Exception:
         pass
+
+
+# Filter stats of GET /leads, dropped by every writer of opportunity rows
+LEAD_STATS_CACHE_KEY = "lead_stats:v1"
+
+# GET /radar/stats and /radar/reports (radar:stats:{days}, radar:reports:{limit}),
+# dropped by auto_radar_harvest whenever it writes a report
+RADAR_CACHE_PREFIX = "radar"
+
+
+# ================================================================
+# IDEMPOTENCY KEYS
+# ================================================================
+
+IDEMPOTENCY_PENDING = "__pending__"
+
+
+def idempotency_begin(key: str, ttl: int = 60) -> tuple[bool, Optional[Any]]:
+    """
+    Claim an idempotency key with SET NX.
+
+    Returns (True, None) when this request owns the key (or Redis is down),
+    otherwise (False, response) where response is the stored result of the
+    first request, or None while that request is still running.
+    """
+    try:
+        if redis_client.set(f"idem:{key}", IDEMPOTENCY_PENDING, nx=True, ex=ttl):
+            return True, None
+        stored = redis_client.get(f"idem:{key}")
+    except Exception:
+        return True, None  # Redis error, process normally
+    if not stored or stored == IDEMPOTENCY_PENDING:
+        return False, None
+    return False, json.loads(stored)
+
+
+def idempotency_complete(key: str, response: Any, ttl: int = 60):
+    """Store the response replayed to duplicates of a claimed key"""
+    try:
+        redis_client.setex(f"idem:{key}", ttl, json.dumps(response, default=str))
+    except Exception:
+        pass
+
+
+def idempotency_release(key: str):
+    """Forget a claimed key after a failure so the client can retry"""
+    try:
+        redis_client.delete(f"idem:{key}")
+    except Exception:
+        pass
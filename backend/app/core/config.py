@@ -106,6 +106,10 @@ class Settings(BaseSettings):
     scoring_penalty_no_info: int = -4
     scoring_penalty_promo: int = -2
     
+    # Activity logs (monthly partitions). Audit history is kept forever
+    # unless a retention (in months) is configured.
+    activity_log_retention_months: Optional[int] = None
+    
     # Rate Limiting
     rate_limit_per_minute: int = 60
     
@@ -116,6 +120,7 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = False
+        frozen = True
 
 
 @lru_cache()
@@ -1,15 +1,23 @@
 """
 Security utilities - Password hashing, JWT tokens
 """
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Dict, Optional, Tuple, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from .config import settings
 
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: argon2id (OWASP parameters) for new hashes; existing
+# bcrypt hashes still verify and are flagged for rehash
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -17,6 +25,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and return a new hash if the stored one is outdated
+    (bcrypt or old argon2 parameters).
+
+    Returns:
+        Tuple of (is_valid, new_hash or None)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
@@ -77,14 +99,31 @@ def decode_token(token: str) -> Optional[dict]:
         return None
 
 
+# Decoded tokens: token -> (type, user_id, exp timestamp). The SPA sends
+# the same access token on every call, so the HMAC check and JSON decode
+# run once per token instead of once per request.
+_TOKEN_CACHE_MAX = 4096
+_token_cache: Dict[str, Tuple[Optional[str], Optional[str], float]] = {}
+
+
 def verify_token(token: str, token_type: str = "access") -> Optional[str]:
     """Verify token and return user_id if valid"""
-    payload = decode_token(token)
-    if payload is None:
+    cached = _token_cache.get(token)
+    if cached is None:
+        payload = decode_token(token)
+        if payload is None:
+            return None
+        cached = (payload.get("type"), payload.get("sub"), payload.get("exp", float("inf")))
+        if len(_token_cache) >= _TOKEN_CACHE_MAX:
+            _token_cache.clear()
+        _token_cache[token] = cached
+
+    cached_type, user_id, expires_at = cached
+    if expires_at <= time.time():
+        _token_cache.pop(token, None)
         return None
-    if payload.get("type") != token_type:
+    if cached_type != token_type:
         return None
-    user_id: str = payload.get("sub")
     if user_id is None:
         return None
     return user_id
@@ -2,12 +2,27 @@
 Two-Factor Authentication (2FA) implementation using TOTP.
 """
 
+import hashlib
+import hmac
+import struct
+import time
 import pyotp
 import qrcode
 import io
 import base64
+from functools import lru_cache
 from typing import Optional, Tuple
-from datetime import datetime
+
+
+@lru_cache(maxsize=1024)
+def _totp_hmac(secret: str) -> "hmac.HMAC":
+    """
+    HMAC-SHA1 keyed with the decoded TOTP secret.
+
+    Base32 decoding and the HMAC key schedule are done once per secret;
+    each code is computed on a copy().
+    """
+    return hmac.new(pyotp.TOTP(secret).byte_secret(), digestmod=hashlib.sha1)
 
 
 class TwoFactorAuth:
@@ -15,6 +30,8 @@ class TwoFactorAuth:
     
     ISSUER_NAME = "Opportunities Radar"
     VALID_WINDOW = 1  # Accept codes 30 seconds before/after
+    INTERVAL = 30  # pyotp defaults: 30s steps, 6 digits, SHA1
+    DIGITS = 6
     
     @staticmethod
     def generate_secret() -> str:
@@ -108,11 +125,27 @@ class TwoFactorAuth:
         # Clean the code (remove spaces/dashes)
         code = code.replace(" ", "").replace("-", "")
         
-        if len(code) != 6 or not code.isdigit():
+        if len(code) != cls.DIGITS or not code.isdigit():
             return False
         
-        totp = cls.get_totp(secret)
-        return totp.verify(code, valid_window=cls.VALID_WINDOW)
+        # Check every window without short-circuiting so timing does not
+        # depend on which window (if any) matched
+        base = _totp_hmac(secret)
+        counter = int(time.time()) // cls.INTERVAL
+        matched = False
+        for offset in range(-cls.VALID_WINDOW, cls.VALID_WINDOW + 1):
+            matched |= hmac.compare_digest(code, cls._code_at(base, counter + offset))
+        return matched
+    
+    @classmethod
+    def _code_at(cls, base: "hmac.HMAC", counter: int) -> str:
+        """RFC 4226 HOTP value for a counter (dynamic truncation)."""
+        mac = base.copy()
+        mac.update(struct.pack(">Q", counter))
+        digest = mac.digest()
+        offset = digest[-1] & 0x0F
+        value = struct.unpack(">I", digest[offset:offset + 4])[0] & 0x7FFFFFFF
+        return str(value % 10 ** cls.DIGITS).zfill(cls.DIGITS)
     
     @staticmethod
     def generate_backup_codes(count: int = 10) -> list[str]:
@@ -151,15 +184,17 @@ class TwoFactorAuth:
             Tuple of (is_valid, used_code)
         """
         # Normalize the code
-        normalized = provided_code.upper().replace(" ", "")
+        provided_normalized = provided_code.upper().replace(" ", "").replace("-", "").encode()
         
-        for stored in stored_codes:
-            stored_normalized = stored.replace("-", "")
-            provided_normalized = normalized.replace("-", "")
-            
-            if stored_normalized == provided_normalized:
-                return True, stored
+        # Compare against every stored code in constant time, remembering
+        # the match position instead of returning early
+        used_index = 0
+        for index, stored in enumerate(stored_codes, start=1):
+            matched = hmac.compare_digest(stored.replace("-", "").encode(), provided_normalized)
+            used_index = max(used_index, matched * index)
         
+        if used_index:
+            return True, stored_codes[used_index - 1]
         return False, None
 
 
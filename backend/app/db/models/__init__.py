@@ -39,7 +39,9 @@ from .dossier import (
     WebEnrichmentRun,
 )
 # Activity Log
-from .activity_log import ActivityLog
+from .activity_log import ActivityLog, ActivityLogHourlyRollup
+# Celery task outbox
+from .task_outbox import TaskOutbox
 
 # Radar Features (nouvelles fonctionnalités)
 from .radar_features import (
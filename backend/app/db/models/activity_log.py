@@ -3,7 +3,7 @@ Activity Log model for tracking user actions
 """
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, JSON, Integer
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, JSON, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -18,10 +18,10 @@ class ActivityLog(Base):
     
     # User info
     user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
-    user_tracking_id = Column(String(10), nullable=False, index=True)  # Hidden ID like "USR-A1B2C3"
+    user_tracking_id = Column(String(10), nullable=False)  # Hidden ID like "USR-A1B2C3"
     
     # Action details
-    action = Column(String(100), nullable=False, index=True)  # login, logout, view, create, update, delete, etc.
+    action = Column(String(100), nullable=False)  # login, logout, view, create, update, delete, etc.
     resource_type = Column(String(100), nullable=True)  # opportunity, artist, dossier, etc.
     resource_id = Column(String(100), nullable=True)  # ID of the resource
     
@@ -30,11 +30,31 @@ class ActivityLog(Base):
     ip_address = Column(String(50), nullable=True)
     user_agent = Column(Text, nullable=True)
     
-    # Timestamp
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # Timestamp (partition key: activity_logs is RANGE-partitioned by month)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     
     # Relationships
     user = relationship("User", backref="activity_logs")
     
+    # Log views filter on one user or action and read the newest entries first
+    __table_args__ = (
+        Index('ix_activity_logs_user_tracking_id_created_at', user_tracking_id, created_at.desc()),
+        Index('ix_activity_logs_action_created_at', action, created_at.desc()),
+    )
+    
     def __repr__(self):
         return f"<ActivityLog {self.user_tracking_id} - {self.action}>"
+
+
+class ActivityLogHourlyRollup(Base):
+    """Hourly event counts per action and user, maintained by a Celery task"""
+    __tablename__ = "activity_log_hourly_rollup"
+
+    hour = Column(DateTime, primary_key=True)  # date_trunc('hour', created_at)
+    action = Column(String(100), primary_key=True)
+    user_tracking_id = Column(String(10), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    event_count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<ActivityLogHourlyRollup {self.hour} {self.action} {self.event_count}>"
@@ -2,7 +2,7 @@
 Model for storing artist analysis history
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Text, Index
 from app.db.base import Base
 
 
@@ -92,5 +92,10 @@ class ArtistAnalysis(Base):
     analyzed_by_user_id = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
     
+    __table_args__ = (
+        # Latest analysis per artist (DISTINCT ON artist_name ORDER BY id DESC)
+        Index('ix_artist_analyses_name_id', artist_name, id.desc()),
+    )
+    
     def __repr__(self):
         return f"<ArtistAnalysis {self.artist_name} - Score:{self.ai_score} - {self.fee_min}-{self.fee_max}€>"
@@ -16,7 +16,7 @@ from enum import Enum as PyEnum
 
 from sqlalchemy import (
     Column, String, Text, Float, Integer, Boolean, DateTime, ForeignKey,
-    Enum, UniqueConstraint, Index, func
+    Enum, UniqueConstraint, Index, func, text
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -119,6 +119,11 @@ class CollectionV2(Base):
     documents = relationship("SourceDocumentV2", back_populates="collection")
     creator = relationship("User", foreign_keys=[created_by])
 
+    __table_args__ = (
+        # Pagination keyset de GET /collections
+        Index('ix_collections_created_at_id', created_at.desc(), id.desc()),
+    )
+
     def set_running(self):
         self.status = CollectionStatus.RUNNING.value
         self.started_at = datetime.utcnow()
@@ -155,6 +160,11 @@ class CollectionLog(Base):
     # Relations
     collection = relationship("CollectionV2", back_populates="logs")
 
+    __table_args__ = (
+        # Pagination keyset de GET /collections/{id}/logs
+        Index('ix_collection_logs_collection_ts_id', collection_id, ts.desc(), id.desc()),
+    )
+
 
 class LeadItem(Base):
     """Source de vérité unique pour opportunités et candidats dossiers"""
@@ -201,6 +211,21 @@ class LeadItem(Base):
     evidence_items = relationship("Evidence", back_populates="lead_item", cascade="all, delete-orphan")
     assignee = relationship("User", foreign_keys=[assigned_to])
 
+    __table_args__ = (
+        # Tris de GET /leads (mêmes expressions que _OPPORTUNITY_SORT_KEYS)
+        Index('ix_lead_items_opp_score_id', func.coalesce(score_base, 0).desc(), id.desc(),
+              postgresql_where=text("kind = 'OPPORTUNITY'")),
+        Index('ix_lead_items_opp_status_score_id', status, func.coalesce(score_base, 0).desc(), id.desc(),
+              postgresql_where=text("kind = 'OPPORTUNITY'")),
+        Index('ix_lead_items_opp_assigned_score_id', assigned_to, func.coalesce(score_base, 0).desc(), id.desc(),
+              postgresql_where=text("kind = 'OPPORTUNITY'")),
+        Index('ix_lead_items_opp_deadline_id',
+              func.coalesce(deadline_at, text("'9999-12-31 00:00:00+00'::timestamptz")), id,
+              postgresql_where=text("kind = 'OPPORTUNITY'")),
+    )
+    # updated_at (onupdate=now()) relu par RETURNING dans l'UPDATE : pas de refresh
+    __mapper_args__ = {"eager_defaults": True}
+
     @staticmethod
     def compute_canonical_hash(title: str, org: str = None, deadline: datetime = None, city: str = None) -> str:
         """Calcule un hash canonique pour dédup sans URL"""
@@ -258,7 +283,7 @@ class SourceDocumentV2(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     lead_item_id = Column(UUID(as_uuid=True), ForeignKey('lead_items.id', ondelete='CASCADE'), nullable=True)
     collection_id = Column(UUID(as_uuid=True), ForeignKey('collections.id', ondelete='SET NULL'), nullable=True)
-    dossier_id = Column(UUID(as_uuid=True), ForeignKey('dossiers_v2.id', ondelete='SET NULL'), nullable=True)
+    dossier_id = Column(UUID(as_uuid=True), ForeignKey('dossiers_v2.id', ondelete='CASCADE'), nullable=True)
     source_id = Column(Integer, nullable=True)  # Reference informative, pas de FK
     url = Column(String(2000), nullable=True)
     doc_type = Column(String(30), nullable=True)
@@ -276,6 +301,14 @@ class SourceDocumentV2(Base):
     dossier = relationship("DossierV2", back_populates="source_documents")
     evidence_items = relationship("Evidence", back_populates="source_document")
 
+    __table_args__ = (
+        # Sources consultées d'une collecte (DISTINCT url) en index-only scan
+        Index(
+            'ix_source_documents_v2_collection_url', 'collection_id', 'url',
+            postgresql_where=url.isnot(None),
+        ),
+    )
+
     @staticmethod
     def compute_content_hash(content: str) -> str:
         return hashlib.sha256(content.encode()).hexdigest()
@@ -307,8 +340,17 @@ class DossierV2(Base):
 
     # Relations
     lead_item = relationship("LeadItem", back_populates="dossier")
-    evidence_items = relationship("Evidence", back_populates="dossier", cascade="all, delete-orphan")
-    source_documents = relationship("SourceDocumentV2", back_populates="dossier")
+    # Enfants supprimés par ON DELETE CASCADE, sans les charger
+    evidence_items = relationship("Evidence", back_populates="dossier", cascade="all, delete-orphan", passive_deletes=True)
+    source_documents = relationship("SourceDocumentV2", back_populates="dossier", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        # Tri par défaut de GET /dossiers (updated_at DESC), avec ou sans filtre d'état
+        Index('ix_dossiers_v2_updated_id', updated_at.desc(), id.desc()),
+        Index('ix_dossiers_v2_state_updated_id', state, updated_at.desc(), id.desc()),
+    )
+    # updated_at (onupdate=now()) relu par RETURNING dans l'UPDATE : pas de refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     def set_ready(self):
         self.state = DossierState.READY.value
@@ -9,7 +9,7 @@ from datetime import datetime
 from enum import Enum as PyEnum
 from sqlalchemy import (
     Column, String, Text, DateTime, Enum, Integer, Numeric, 
-    JSON, ForeignKey, Index, UniqueConstraint
+    JSON, ForeignKey, Index, UniqueConstraint, func
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -104,6 +104,8 @@ class SourceDocument(Base):
     
     __table_args__ = (
         Index('ix_source_docs_opp_type', 'opportunity_id', 'doc_type'),
+        # GET /dossiers/{id}/sources: newest first per opportunity
+        Index('ix_source_docs_opp_created', 'opportunity_id', created_at.desc()),
     )
     
     def __repr__(self):
@@ -219,6 +221,7 @@ class Dossier(Base):
     
     __table_args__ = (
         Index('ix_dossiers_state_score', 'state', 'score_final'),
+        Index('ix_dossiers_score_id', func.coalesce(score_final, 0).desc(), id.desc()),
     )
     
     def __repr__(self):
@@ -300,7 +303,9 @@ class DossierEvidence(Base):
     source_document = relationship("SourceDocument")
     
     __table_args__ = (
-        Index('ix_evidence_dossier_field', 'dossier_id', 'field_key'),
+        # GET /dossiers/{id}/evidence: by confidence, with or without field_key
+        Index('ix_evidence_dossier_field_confidence', 'dossier_id', 'field_key', confidence.desc()),
+        Index('ix_evidence_dossier_confidence', 'dossier_id', confidence.desc()),
     )
     
     def __repr__(self):
@@ -354,5 +359,10 @@ class WebEnrichmentRun(Base):
     # Relationships
     dossier = relationship("Dossier", backref="enrichment_runs")
     
+    __table_args__ = (
+        # GET /dossiers/{id}/enrichments: newest first
+        Index('ix_enrichment_runs_dossier_started', 'dossier_id', started_at.desc()),
+    )
+    
     def __repr__(self):
         return f"<WebEnrichmentRun {self.status} for dossier {self.dossier_id}>"
@@ -79,7 +79,7 @@ class Entity(Base):
     briefs = relationship("Brief", back_populates="entity", cascade="all, delete-orphan")
     
     __table_args__ = (
-        Index('ix_entities_name_type', 'normalized_name', 'entity_type'),
+        Index('uq_entities_name_type', 'normalized_name', 'entity_type', unique=True),
     )
 
     @staticmethod
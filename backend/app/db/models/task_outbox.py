@@ -0,0 +1,32 @@
+"""
+Task outbox model - Celery tasks recorded in the same transaction as the
+data they act on, then dispatched to the broker
+"""
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+from app.db.base import Base
+
+
+class TaskOutbox(Base):
+    """Pending Celery task; its id is used as the Celery task id"""
+    __tablename__ = "task_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    task_name = Column(String(255), nullable=False)
+    kwargs = Column(JSONB, nullable=False, default=dict)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    dispatched_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # The dispatcher only ever scans undispatched rows
+        Index(
+            'ix_task_outbox_pending', 'created_at',
+            postgresql_where=text('dispatched_at IS NULL'),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<TaskOutbox {self.task_name} {self.id}>"
@@ -33,7 +33,7 @@ class User(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    tracking_id = Column(String(15), unique=True, default=generate_tracking_id, index=True)  # Hidden ID for superadmin
+    tracking_id = Column(String(15), unique=True, default=generate_tracking_id, nullable=False, index=True)  # Hidden ID for superadmin
     email = Column(String(255), unique=True, index=True, nullable=True)  # Nullable for SSO without email
     hashed_password = Column(String(255), nullable=True)  # Nullable for SSO users
     full_name = Column(String(255), nullable=True)
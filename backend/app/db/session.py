@@ -1,34 +1,88 @@
 """
 Database session configuration
 """
-from sqlalchemy import create_engine, event
+import json
+import math
+from datetime import date, datetime, time
+from enum import Enum
+from uuid import UUID
+
+import orjson
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 from typing import Generator
 
 from app.core.config import settings
 
+
+def _has_non_finite(value) -> bool:
+    """True if a NaN/Infinity float is nested anywhere in value"""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(v) for v in value)
+    return False
+
+
+def _json_default(obj):
+    """Stdlib fallback for the types orjson encodes natively"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_serializer(value) -> str:
+    """
+    JSON/JSONB bind values encoded with orjson (also handles UUID/datetime/Enum).
+
+    orjson differs from the stdlib encoder on two inputs, both handled here:
+    - NaN/Infinity would be written as null: raise ValueError like
+      json.dumps(allow_nan=False) instead of silently storing null
+    - integers wider than 64 bits raise: fall back to the stdlib encoder
+    """
+    try:
+        encoded = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        return json.dumps(value, allow_nan=False, default=_json_default)
+    # Only walk the value when a null was emitted (rare in bound payloads)
+    if b"null" in encoded and _has_non_finite(value):
+        raise ValueError("Out of range float values are not JSON compliant")
+    return encoded.decode()
+
+
+# PostgreSQL: apply the query timeout (30 seconds) once per connection
+# instead of issuing a SET before every statement
+connect_args = {}
+if settings.database_url.startswith("postgresql"):
+    connect_args["options"] = "-c statement_timeout=30000"
+
+# Pool size, also used to size the threadpool running sync endpoints (main.py)
+POOL_SIZE = 20
+MAX_OVERFLOW = 40
+
 # Create engine with optimized pool settings
 engine = create_engine(
     settings.database_url,
     poolclass=QueuePool,
     pool_pre_ping=True,      # Verify connections before use
-    pool_size=20,            # Base pool size
-    max_overflow=30,         # Additional connections when pool is full
+    pool_size=POOL_SIZE,     # Base pool size
+    max_overflow=MAX_OVERFLOW,  # Additional connections when pool is full
     pool_timeout=30,         # Seconds to wait for connection
-    pool_recycle=1800,       # Recycle connections after 30 minutes
+    pool_recycle=1800,       # Recycle connections after 30 minutes (below proxy/RDS idle timeouts)
     echo=False,              # Disable SQL logging in production
+    query_cache_size=1200,   # Compiled SQL cache (default 500): keeps every endpoint's statements warm
+    connect_args=connect_args,
+    json_serializer=_json_serializer,
 )
 
 
-# Optimize SQLAlchemy queries
-@event.listens_for(engine, "before_cursor_execute")
-def receive_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    # Add query timeout for PostgreSQL (30 seconds)
-    if settings.database_url.startswith("postgresql"):
-        cursor.execute("SET statement_timeout = 30000")
-
-
 # Session factory with optimizations
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -39,7 +93,12 @@ SessionLocal = sessionmaker(
 
 
 def get_db() -> Generator:
-    """Dependency to get database session"""
+    """
+    Dependency to get database session.
+
+    FastAPI caches dependencies per request, so get_current_user and the
+    endpoint receive this same session (and a single pooled connection).
+    """
     db = SessionLocal()
     try:
         yield db
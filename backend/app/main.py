@@ -10,7 +10,11 @@ from starlette.middleware.base import BaseHTTPMiddleware
 import logging
 import time
 
+from anyio import to_thread
+
 from app.core.config import settings
+from app.core.activity_logger import activity_log_buffer
+from app.db.session import POOL_SIZE, MAX_OVERFLOW
 
 # ============================================================================
 # API ROUTERS - V1 (Legacy Opportunity-based)
@@ -33,7 +37,7 @@ from app.api.collection import router as collection_router
 from app.api.websocket import router as websocket_router
 from app.api.collect import router as collect_router
 from app.api.dossiers import router as dossiers_router
-from app.api.progress import router as progress_router
+from app.api.progress import router as progress_router, close_redis as close_progress_redis
 from app.api.radar import router as radar_router
 from app.api.activity import router as activity_router
 from app.api.health import router as health_router
@@ -110,7 +114,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["X-Process-Time"],
+    expose_headers=["X-Process-Time", "X-Next-Cursor"],
     max_age=600,  # Cache preflight for 10 minutes
 )
 
@@ -182,9 +186,16 @@ async def startup_event():
     logger.info(f"Starting {settings.app_name}")
     # Database tables are managed by Alembic migrations
     # No need for create_all() - it causes conflicts with existing indexes
+    activity_log_buffer.start()
+    # Sync endpoints run on anyio's threadpool (40 threads by default): give it
+    # one thread per pooled connection so requests don't queue while
+    # connections are free
+    to_thread.current_default_thread_limiter().total_tokens = POOL_SIZE + MAX_OVERFLOW
     logger.info("Application started successfully")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"Shutting down {settings.app_name}")
+    await activity_log_buffer.stop()
+    await close_progress_redis()
@@ -159,10 +159,21 @@ class CollectionDetailResponse(CollectionResponse):
 class CollectionListResponse(BaseModel):
     """Liste paginée des collectes"""
     items: List[CollectionResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # None en pagination keyset (curseur)
+    page: Optional[int] = None
     page_size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+
+
+class CollectionLogPage(BaseModel):
+    """Logs paginés d'une collecte"""
+    items: List[CollectionLogSchema]
+    total: Optional[int] = None  # None en pagination keyset (curseur)
+    page: Optional[int] = None
+    page_size: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 # ================================================================
@@ -233,16 +244,26 @@ class OpportunityDetailResponse(OpportunityResponse):
 class OpportunityListResponse(BaseModel):
     """Liste paginée des opportunités"""
     items: List[OpportunityResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # None en pagination keyset (curseur)
+    page: Optional[int] = None
     page_size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
     # Stats pour filtres
     score_distribution: Optional[Dict[str, int]] = None  # {0-20: 5, 20-40: 10, ...}
     budget_distribution: Optional[Dict[str, int]] = None
     status_counts: Optional[Dict[str, int]] = None
 
 
+class OpportunityPage(BaseModel):
+    """Résultats paginés d'une collecte"""
+    items: List[OpportunityResponse]
+    total: int
+    page: int
+    page_size: int
+    pages: int
+
+
 class OpportunityFilters(BaseModel):
     """Filtres pour opportunités"""
     search: Optional[str] = None
@@ -355,10 +376,11 @@ class DossierDetailResponse(UUIDBaseModel):
 class DossierListResponse(BaseModel):
     """Liste paginée des dossiers"""
     items: List[DossierResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # None en pagination keyset (curseur)
+    page: Optional[int] = None
     page_size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class DossierFilters(BaseModel):
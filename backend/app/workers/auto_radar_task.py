@@ -13,6 +13,7 @@ from sqlalchemy import and_
 from app.workers.celery_app import celery_app
 from app.workers.task_logger import get_task_logger, Colors
 from app.workers.progress_notifier import get_progress_notifier
+from app.core.cache import RADAR_CACHE_PREFIX, invalidate_cache
 from app.db.session import SessionLocal
 from app.db.models.source import SourceConfig
 from app.db.models.opportunity import Opportunity, OpportunityStatus, SourceType
@@ -373,6 +374,7 @@ def auto_radar_harvest(self):
         )
         db.add(report)
         db.commit()
+        invalidate_cache(RADAR_CACHE_PREFIX)
         
         logger.success(f"🎉 Récolte terminée en {duration:.1f}s")
         logger.info(f"Rapport ID: {report_id}, Créées: {stats['opportunities_created']}, Excellentes: {stats['excellent']}")
@@ -400,6 +402,7 @@ def auto_radar_harvest(self):
             )
             db.add(report)
             db.commit()
+            invalidate_cache(RADAR_CACHE_PREFIX)
         except:
             pass
         
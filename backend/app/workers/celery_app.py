@@ -72,6 +72,26 @@ celery_app.conf.beat_schedule = {
         "schedule": crontab(minute="0", hour="2"),
         "kwargs": {"score_threshold": 70, "limit": 20},
     },
+    # Activity log partitions - create upcoming months, drop expired ones
+    "maintain-activity-log-partitions": {
+        "task": "app.workers.tasks.maintain_activity_log_partitions",
+        "schedule": crontab(minute="30", hour="0"),
+    },
+    # Task outbox - send tasks whose dispatch after commit failed
+    "dispatch-task-outbox": {
+        "task": "app.workers.tasks.dispatch_task_outbox",
+        "schedule": 5.0,
+    },
+    # Task outbox - delete rows dispatched more than a day ago
+    "purge-task-outbox": {
+        "task": "app.workers.tasks.purge_task_outbox",
+        "schedule": crontab(minute="45", hour="0"),
+    },
+    # Activity log hourly rollup for admin stats
+    "rollup-activity-logs": {
+        "task": "app.workers.tasks.rollup_activity_logs",
+        "schedule": crontab(minute="*/5"),
+    },
     # ============================================================================
     # RADAR FEATURES - Nouvelles fonctionnalités
     # ============================================================================
@@ -27,6 +27,7 @@ from app.db.models.collections import (
     DossierState, EvidenceProvenance
 )
 from app.db.models.source import SourceConfig
+from app.core.cache import LEAD_STATS_CACHE_KEY, cache_delete
 from app.core.config import settings
 from app.workers.task_logger import TaskLogger, get_task_logger, Colors
 
@@ -137,6 +138,8 @@ def run_standard_collection(self, collection_id: str):
         }
         
         db.commit()
+        if total_new:
+            cache_delete(LEAD_STATS_CACHE_KEY)
         
         log.success(f"Collecte terminée en {log.elapsed_str()}", 
                    new=total_new, duplicates=total_duplicates, save=True)
@@ -0,0 +1,106 @@
+"""
+Transactional outbox for Celery tasks.
+
+API endpoints call enqueue_task() before committing, so the task row is
+persisted atomically with the data it refers to (a broker outage can no
+longer leave a run stuck in RUNNING with no task). Rows are sent to the
+broker right after the commit by dispatch_outbox(); whatever could not be
+sent is picked up by the dispatch_task_outbox beat task. Dispatched rows
+are kept for DISPATCHED_RETENTION (to trace recent dispatches), then
+deleted by the purge_task_outbox beat task.
+"""
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.models.task_outbox import TaskOutbox
+from app.db.session import SessionLocal
+from app.workers.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+
+DISPATCHED_RETENTION = timedelta(days=1)
+
+
+def enqueue_task(db: Session, task, **kwargs) -> str:
+    """
+    Record a task call in the current transaction (not committed here).
+
+    Returns the Celery task id the task will run under.
+    """
+    row = TaskOutbox(task_name=task.name, kwargs=kwargs)
+    db.add(row)
+    db.flush()
+    return str(row.id)
+
+
+def dispatch_outbox(db: Session, ids: Optional[List[str]] = None) -> int:
+    """
+    Send pending outbox rows to the broker and mark them dispatched.
+
+    Rows are locked with SKIP LOCKED, so concurrent dispatchers (the API
+    right after its commit, the beat task) never send the same row twice.
+    Returns the number of tasks sent.
+    """
+    query = db.query(TaskOutbox).filter(TaskOutbox.dispatched_at.is_(None))
+    if ids is not None:
+        query = query.filter(TaskOutbox.id.in_([uuid.UUID(i) for i in ids]))
+    rows = query.order_by(TaskOutbox.created_at).limit(BATCH_SIZE).with_for_update(
+        skip_locked=True
+    ).all()
+    if not rows:
+        db.commit()
+        return 0
+
+    sent = 0
+    try:
+        # One broker connection for the whole batch
+        with celery_app.producer_or_acquire() as producer:
+            for row in rows:
+                celery_app.send_task(
+                    row.task_name,
+                    kwargs=row.kwargs,
+                    task_id=str(row.id),
+                    producer=producer,
+                )
+                row.dispatched_at = datetime.utcnow()
+                sent += 1
+    except Exception as e:
+        logger.warning(f"Outbox dispatch stopped after {sent}/{len(rows)} tasks: {e}")
+    db.commit()
+    return sent
+
+
+def dispatch_after_commit(db: Session, ids: List[str]) -> None:
+    """Best-effort immediate dispatch; the beat task retries on failure"""
+    try:
+        dispatch_outbox(db, ids)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Outbox dispatch deferred to beat: {e}")
+
+
+def dispatch_in_background(ids: List[str]) -> None:
+    """
+    dispatch_after_commit for FastAPI BackgroundTasks: runs after the
+    response is sent, with its own session (the request's is closed by then).
+    """
+    db = SessionLocal()
+    try:
+        dispatch_after_commit(db, ids)
+    finally:
+        db.close()
+
+
+def purge_outbox(db: Session, older_than: timedelta = DISPATCHED_RETENTION) -> int:
+    """Delete rows dispatched more than older_than ago; returns the count"""
+    deleted = db.query(TaskOutbox).filter(
+        TaskOutbox.dispatched_at < datetime.utcnow() - older_than
+    ).delete(synchronize_session=False)
+    db.commit()
+    return deleted
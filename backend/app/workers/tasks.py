@@ -428,6 +428,123 @@ def rescore_all_opportunities():
         db.close()
 
 
+@celery_app.task
+def maintain_activity_log_partitions(months_ahead: int = 2):
+    """
+    Ensure monthly activity_logs partitions exist ahead of time and, when
+    activity_log_retention_months is set, drop partitions older than the
+    retention window (instant, unlike DELETE).
+    """
+    from sqlalchemy import text
+    from app.core.config import settings
+    
+    db = get_db()
+    try:
+        db.execute(text("""
+            SELECT ensure_activity_log_partition(month::date)
+            FROM generate_series(
+                date_trunc('month', now()),
+                date_trunc('month', now()) + make_interval(months => :ahead),
+                interval '1 month'
+            ) AS month
+        """), {"ahead": months_ahead})
+        
+        dropped = []
+        retention = settings.activity_log_retention_months
+        if retention is not None:
+            now = datetime.utcnow()
+            months = now.year * 12 + now.month - 1 - retention
+            cutoff = f"activity_logs_{months // 12:04d}_{months % 12 + 1:02d}"
+            
+            partitions = db.execute(text("""
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = 'activity_logs'
+            """)).scalars().all()
+            
+            # Monthly partition names sort chronologically (activity_logs_YYYY_MM);
+            # activity_logs_default is never dropped
+            dropped = sorted(
+                p for p in partitions
+                if re.fullmatch(r"activity_logs_\d{4}_\d{2}", p) and p < cutoff
+            )
+            for name in dropped:
+                db.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+        
+        db.commit()
+        return {"dropped": dropped}
+    finally:
+        db.close()
+
+
+@celery_app.task
+def rollup_activity_logs():
+    """
+    Refresh activity_log_hourly_rollup for completed hours.
+    
+    The last rolled-up hour is recomputed as well, since buffered activity
+    log writes can land shortly after the hour closes.
+    """
+    from sqlalchemy import text, func
+    from app.db.models.activity_log import ActivityLog, ActivityLogHourlyRollup
+    
+    db = get_db()
+    try:
+        last_hour = db.query(func.max(ActivityLogHourlyRollup.hour)).scalar()
+        if last_hour is None:
+            last_hour = db.query(func.date_trunc("hour", func.min(ActivityLog.created_at))).scalar()
+        if last_hour is None:
+            return {"hours": 0}
+        
+        db.execute(
+            text("DELETE FROM activity_log_hourly_rollup WHERE hour >= :from_hour"),
+            {"from_hour": last_hour},
+        )
+        result = db.execute(text("""
+            INSERT INTO activity_log_hourly_rollup (hour, action, user_tracking_id, user_id, event_count)
+            SELECT date_trunc('hour', created_at), action, user_tracking_id, max(user_id), count(*)
+            FROM activity_logs
+            WHERE created_at >= :from_hour
+              AND created_at < date_trunc('hour', now() AT TIME ZONE 'UTC')
+            GROUP BY 1, 2, 3
+        """), {"from_hour": last_hour})
+        db.commit()
+        
+        return {"from_hour": last_hour.isoformat(), "rows": result.rowcount}
+    finally:
+        db.close()
+
+
+@celery_app.task
+def dispatch_task_outbox():
+    """Send outbox tasks that were not dispatched right after their commit"""
+    from app.workers.outbox import dispatch_outbox
+    
+    db = get_db()
+    try:
+        sent = total = dispatch_outbox(db)
+        while sent:
+            sent = dispatch_outbox(db)
+            total += sent
+        return {"dispatched": total}
+    finally:
+        db.close()
+
+
+@celery_app.task
+def purge_task_outbox():
+    """Delete outbox rows dispatched long enough ago"""
+    from app.workers.outbox import purge_outbox
+    
+    db = get_db()
+    try:
+        return {"deleted": purge_outbox(db)}
+    finally:
+        db.close()
+
+
 @celery_app.task
 def check_and_send_notifications():
     """Check for opportunities that need notifications"""
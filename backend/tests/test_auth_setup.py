@@ -0,0 +1,34 @@
+"""
+Tests for the public /auth/setup-check contract
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import auth
+from app.db import get_db
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+class TestSetupCheck:
+    """user_count stays an int whether or not users exist"""
+
+    @pytest.mark.parametrize("exists, expected", [
+        (False, {"needs_setup": True, "user_count": 0}),
+        (True, {"needs_setup": False, "user_count": 1}),
+    ])
+    def test_setup_check(self, client, exists, expected):
+        with patch.object(auth, "_any_user_exists", return_value=exists):
+            response = client.get("/api/v1/auth/setup-check")
+        assert response.status_code == 200
+        assert response.json() == expected
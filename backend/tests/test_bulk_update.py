@@ -0,0 +1,85 @@
+"""
+Tests for the bulk opportunity update (single UPDATE with a JSONB tag merge)
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from app.api import leads
+from app.db.models.collections import LeadItem
+from app.schemas.collections import BulkUpdateOpportunitiesRequest
+
+
+def _run(db: MagicMock, **fields) -> dict:
+    request = BulkUpdateOpportunitiesRequest(ids=["1", "2"], **fields)
+    with patch.object(leads, "cache_delete"):
+        return leads.bulk_update_opportunities(request, db=db, current_user=MagicMock())
+
+
+def _db(updated: int) -> MagicMock:
+    db = MagicMock()
+    query = db.query.return_value.filter.return_value
+    query.update.return_value = updated
+    query.count.return_value = updated
+    return db
+
+
+def _tags_update(db: MagicMock):
+    """(SQL, bind params) of the tags expression passed to query.update()"""
+    values = db.query.return_value.filter.return_value.update.call_args.args[0]
+    compiled = values[LeadItem.tags].compile(dialect=postgresql.dialect())
+    return str(compiled), list(compiled.params.values())
+
+
+class TestBulkTagMerge:
+    """Tests for the tags_add / tags_remove expression"""
+
+    def test_add_dedupes_and_merges(self):
+        db = _db(2)
+        assert _run(db, tags_add=["a", "b", "a"])["updated"] == 2
+        sql, params = _tags_update(db)
+        # coalesce(tags, '[]') - '{a,b}' || '["a","b"]': existing copies are
+        # removed before concatenating, so no tag is duplicated
+        assert sql.index("coalesce") < sql.index(" - ") < sql.index(" || ")
+        assert params == [[], ["a", "b"], ["a", "b"]]
+        db.commit.assert_called_once()
+
+    def test_remove(self):
+        db = _db(2)
+        _run(db, tags_remove=["x"])
+        sql, params = _tags_update(db)
+        assert " || " not in sql
+        assert params == [[], ["x"]]
+
+    def test_add_then_remove(self):
+        """Removal is applied last: a tag both added and removed is dropped"""
+        db = _db(2)
+        _run(db, tags_add=["a"], tags_remove=["a", "b"])
+        sql, params = _tags_update(db)
+        assert sql.rindex(" - ") > sql.index(" || ")
+        assert params == [[], ["a"], ["a"], ["a", "b"]]
+
+    def test_other_fields_in_same_update(self):
+        db = _db(2)
+        _run(db, assigned_to=5, tags_add=["a"])
+        query = db.query.return_value.filter.return_value
+        query.update.assert_called_once()
+        values = query.update.call_args.args[0]
+        assert values[LeadItem.assigned_to] == 5
+        assert LeadItem.tags in values
+
+    def test_no_changes_counts(self):
+        db = _db(2)
+        assert _run(db)["updated"] == 2
+        query = db.query.return_value.filter.return_value
+        query.update.assert_not_called()
+        query.count.assert_called_once()
+
+    def test_no_match(self):
+        db = _db(0)
+        with pytest.raises(HTTPException) as exc:
+            _run(db, tags_add=["a"])
+        assert exc.value.status_code == 404
+        db.commit.assert_not_called()
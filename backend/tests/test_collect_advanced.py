@@ -0,0 +1,50 @@
+"""
+Tests for advanced collection request parsing
+"""
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.collect import EntityInput
+from app.api.deps import get_current_user
+from app.db import get_db
+from app.db.models.entity import EntityType
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_db] = lambda: MagicMock()
+    app.dependency_overrides[get_current_user] = lambda: MagicMock()
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_user, None)
+
+
+class TestAdvancedCollectRequest:
+    """Objective and entity type parsing"""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("PERSON", EntityType.PERSON),
+        ("TOPIC", EntityType.TOPIC),
+        ("UNKNOWN", EntityType.ORGANIZATION),
+        ("person", EntityType.ORGANIZATION),
+    ])
+    def test_entity_type_fallback(self, value, expected):
+        assert EntityInput(name="x", type=value).type == expected
+
+    def test_entity_type_default(self):
+        assert EntityInput(name="x").type == EntityType.ORGANIZATION
+
+    def test_invalid_objective(self, client):
+        response = client.post("/api/v1/collect/advanced", json={
+            "objective": "NOPE",
+            "entities": [{"name": "x"}],
+        })
+        assert response.status_code == 400
+        assert response.json()["detail"] == (
+            "Objectif invalide. Valeurs possibles: SPONSOR, BOOKING, PRESS, VENUE, SUPPLIER, GRANT"
+        )
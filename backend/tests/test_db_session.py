@@ -0,0 +1,68 @@
+"""
+Tests for the JSON/JSONB bind serializer
+"""
+import json
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+import pytest
+
+from app.db.session import _json_serializer
+
+
+class Color(str, Enum):
+    RED = "red"
+
+
+class TestJsonSerializer:
+    """Tests for _json_serializer (orjson with explicit edge cases)"""
+
+    def test_native_types(self):
+        """UUID, datetime and Enum are encoded like orjson does"""
+        value = {
+            "id": UUID("12345678-1234-5678-1234-567812345678"),
+            "at": datetime(2024, 1, 2, 3, 4, 5),
+            "color": Color.RED,
+            "none": None,
+        }
+        assert json.loads(_json_serializer(value)) == {
+            "id": "12345678-1234-5678-1234-567812345678",
+            "at": "2024-01-02T03:04:05",
+            "color": "red",
+            "none": None,
+        }
+
+    def test_non_str_keys(self):
+        """Integer keys are accepted"""
+        assert json.loads(_json_serializer({1: "a"})) == {"1": "a"}
+
+    @pytest.mark.parametrize("bad", [float("nan"), float("inf"), float("-inf")])
+    def test_non_finite_float_rejected(self, bad):
+        """NaN/Infinity raise instead of being stored as null"""
+        with pytest.raises(ValueError):
+            _json_serializer({"scores": [1.0, {"x": bad}]})
+
+    def test_null_string_not_rejected(self):
+        """A literal null or "null" string does not trigger the float check"""
+        assert json.loads(_json_serializer({"a": None, "b": "null"})) == {"a": None, "b": "null"}
+
+    def test_big_int_falls_back(self):
+        """Integers wider than 64 bits are encoded exactly"""
+        big = 2 ** 70
+        value = {"n": big, "id": UUID(int=1), "color": Color.RED}
+        assert json.loads(_json_serializer(value)) == {
+            "n": big,
+            "id": "00000000-0000-0000-0000-000000000001",
+            "color": "red",
+        }
+
+    def test_big_int_with_nan_rejected(self):
+        """The stdlib fallback still rejects non-finite floats"""
+        with pytest.raises(ValueError):
+            _json_serializer({"n": 2 ** 70, "x": float("nan")})
+
+    def test_unsupported_type_raises(self):
+        """Unknown objects are still an error"""
+        with pytest.raises(TypeError):
+            _json_serializer({"x": object()})
@@ -0,0 +1,109 @@
+"""
+Tests for idempotency keys (Redis claim + replay)
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.auth import _idempotent
+from app.core import cache
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the SET NX / GET / SETEX / DELETE calls"""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(cache, "redis_client", fake):
+        yield fake
+
+
+class TestIdempotencyCache:
+    """Tests for idempotency_begin / complete / release"""
+
+    def test_first_claim_wins(self, redis):
+        assert cache.idempotency_begin("k") == (True, None)
+        assert redis.data["idem:k"] == cache.IDEMPOTENCY_PENDING
+
+    def test_duplicate_while_pending(self, redis):
+        cache.idempotency_begin("k")
+        assert cache.idempotency_begin("k") == (False, None)
+
+    def test_duplicate_after_complete(self, redis):
+        cache.idempotency_begin("k")
+        cache.idempotency_complete("k", {"id": 1})
+        assert json.loads(redis.data["idem:k"]) == {"id": 1}
+        assert cache.idempotency_begin("k") == (False, {"id": 1})
+
+    def test_release_allows_retry(self, redis):
+        cache.idempotency_begin("k")
+        cache.idempotency_release("k")
+        assert cache.idempotency_begin("k") == (True, None)
+
+    def test_redis_down_processes_normally(self):
+        broken = MagicMock()
+        broken.set.side_effect = ConnectionError("redis down")
+        broken.setex.side_effect = ConnectionError("redis down")
+        broken.delete.side_effect = ConnectionError("redis down")
+        with patch.object(cache, "redis_client", broken):
+            assert cache.idempotency_begin("k") == (True, None)
+            cache.idempotency_complete("k", {"id": 1})
+            cache.idempotency_release("k")
+
+
+class TestIdempotentHandler:
+    """Tests for auth._idempotent"""
+
+    def test_no_key_always_runs(self, redis):
+        handler = MagicMock(return_value={"id": 1})
+        assert _idempotent(None, handler) == {"id": 1}
+        assert _idempotent("", handler) == {"id": 1}
+        assert handler.call_count == 2
+        assert redis.data == {}
+
+    def test_duplicate_replays_stored_response(self, redis):
+        handler = MagicMock(return_value={"id": 1})
+        assert _idempotent("k", handler) == {"id": 1}
+        assert _idempotent("k", handler) == {"id": 1}
+        handler.assert_called_once()
+
+    def test_serialize_stores_replayed_form(self, redis):
+        result = object()
+        assert _idempotent("k", lambda: result, serialize=lambda r: {"stored": True}) is result
+        assert _idempotent("k", lambda: result) == {"stored": True}
+
+    def test_duplicate_in_progress_conflicts(self, redis):
+        cache.idempotency_begin("k")
+        handler = MagicMock()
+        with pytest.raises(HTTPException) as exc:
+            _idempotent("k", handler)
+        assert exc.value.status_code == 409
+        handler.assert_not_called()
+
+    def test_failure_releases_key(self, redis):
+        with pytest.raises(HTTPException):
+            _idempotent("k", MagicMock(side_effect=HTTPException(status_code=400)))
+        assert "idem:k" not in redis.data
+        assert _idempotent("k", lambda: {"id": 2}) == {"id": 2}
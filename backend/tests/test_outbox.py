@@ -0,0 +1,96 @@
+"""
+Tests for the Celery task outbox dispatcher
+"""
+import uuid
+from unittest.mock import MagicMock, patch
+
+from app.db.models.task_outbox import TaskOutbox
+from app.workers import outbox
+
+
+def _rows(count: int) -> list[TaskOutbox]:
+    return [
+        TaskOutbox(id=uuid.uuid4(), task_name=f"task_{i}", kwargs={"n": i})
+        for i in range(count)
+    ]
+
+
+def _db(rows: list[TaskOutbox]) -> MagicMock:
+    """Session whose locked outbox query returns rows"""
+    db = MagicMock()
+    query = db.query.return_value
+    query.filter.return_value = query
+    query.order_by.return_value.limit.return_value.with_for_update.return_value.all.return_value = rows
+    return db
+
+
+class TestDispatchOutbox:
+    """Tests for dispatch_outbox / dispatch_after_commit"""
+
+    def test_sends_and_marks_rows(self):
+        rows = _rows(3)
+        db = _db(rows)
+        with patch.object(outbox.celery_app, "producer_or_acquire"), \
+                patch.object(outbox.celery_app, "send_task") as send_task:
+            assert outbox.dispatch_outbox(db) == 3
+
+        assert [c.args[0] for c in send_task.call_args_list] == ["task_0", "task_1", "task_2"]
+        # The outbox row id is the Celery task id
+        assert [c.kwargs["task_id"] for c in send_task.call_args_list] == [str(r.id) for r in rows]
+        assert send_task.call_args_list[1].kwargs["kwargs"] == {"n": 1}
+        assert all(r.dispatched_at is not None for r in rows)
+        db.commit.assert_called_once()
+
+    def test_broker_failure_keeps_remaining_rows(self):
+        """Rows sent before the failure are marked; the rest stay pending"""
+        rows = _rows(3)
+        db = _db(rows)
+        with patch.object(outbox.celery_app, "producer_or_acquire"), \
+                patch.object(outbox.celery_app, "send_task",
+                             side_effect=[None, ConnectionError("broker down")]):
+            assert outbox.dispatch_outbox(db) == 1
+
+        assert rows[0].dispatched_at is not None
+        assert rows[1].dispatched_at is None and rows[2].dispatched_at is None
+        db.commit.assert_called_once()
+
+    def test_nothing_pending(self):
+        db = _db([])
+        with patch.object(outbox.celery_app, "send_task") as send_task:
+            assert outbox.dispatch_outbox(db) == 0
+        send_task.assert_not_called()
+        db.commit.assert_called_once()
+
+    def test_ids_filter(self):
+        db = _db([])
+        task_id = str(uuid.uuid4())
+        outbox.dispatch_outbox(db, [task_id])
+        # pending filter + id filter
+        assert db.query.return_value.filter.call_count == 2
+
+    def test_after_commit_rolls_back_on_error(self):
+        db = MagicMock()
+        with patch.object(outbox, "dispatch_outbox", side_effect=RuntimeError("db down")):
+            outbox.dispatch_after_commit(db, ["x"])
+        db.rollback.assert_called_once()
+
+    def test_in_background_closes_session(self):
+        db = MagicMock()
+        with patch.object(outbox, "SessionLocal", return_value=db), \
+                patch.object(outbox, "dispatch_after_commit") as dispatch:
+            outbox.dispatch_in_background(["x"])
+        dispatch.assert_called_once_with(db, ["x"])
+        db.close.assert_called_once()
+
+
+class TestPurgeOutbox:
+    """Tests for purge_outbox"""
+
+    def test_deletes_old_dispatched_rows(self):
+        db = MagicMock()
+        db.query.return_value.filter.return_value.delete.return_value = 4
+        assert outbox.purge_outbox(db) == 4
+        # Only rows dispatched before the cutoff (pending rows have a NULL dispatched_at)
+        condition = db.query.return_value.filter.call_args.args[0]
+        assert condition.left.key == "dispatched_at" and condition.operator.__name__ == "lt"
+        db.commit.assert_called_once()
@@ -0,0 +1,127 @@
+"""
+Tests for page/keyset pagination helpers
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.api.pagination import decode_cursor, encode_cursor, paginate
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    created_at = Column(DateTime)
+
+
+KEYS = ((Item.created_at, datetime.fromisoformat), (Item.id, int))
+TITLE_KEYS = ((Item.title, str), (Item.id, int))
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def db():
+    """In-memory database with 7 items (two share each timestamp)"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        Item(id=i, title=f"item|{i}", created_at=START + timedelta(days=i // 2))
+        for i in range(1, 8)
+    )
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+class TestCursor:
+    """Tests for encode_cursor / decode_cursor"""
+
+    def test_round_trip(self):
+        cursor = encode_cursor([datetime(2024, 1, 2, 3, 4, 5), 42])
+        assert cursor == "2024-01-02T03:04:05|42"
+        assert decode_cursor(cursor, KEYS) == [datetime(2024, 1, 2, 3, 4, 5), 42]
+
+    def test_text_key_may_contain_separator(self):
+        """Only the first key is free text: it is split from the right"""
+        cursor = encode_cursor(["a|b|c", 7])
+        assert decode_cursor(cursor, TITLE_KEYS) == ["a|b|c", 7]
+
+    @pytest.mark.parametrize("cursor", ["", "42", "not-a-date|1", "2024-01-01T00:00:00|x"])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(cursor, KEYS)
+        assert exc.value.status_code == 400
+
+
+class TestPaginate:
+    """Tests for paginate (page numbers and keyset)"""
+
+    def test_first_page(self, db):
+        items, meta = paginate(db.query(Item), KEYS, page=1, page_size=3)
+        assert [i.id for i in items] == [7, 6, 5]
+        assert meta == {
+            "total": 7,
+            "page": 1,
+            "page_size": 3,
+            "pages": 3,
+            "next_cursor": encode_cursor([START + timedelta(days=2), 5]),
+        }
+
+    def test_none_cursor_is_page_mode(self, db):
+        """cursor=None (and "") fall back to page numbers"""
+        for cursor in (None, ""):
+            items, meta = paginate(db.query(Item), KEYS, page=2, page_size=3, cursor=cursor)
+            assert [i.id for i in items] == [4, 3, 2]
+            assert meta["page"] == 2 and meta["total"] == 7
+
+    def test_page_out_of_range(self, db):
+        items, meta = paginate(db.query(Item), KEYS, page=5, page_size=3)
+        assert items == []
+        assert meta["total"] == 7 and meta["next_cursor"] is None
+
+    def test_empty_query(self, db):
+        items, meta = paginate(db.query(Item).filter(Item.id < 0), KEYS, page=1, page_size=3)
+        assert items == []
+        assert meta["total"] == 0 and meta["pages"] == 0
+
+    def test_keyset_walks_all_rows(self, db):
+        """Following next_cursor visits every row once, ties broken by id"""
+        items, meta = paginate(db.query(Item), KEYS, page=1, page_size=3)
+        seen = [i.id for i in items]
+        while meta["next_cursor"]:
+            items, meta = paginate(db.query(Item), KEYS, page=1, page_size=3,
+                                   cursor=meta["next_cursor"])
+            assert meta["total"] is None and meta["page"] is None
+            seen.extend(i.id for i in items)
+        assert seen == [7, 6, 5, 4, 3, 2, 1]
+
+    def test_keyset_on_text_key(self, db):
+        """Titles containing the separator page through their cursor"""
+        items, meta = paginate(db.query(Item), TITLE_KEYS, page=1, page_size=4)
+        assert [i.id for i in items] == [7, 6, 5, 4]
+        items, meta = paginate(db.query(Item), TITLE_KEYS, page=1, page_size=4,
+                               cursor=meta["next_cursor"])
+        assert [i.id for i in items] == [3, 2, 1]
+
+    def test_keyset_ascending(self, db):
+        cursor = encode_cursor([START + timedelta(days=1), 2])
+        items, meta = paginate(db.query(Item), KEYS, page=1, page_size=10,
+                               cursor=cursor, descending=False)
+        assert [i.id for i in items] == [3, 4, 5, 6, 7]
+        assert meta["next_cursor"] is None
+
+    def test_bad_cursor_rejected(self, db):
+        with pytest.raises(HTTPException) as exc:
+            paginate(db.query(Item), KEYS, page=1, page_size=3, cursor="garbage")
+        assert exc.value.status_code == 400
@@ -0,0 +1,145 @@
+"""
+Tests for the SSE progress fan-out (shared Redis subscription)
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.api import progress
+
+
+class FakePubSub:
+    """pubsub() stand-in whose listen() replays a fixed list of messages"""
+
+    def __init__(self, payloads, error: Exception = None):
+        self.payloads = payloads
+        self.error = error
+        self.subscribe = AsyncMock()
+        self.aclose = AsyncMock()
+
+    async def listen(self):
+        yield {"type": "subscribe", "data": 1}
+        for payload in self.payloads:
+            yield {"type": "message", "data": payload}
+        if self.error:
+            raise self.error
+
+
+def _run_fan_out(pubsub: FakePubSub) -> None:
+    redis = MagicMock()
+    redis.pubsub.return_value = pubsub
+    with patch.object(progress, "get_redis", return_value=redis):
+        asyncio.run(progress._fan_out())
+
+
+def _drain(queue: asyncio.Queue) -> list:
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+@pytest.fixture
+def subscribers():
+    """Queues registered for task "t1" and for every task"""
+    task_queue, all_queue = asyncio.Queue(), asyncio.Queue()
+    with patch.dict(progress.active_subscribers, clear=True):
+        progress.active_subscribers["t1"] = {task_queue}
+        progress.active_subscribers[progress.ALL_TASKS] = {all_queue}
+        yield task_queue, all_queue
+
+
+class TestFanOut:
+    """Tests for _fan_out / _deliver"""
+
+    def test_routes_by_task_id(self, subscribers):
+        task_queue, all_queue = subscribers
+        pubsub = FakePubSub([
+            json.dumps({"task_id": "t1", "type": "progress"}),
+            json.dumps({"task_id": "t2", "type": "progress"}),
+        ])
+        _run_fan_out(pubsub)
+        assert _drain(task_queue) == [{"task_id": "t1", "type": "progress"}]
+        assert [m["task_id"] for m in _drain(all_queue)] == ["t1", "t2"]
+        pubsub.aclose.assert_awaited_once()
+
+    def test_skips_malformed_messages(self, subscribers):
+        """Invalid JSON, non-objects and non-string task ids do not stop the stream"""
+        task_queue, all_queue = subscribers
+        pubsub = FakePubSub([
+            "{not json",
+            json.dumps([1, 2]),
+            json.dumps({"task_id": ["t1"]}),
+            json.dumps({"task_id": "t1", "type": "completed"}),
+        ])
+        _run_fan_out(pubsub)
+        assert _drain(task_queue) == [{"task_id": "t1", "type": "completed"}]
+        assert _drain(all_queue) == [
+            {"task_id": ["t1"]},
+            {"task_id": "t1", "type": "completed"},
+        ]
+        pubsub.aclose.assert_awaited_once()
+
+    def test_subscription_error_reaches_every_stream(self, subscribers):
+        _run_fan_out(FakePubSub([], error=ConnectionError("lost")))
+        for queue in subscribers:
+            assert _drain(queue) == [{"type": "error", "message": "lost"}]
+
+    def test_deliver_drops_oldest_when_full(self):
+        queue = asyncio.Queue(maxsize=2)
+        for i in range(4):
+            progress._deliver(queue, {"n": i})
+        assert _drain(queue) == [{"n": 2}, {"n": 3}]
+
+
+class TestSubscribe:
+    """Tests for subscribe_to_task_progress batching and cleanup"""
+
+    def _collect(self, messages, timeout: float = 1.0) -> list:
+        async def run():
+            batches = []
+            gen = progress.subscribe_to_task_progress(["t1"], timeout=timeout)
+            # Register the queue, then queue every message before reading
+            first = asyncio.ensure_future(gen.__anext__())
+            await asyncio.sleep(0)
+            for queue in progress.active_subscribers["t1"]:
+                for message in messages:
+                    queue.put_nowait(message)
+            batches.append(await first)
+            async for batch in gen:
+                batches.append(batch)
+            return batches
+
+        with patch.dict(progress.active_subscribers, clear=True), \
+                patch.object(progress, "_ensure_listener"):
+            batches = asyncio.run(run())
+            # The stream's queue is unregistered when it ends
+            assert progress.active_subscribers == {}
+        return batches
+
+    def test_batches_queued_messages(self):
+        messages = [{"task_id": "t1", "type": "progress", "n": i} for i in range(70)]
+        messages.append({"task_id": "t1", "type": "completed"})
+        batches = self._collect(messages)
+        assert [len(b) for b in batches] == [progress.MAX_BATCH, 71 - progress.MAX_BATCH]
+        assert batches[-1][-1]["type"] == "completed"
+
+    def test_stops_at_terminal_message(self):
+        """Messages after completed/failed/error are not sent"""
+        batches = self._collect([
+            {"task_id": "t1", "type": "progress"},
+            {"task_id": "t1", "type": "failed"},
+            {"task_id": "t1", "type": "progress"},
+        ])
+        assert [[m["type"] for m in b] for b in batches] == [["progress", "failed"]]
+
+    def test_error_ends_stream(self):
+        batches = self._collect([{"type": "error", "message": "lost"}])
+        assert batches == [[{"type": "error", "message": "lost"}]]
+
+    def test_timeout_ends_stream(self):
+        assert self._collect([{"task_id": "t1", "type": "progress"}], timeout=0.05) == [
+            [{"task_id": "t1", "type": "progress"}]
+        ]
@@ -0,0 +1,56 @@
+"""
+Tests for TOTP verification
+"""
+from unittest.mock import patch
+
+import pyotp
+import pytest
+
+from app.core.two_factor import TwoFactorAuth
+
+SECRET = "JBSWY3DPEHPK3PXP"
+NOW = 1_700_000_000
+
+
+@pytest.fixture
+def frozen_time():
+    with patch("app.core.two_factor.time.time", return_value=NOW):
+        yield
+
+
+class TestVerifyCode:
+    """Tests for TwoFactorAuth.verify_code"""
+
+    @pytest.mark.parametrize("offset", [-1, 0, 1])
+    def test_codes_inside_window(self, frozen_time, offset):
+        code = pyotp.TOTP(SECRET).at(NOW + offset * TwoFactorAuth.INTERVAL)
+        assert TwoFactorAuth.verify_code(SECRET, code)
+
+    @pytest.mark.parametrize("offset", [-3, -2, 2, 3])
+    def test_codes_outside_window(self, frozen_time, offset):
+        code = pyotp.TOTP(SECRET).at(NOW + offset * TwoFactorAuth.INTERVAL)
+        assert not TwoFactorAuth.verify_code(SECRET, code)
+
+    def test_matches_pyotp(self, frozen_time):
+        """The HOTP computation agrees with pyotp for a range of counters"""
+        hotp = pyotp.HOTP(SECRET)
+        for counter in range(1, 1000, 37):
+            t = counter * TwoFactorAuth.INTERVAL
+            with patch("app.core.two_factor.time.time", return_value=t):
+                assert TwoFactorAuth.verify_code(SECRET, hotp.at(counter))
+
+    def test_formatted_code(self, frozen_time):
+        code = pyotp.TOTP(SECRET).at(NOW)
+        assert TwoFactorAuth.verify_code(SECRET, f"{code[:3]} {code[3:]}")
+        assert TwoFactorAuth.verify_code(SECRET, f"{code[:3]}-{code[3:]}")
+
+    @pytest.mark.parametrize("code", ["", "12345", "1234567", "abcdef"])
+    def test_malformed_code(self, frozen_time, code):
+        assert not TwoFactorAuth.verify_code(SECRET, code)
+
+    def test_missing_secret(self, frozen_time):
+        assert not TwoFactorAuth.verify_code("", "123456")
+
+    def test_wrong_secret(self, frozen_time):
+        code = pyotp.TOTP(SECRET).at(NOW)
+        assert not TwoFactorAuth.verify_code(pyotp.random_base32(), code)
@@ -4,7 +4,7 @@ import { useEffect, useCallback, useRef, useState } from "react";
 
 interface ProgressData {
   task_id: string;
-  type: "start" | "step" | "progress" | "source" | "log" | "completed" | "failed" | "heartbeat";
+  type: "start" | "step" | "progress" | "source" | "log" | "completed" | "failed";
   timestamp?: string;
   data: {
     message?: string;
@@ -131,10 +131,6 @@ export function useProgressStream({
         setIsConnected(false);
       });
 
-      eventSource.addEventListener("heartbeat", () => {
-        // Heartbeat received, connection is alive
-      });
-
     } catch (error) {
       console.error("Failed to create EventSource:", error);
     }